@@ -0,0 +1,77 @@
+"""Admin routes — model hot-swap and registry, heuristic rule packs."""
+
+import asyncio
+import logging
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException
+
+from backend.config import ADMIN_TOKEN
+from backend.schemas import ModelInfoResponse, ReloadRequest, RulesInfoResponse
+from backend.services.model_service import (
+    ReloadInProgress,
+    get_model_info,
+    get_rules_info,
+    reload_model,
+    reload_rules,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def require_admin(x_admin_token: Optional[str] = Header(default=None)) -> None:
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Admin API is disabled (ADMIN_TOKEN unset).")
+    if x_admin_token != ADMIN_TOKEN:
+        raise HTTPException(status_code=401, detail="Invalid admin token.")
+
+
+router = APIRouter(prefix="/api/admin", tags=["Admin"], dependencies=[Depends(require_admin)])
+
+
+@router.get("/model", response_model=ModelInfoResponse)
+async def model_info():
+    """Return the active model version and the versions loaded before it."""
+    return ModelInfoResponse(**get_model_info())
+
+
+@router.post("/reload", response_model=ModelInfoResponse)
+async def reload(req: Optional[ReloadRequest] = None):
+    """
+    Load a checkpoint, warm it up and swap it in without dropping requests.
+    The previous model keeps serving until the new one is ready.  Only the
+    worker serving this request swaps; see MODEL_WATCH_INTERVAL.
+    """
+    path = req.path if req else None
+    try:
+        info = await asyncio.to_thread(reload_model, path)
+    except ReloadInProgress as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        logger.exception("Model reload failed")
+        raise HTTPException(status_code=500, detail=f"Reload failed: {e}")
+    return ModelInfoResponse(**info)
+
+
+@router.get("/rules", response_model=RulesInfoResponse)
+async def rules_info():
+    """Return the active heuristic rule pack."""
+    return RulesInfoResponse(**get_rules_info())
+
+
+@router.post("/rules/reload", response_model=RulesInfoResponse)
+async def reload_rule_pack(req: Optional[ReloadRequest] = None):
+    """
+    Compile a rule pack (JSON or YAML) and swap it in atomically.  Only the
+    worker serving this request swaps; see MODEL_WATCH_INTERVAL.
+    """
+    path = req.path if req else None
+    try:
+        info = await asyncio.to_thread(reload_rules, path)
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    return RulesInfoResponse(**info)
@@ -0,0 +1,102 @@
+"""Bulk file scoring job routes."""
+
+import asyncio
+import logging
+import shutil
+from pathlib import Path
+from typing import Optional
+
+from fastapi import APIRouter, File, Form, HTTPException, UploadFile
+from fastapi.responses import FileResponse
+
+from backend.config import JOB_MAX_UPLOAD_MB
+from backend.schemas import BulkJobResponse
+from backend.services.bulk_jobs import (
+    JOB_FORMATS,
+    create_job,
+    read_job,
+    results_path,
+    submit_job,
+)
+
+logger = logging.getLogger(__name__)
+router = APIRouter(prefix="/api", tags=["Jobs"])
+
+_EXTENSIONS = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl"}
+
+
+def _response(job: dict) -> BulkJobResponse:
+    url = f"/api/jobs/{job['id']}/results" if job["status"] == "done" else None
+    return BulkJobResponse(**job, results_url=url)
+
+
+def _spool(upload: UploadFile, destination: Path, max_bytes: int) -> bool:
+    """Copy the upload to *destination*; False as soon as it exceeds *max_bytes*."""
+    written = 0
+    with open(destination, "wb") as out:
+        while chunk := upload.file.read(1 << 20):
+            written += len(chunk)
+            if written > max_bytes:
+                return False
+            out.write(chunk)
+    return True
+
+
+@router.post("/jobs", response_model=BulkJobResponse, status_code=202)
+async def create_job_endpoint(
+    file: UploadFile = File(..., description="CSV or JSONL file of texts"),
+    format: Optional[str] = Form(
+        default=None, description="csv or jsonl (defaults to the file extension)"
+    ),
+    text_column: str = Form(default="text", description="CSV column holding the text"),
+    id_column: str = Form(default="id", description="CSV column copied to the results"),
+    explain: bool = Form(default=False, description="Include explanations (slower)"),
+):
+    """Upload a file for background scoring; poll ``/api/jobs/{id}`` for progress."""
+    filename = file.filename or "upload"
+    fmt = format or _EXTENSIONS.get(Path(filename).suffix.lower())
+    if fmt not in JOB_FORMATS:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Unsupported format — upload {', '.join(JOB_FORMATS)} or pass 'format'",
+        )
+    max_bytes = int(JOB_MAX_UPLOAD_MB * 1024 * 1024)
+    if file.size is not None and file.size > max_bytes:
+        raise HTTPException(status_code=413, detail="Upload too large")
+
+    job, input_path = create_job(fmt, filename, text_column, id_column, explain)
+    try:
+        complete = await asyncio.to_thread(_spool, file, input_path, max_bytes)
+    except OSError as e:
+        logger.exception("Could not spool upload for job %s", job["id"])
+        shutil.rmtree(input_path.parent, ignore_errors=True)
+        raise HTTPException(status_code=500, detail=str(e))
+    if not complete:
+        shutil.rmtree(input_path.parent, ignore_errors=True)
+        raise HTTPException(status_code=413, detail="Upload too large")
+    submit_job(job["id"])
+    return _response(read_job(job["id"]))
+
+
+@router.get("/jobs/{job_id}", response_model=BulkJobResponse)
+async def job_status_endpoint(job_id: str):
+    """Progress of a bulk job: rows done, failures and throughput."""
+    job = read_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown job")
+    return _response(job)
+
+
+@router.get("/jobs/{job_id}/results")
+async def job_results_endpoint(job_id: str):
+    """Download a finished job's results as JSONL (one line per input row)."""
+    job = read_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown job")
+    if job["status"] != "done":
+        raise HTTPException(status_code=409, detail=f"Job is {job['status']}")
+    return FileResponse(
+        results_path(job_id),
+        media_type="application/x-ndjson",
+        filename=f"{job_id}-results.jsonl",
+    )
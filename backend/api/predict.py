@@ -2,16 +2,25 @@
 
 import logging
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import StreamingResponse
 
+from backend.config import SHAP_ENABLED
 from backend.schemas import (
     BatchPredictRequest,
     BatchPredictResponse,
+    ExplanationJobResponse,
     PredictRequest,
     PredictResponse,
 )
-from backend.services.explainer import get_attention_explanation, get_shap_explanation
-from backend.services.model_service import predict, predict_batch
+from backend.services.explainer import get_attention_explanation
+from backend.services.explanation_jobs import get_explanation_job, submit_explanation
+from backend.services.model_service import (
+    is_model_loaded,
+    predict_async,
+    predict_batch_async,
+)
+from backend.services.streaming import stream_predictions
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api", tags=["Prediction"])
@@ -21,22 +30,28 @@ router = APIRouter(prefix="/api", tags=["Prediction"])
 async def predict_endpoint(req: PredictRequest):
     """Analyse a single text for sarcasm."""
     try:
-        result = predict(req.text)
-
-        # Enrich explanation with attention details
-        result["explanation"] = get_attention_explanation(
-            result.get("attention_scores"),
-            result["prediction"],
-            result["confidence"],
-        )
-
-        # Optional SHAP
-        shap_data = get_shap_explanation(req.text)
-        if shap_data:
-            result["attention_scores"] = {
-                **(result.get("attention_scores") or {}),
-                "_shap": shap_data,
-            }
+        result = await predict_async(req.text, req.explain)
+        if not req.explain:
+            return PredictResponse(**result)
+
+        # Enrich explanation with attention details (cascade answers have none
+        # and keep their heuristic explanation)
+        if result.get("attention_scores"):
+            result["explanation"] = get_attention_explanation(
+                result["attention_scores"],
+                result["prediction"],
+                result["confidence"],
+            )
+
+        # Optional SHAP — computed in the background; a cached one is inlined
+        if SHAP_ENABLED and is_model_loaded():
+            job = submit_explanation(req.text, "shap")
+            result["explanation_job_id"] = job["id"]
+            if job["status"] == "done":
+                result["attention_scores"] = {
+                    **(result.get("attention_scores") or {}),
+                    "_shap": job["result"],
+                }
 
         return PredictResponse(**result)
 
@@ -49,15 +64,16 @@ async def predict_endpoint(req: PredictRequest):
 async def batch_predict_endpoint(req: BatchPredictRequest):
     """Analyse multiple texts for sarcasm (max 50)."""
     try:
-        results = predict_batch(req.texts)
+        results = await predict_batch_async(req.texts, req.explain)
 
         enriched = []
         for text, r in zip(req.texts, results):
-            r["explanation"] = get_attention_explanation(
-                r.get("attention_scores"),
-                r["prediction"],
-                r["confidence"],
-            )
+            if req.explain and r.get("attention_scores"):
+                r["explanation"] = get_attention_explanation(
+                    r["attention_scores"],
+                    r["prediction"],
+                    r["confidence"],
+                )
             enriched.append(PredictResponse(**r))
 
         return BatchPredictResponse(results=enriched)
@@ -65,3 +81,47 @@ async def batch_predict_endpoint(req: BatchPredictRequest):
     except Exception as e:
         logger.exception("Batch prediction error")
         raise HTTPException(status_code=500, detail=str(e))
+
+
+class NDJSONResponse(StreamingResponse):
+    """
+    Streams NDJSON while the request body is still being read.
+
+    Starlette's StreamingResponse watches for disconnects by consuming
+    ``receive()`` messages, which would swallow the streamed request body;
+    here the body iterator itself notices a disconnect instead.
+    """
+
+    media_type = "application/x-ndjson"
+
+    async def __call__(self, scope, receive, send) -> None:
+        await self.stream_response(send)
+
+
+@router.post(
+    "/predict/stream",
+    response_class=NDJSONResponse,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {"application/x-ndjson": {"schema": {"type": "string"}}},
+        }
+    },
+)
+async def stream_predict_endpoint(request: Request, explain: bool = True):
+    """
+    Score newline-delimited JSON texts — ``"text"`` or ``{"text": ..., "id": ...}``
+    per line, any number of lines — streaming one NDJSON result per line
+    back as each batch finishes.  Clients should read the response while
+    still sending large bodies.
+    """
+    return NDJSONResponse(stream_predictions(request.stream(), explain))
+
+
+@router.get("/explanations/{job_id}", response_model=ExplanationJobResponse)
+async def explanation_endpoint(job_id: str):
+    """Poll a background explanation job queued by /api/predict."""
+    job = get_explanation_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired explanation job")
+    return ExplanationJobResponse(**job)
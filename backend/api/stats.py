@@ -3,8 +3,12 @@
 from fastapi import APIRouter
 
 from backend.config import MOCK_METRICS
-from backend.schemas import ModelStatsResponse
-from backend.services.model_service import is_model_loaded
+from backend.schemas import CacheStatsResponse, CascadeStatsResponse, ModelStatsResponse
+from backend.services.model_service import (
+    get_cache_stats,
+    get_cascade_stats,
+    is_model_loaded,
+)
 
 router = APIRouter(prefix="/api", tags=["Stats"])
 
@@ -13,3 +17,15 @@ router = APIRouter(prefix="/api", tags=["Stats"])
 async def get_stats():
     """Return model performance metrics."""
     return ModelStatsResponse(**MOCK_METRICS)
+
+
+@router.get("/stats/cache", response_model=CacheStatsResponse)
+async def get_cache_stats_endpoint():
+    """Return prediction-cache hit, miss and eviction counters."""
+    return CacheStatsResponse(**get_cache_stats())
+
+
+@router.get("/stats/cascade", response_model=CascadeStatsResponse)
+async def get_cascade_stats_endpoint():
+    """Return how much traffic the heuristic cascade answered without the model."""
+    return CascadeStatsResponse(**get_cascade_stats())
@@ -6,20 +6,141 @@ from pathlib import Path
 # Paths
 BASE_DIR = Path(__file__).resolve().parent
 MODEL_DIR = BASE_DIR.parent / "model"
-MODEL_PATH = MODEL_DIR / "sarcasm_model.pt"
+SAFETENSORS_MODEL_PATH = MODEL_DIR / "sarcasm_model.safetensors"
+LEGACY_MODEL_PATH = MODEL_DIR / "sarcasm_model.pt"
+# Prefer the memory-mappable safetensors checkpoint; fall back to the .pt file
+MODEL_PATH = Path(os.getenv(
+    "MODEL_PATH",
+    SAFETENSORS_MODEL_PATH if SAFETENSORS_MODEL_PATH.exists() or not LEGACY_MODEL_PATH.exists()
+    else LEGACY_MODEL_PATH,
+))
+QUANTIZED_MODEL_PATH = MODEL_DIR / "sarcasm_model.int8.pt"
+ONNX_MODEL_PATH = Path(os.getenv("ONNX_MODEL_PATH", MODEL_DIR / "sarcasm_model.onnx"))
 TOKENIZER_NAME = "bert-base-uncased"
 
 # Device
 DEVICE = os.getenv("DEVICE", "cpu")  # "cuda" if GPU available
 
+# Inference engine — "fp32" (eager PyTorch), "int8" (dynamic int8
+# quantization of the Linear layers; CPU only) or "onnx" (ONNX Runtime on
+# CPU, export with `python -m model.export_onnx`).
+INFERENCE_ENGINE = os.getenv("INFERENCE_ENGINE", "fp32").lower()
+
+# Word highlighting — "attention" (last-layer CLS attention, free),
+# "rollout" (attention rolled out across every layer, a few matmuls) or
+# "gradient" (gradient × input from one backward pass; fp32 engine only,
+# int8 falls back to rollout).  The ONNX graph exports only the last
+# attention layer, so the onnx engine always uses "attention".
+EXPLANATION_METHOD = os.getenv("EXPLANATION_METHOD", "attention").lower()
+
 # Model
 MAX_LENGTH = 128
 NUM_LABELS = 2
 LABELS = ["Not Sarcastic", "Sarcastic"]
 
+# Padding — inputs are padded to the longest item in each batch.  With
+# length bucketing on, texts are first grouped by token length into
+# batches of at most BUCKET_BATCH_SIZE so padding stays tight.
+LENGTH_BUCKETING = os.getenv("LENGTH_BUCKETING", "true").lower() == "true"
+BUCKET_BATCH_SIZE = int(os.getenv("BUCKET_BATCH_SIZE", "32"))
+
+# Micro-batching — concurrent /api/predict calls are coalesced into one
+# forward pass, flushed at BATCH_MAX_SIZE texts or after BATCH_MAX_WAIT_MS.
+# At most BATCH_MAX_QUEUE texts wait for a batch (0 = unbounded); beyond
+# that callers wait, and WebSocket clients stop being read.
+BATCH_MAX_SIZE = int(os.getenv("BATCH_MAX_SIZE", "32"))
+BATCH_MAX_WAIT_MS = float(os.getenv("BATCH_MAX_WAIT_MS", "5"))
+BATCH_MAX_QUEUE = int(os.getenv("BATCH_MAX_QUEUE", "1024"))
+
+# WebSocket — /ws/predict keeps at most WS_MAX_IN_FLIGHT messages per
+# connection in the batcher; further messages are not read until one is
+# answered.
+WS_MAX_IN_FLIGHT = int(os.getenv("WS_MAX_IN_FLIGHT", "32"))
+
+# Inference executor — blocking torch work runs off the event loop on a
+# "thread" or "process" pool.  TORCH_THREADS_PER_WORKER=0 splits the CPU
+# cores evenly across workers.
+INFERENCE_EXECUTOR = os.getenv("INFERENCE_EXECUTOR", "thread").lower()
+INFERENCE_WORKERS = int(os.getenv("INFERENCE_WORKERS", "1"))
+TORCH_THREADS_PER_WORKER = int(os.getenv("TORCH_THREADS_PER_WORKER", "0"))
+
+# Prediction cache — keyed on normalised text + model version.  "memory" is
+# a per-process LRU; "sqlite" is a WAL-mode file shared by all workers.
+CACHE_ENABLED = os.getenv("CACHE_ENABLED", "true").lower() == "true"
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "memory").lower()
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "10000"))
+CACHE_TTL_SECONDS = float(os.getenv("CACHE_TTL_SECONDS", "3600"))
+CACHE_DB_PATH = Path(os.getenv("CACHE_DB_PATH", BASE_DIR.parent / ".cache" / "predictions.sqlite3"))
+CACHE_DB_MAX_MB = float(os.getenv("CACHE_DB_MAX_MB", "256"))
+
+# Inference cascade — texts whose raw heuristic score is >= CASCADE_HIGH
+# (sarcastic) or <= CASCADE_LOW (not sarcastic) are answered without
+# running the model, with the validation precision measured for that
+# threshold as their confidence.  Calibrate all four with
+# `python -m model.calibrate_cascade`; the defaults short-circuit nothing
+# (raw scores lie in [0, 0.98]).
+CASCADE_ENABLED = os.getenv("CASCADE_ENABLED", "false").lower() == "true"
+CASCADE_HIGH = float(os.getenv("CASCADE_HIGH", "1.0"))
+CASCADE_LOW = float(os.getenv("CASCADE_LOW", "-1.0"))
+CASCADE_HIGH_PRECISION = float(os.getenv("CASCADE_HIGH_PRECISION", "0.95"))
+CASCADE_LOW_PRECISION = float(os.getenv("CASCADE_LOW_PRECISION", "0.95"))
+
+# Heuristic rule pack (JSON or YAML).  The compiled form is cached under
+# RULES_CACHE_DIR keyed by the pack's content hash; POST
+# /api/admin/rules/reload swaps in an edited pack without a restart.
+RULES_PATH = Path(os.getenv("RULES_PATH", BASE_DIR / "rules" / "default.json"))
+RULES_CACHE_DIR = Path(os.getenv("RULES_CACHE_DIR", BASE_DIR.parent / ".cache" / "rules"))
+
+# Weight sharing between processes.  "mmap": every process maps the same
+# checkpoint file pages read-only (uvicorn workers and process-pool workers
+# alike).  "shm": the parent loads the fp32 model once into shared memory
+# and hands it to the process-pool workers.
+WEIGHT_SHARING = os.getenv("WEIGHT_SHARING", "mmap").lower()
+
+# Warm-up — synthetic batches of every WARMUP_SEQ_LENGTHS × WARMUP_BATCH_SIZES
+# shape run on start-up (and before a hot-swap), in every process worker;
+# /api/ready returns 503 until they have finished.
+WARMUP_ENABLED = os.getenv("WARMUP_ENABLED", "true").lower() == "true"
+WARMUP_SEQ_LENGTHS = [int(n) for n in os.getenv("WARMUP_SEQ_LENGTHS", "16,64,128").split(",")]
+WARMUP_BATCH_SIZES = [int(n) for n in os.getenv("WARMUP_BATCH_SIZES", "1,8,32").split(",")]
+
+# Hot-swap — POST /api/admin/reload loads a new checkpoint in the
+# background and swaps it in; it needs the X-Admin-Token header to match
+# ADMIN_TOKEN (the admin API is disabled while ADMIN_TOKEN is unset).
+# MODEL_WATCH_INTERVAL > 0 also polls the checkpoint and rule pack files
+# every N seconds and reloads whichever changed.  Admin reloads only swap
+# the uvicorn worker that serves the request, so multi-worker deployments
+# should replace the files and rely on the watcher instead.
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", "")
+MODEL_WATCH_INTERVAL = float(os.getenv("MODEL_WATCH_INTERVAL", "0"))
+
+# Explanation jobs — /api/predict queues expensive explanations (SHAP) for
+# EXPLANATION_WORKERS background workers and returns a job id.  At most
+# EXPLANATION_QUEUE_SIZE jobs wait (more are rejected); the last
+# EXPLANATION_JOB_HISTORY jobs stay pollable and finished explanations are
+# cached by text (EXPLANATION_CACHE_ENTRIES, CACHE_TTL_SECONDS).
+EXPLANATION_WORKERS = int(os.getenv("EXPLANATION_WORKERS", "1"))
+EXPLANATION_QUEUE_SIZE = int(os.getenv("EXPLANATION_QUEUE_SIZE", "64"))
+EXPLANATION_JOB_HISTORY = int(os.getenv("EXPLANATION_JOB_HISTORY", "1000"))
+EXPLANATION_CACHE_ENTRIES = int(os.getenv("EXPLANATION_CACHE_ENTRIES", "1000"))
+
+# Streaming — /api/predict/stream scores NDJSON input in batches of
+# STREAM_BATCH_SIZE; lines over STREAM_MAX_LINE_BYTES are rejected.
+STREAM_BATCH_SIZE = int(os.getenv("STREAM_BATCH_SIZE", "64"))
+STREAM_MAX_LINE_BYTES = int(os.getenv("STREAM_MAX_LINE_BYTES", "16384"))
+
+# Bulk jobs — POST /api/jobs spools CSV/JSONL uploads (at most
+# JOB_MAX_UPLOAD_MB) under JOBS_DIR and scores them in the background in
+# batches of JOB_BATCH_SIZE, checkpointing after each batch.
+JOBS_DIR = Path(os.getenv("JOBS_DIR", BASE_DIR.parent / ".cache" / "jobs"))
+JOB_BATCH_SIZE = int(os.getenv("JOB_BATCH_SIZE", "256"))
+JOB_MAX_UPLOAD_MB = float(os.getenv("JOB_MAX_UPLOAD_MB", "512"))
+
 # SHAP
+# SHAP_MAX_SAMPLES caps the masked samples evaluated per explanation, which
+# bounds SHAP latency to roughly that many rows of batched inference.
 SHAP_ENABLED = os.getenv("SHAP_ENABLED", "false").lower() == "true"
-SHAP_MAX_SAMPLES = 50
+SHAP_MAX_SAMPLES = int(os.getenv("SHAP_MAX_SAMPLES", "50"))
 
 # Server
 CORS_ORIGINS = os.getenv("CORS_ORIGINS", "http://localhost:3000").split(",")
@@ -4,19 +4,43 @@ Context-Based Sarcasm Detector — FastAPI Backend
 Run with:  uvicorn backend.main:app --reload --port 8000
 """
 
+import asyncio
+import json
 import logging
 import sys
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI, Request
+from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
+from backend.api.admin import router as admin_router
+from backend.api.jobs import router as jobs_router
 from backend.api.predict import router as predict_router
 from backend.api.stats import router as stats_router
-from backend.config import CORS_ORIGINS, DEVICE, LOG_LEVEL
-from backend.schemas import HealthResponse
-from backend.services.model_service import is_model_loaded, load_model
+from backend.config import (
+    CORS_ORIGINS,
+    DEVICE,
+    LOG_LEVEL,
+    MODEL_WATCH_INTERVAL,
+    WS_MAX_IN_FLIGHT,
+)
+from backend.schemas import HealthResponse, ReadyResponse
+from backend.services.bulk_jobs import close_jobs, resume_jobs
+from backend.services.explainer import get_attention_explanation
+from backend.services.explanation_jobs import close_explanations
+from backend.services.model_service import (
+    close_batcher,
+    get_model_version,
+    is_model_loaded,
+    is_ready,
+    load_model,
+    predict_async,
+    shutdown_executor,
+    warm_up_workers,
+    watch_model_file,
+)
+from backend.services.streaming import parse_line
 
 # ── Logging ───────────────────────────────────────────────
 logging.basicConfig(
@@ -32,8 +56,22 @@ logger = logging.getLogger(__name__)
 async def lifespan(app: FastAPI):
     logger.info("Starting sarcasm detector backend …")
     load_model()
+    # Liveness (/api/health) answers straight away; readiness waits for this
+    warm_up = asyncio.create_task(warm_up_workers())
+    # Bulk jobs interrupted by the last shutdown continue from their checkpoint
+    resume_jobs()
+    watcher = None
+    if MODEL_WATCH_INTERVAL > 0:
+        watcher = asyncio.create_task(watch_model_file(MODEL_WATCH_INTERVAL))
     yield
     logger.info("Shutting down …")
+    warm_up.cancel()
+    if watcher is not None:
+        watcher.cancel()
+    await close_batcher()
+    await close_explanations()
+    await close_jobs()
+    shutdown_executor()
 
 
 # ── App ───────────────────────────────────────────────────
@@ -61,6 +99,8 @@ app.add_middleware(
 # Routers
 app.include_router(predict_router)
 app.include_router(stats_router)
+app.include_router(admin_router)
+app.include_router(jobs_router)
 
 
 # ── Global exception handler ────────────────────────────
@@ -79,5 +119,89 @@ async def health():
     return HealthResponse(
         status="ok",
         model_loaded=is_model_loaded(),
+        model_version=get_model_version(),
         device=DEVICE,
     )
+
+
+@app.get(
+    "/api/ready",
+    response_model=ReadyResponse,
+    responses={503: {"model": ReadyResponse}},
+    tags=["Health"],
+)
+async def ready():
+    """Readiness probe — 503 until the model is loaded and warmed up."""
+    body = ReadyResponse(ready=is_ready(), model_version=get_model_version())
+    if not body.ready:
+        return JSONResponse(status_code=503, content=body.model_dump())
+    return body
+
+
+# ── WebSocket ─────────────────────────────────────────────
+@app.websocket("/ws/predict")
+async def predict_socket(websocket: WebSocket, explain: bool = True):
+    """
+    Persistent prediction stream for chat moderation.
+
+    Each message is a JSON text or ``{"text": ..., "id": ...}``; each reply
+    is the prediction tagged with that ``id`` (``{"id", "error"}`` for
+    invalid messages), sent as soon as it is ready — possibly out of order.
+    Messages from every socket share the micro-batcher.  A connection keeps
+    at most WS_MAX_IN_FLIGHT messages in flight and is not read any further
+    until one is answered, so a full batcher queue backs up to the client.
+    """
+    await websocket.accept()
+    slots = asyncio.Semaphore(max(1, WS_MAX_IN_FLIGHT))
+    send_lock = asyncio.Lock()
+    pending = set()
+
+    async def reply(payload: dict) -> None:
+        async with send_lock:
+            await websocket.send_text(json.dumps(payload))
+
+    async def answer(message_id, text: str) -> None:
+        try:
+            result = await predict_async(text, explain)
+            if explain and result.get("attention_scores"):
+                result["explanation"] = get_attention_explanation(
+                    result["attention_scores"], result["prediction"], result["confidence"]
+                )
+            payload = {"id": message_id, **result}
+        except Exception:
+            logger.exception("WebSocket prediction failed")
+            payload = {"id": message_id, "error": "prediction failed"}
+        finally:
+            slots.release()
+        try:
+            await reply(payload)
+        except (WebSocketDisconnect, RuntimeError):
+            pass  # the client went away
+
+    try:
+        while True:
+            await slots.acquire()
+            message = await websocket.receive_text()
+            try:
+                text, message_id = parse_line(message)
+            except (TypeError, ValueError) as e:
+                slots.release()
+                await reply({"id": _message_id(message), "error": str(e)})
+                continue
+            task = asyncio.create_task(answer(message_id, text))
+            pending.add(task)
+            task.add_done_callback(pending.discard)
+    except WebSocketDisconnect:
+        pass
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+def _message_id(message: str):
+    """Best-effort id of an invalid message, so the error can be matched."""
+    try:
+        item = json.loads(message)
+    except ValueError:
+        return None
+    return item.get("id") if isinstance(item, dict) else None
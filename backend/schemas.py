@@ -14,6 +14,11 @@ class PredictRequest(BaseModel):
         description="The text to analyse for sarcasm.",
         examples=["Oh great, another Monday morning!"],
     )
+    explain: bool = Field(
+        default=True,
+        description="Return highlighted words, attention scores and an explanation. "
+        "Set to false for a faster label-only prediction.",
+    )
 
 
 class BatchPredictRequest(BaseModel):
@@ -23,6 +28,17 @@ class BatchPredictRequest(BaseModel):
         max_length=50,
         description="List of texts to analyse (max 50).",
     )
+    explain: bool = Field(
+        default=True,
+        description="Return explanations for each text (false = label only).",
+    )
+
+
+class ReloadRequest(BaseModel):
+    path: Optional[str] = Field(
+        default=None,
+        description="File to load (defaults to the active checkpoint or rule pack).",
+    )
 
 
 # ── Responses ─────────────────────────────────────────────
@@ -39,6 +55,10 @@ class PredictResponse(BaseModel):
         default=None,
         description="Word-level attention scores for visualization",
     )
+    explanation_job_id: Optional[str] = Field(
+        default=None,
+        description="Poll /api/explanations/{id} for the queued SHAP explanation",
+    )
 
 
 class BatchPredictResponse(BaseModel):
@@ -57,11 +77,102 @@ class ModelStatsResponse(BaseModel):
     confusion_matrix: dict
 
 
+class CacheStatsResponse(BaseModel):
+    enabled: bool
+    backend: Optional[str] = None
+    entries: int = 0
+    max_entries: Optional[int] = None
+    size_bytes: Optional[int] = None
+    max_bytes: Optional[int] = None
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    hit_rate: float = 0.0
+
+
+class CascadeStatsResponse(BaseModel):
+    enabled: bool
+    high_threshold: float
+    low_threshold: float
+    high_precision: float = Field(..., description="Confidence of short-circuited sarcastic answers")
+    low_precision: float = Field(..., description="Confidence of short-circuited not-sarcastic answers")
+    total: int = Field(..., description="Texts that reached the cascade (cache misses)")
+    short_circuited: int = Field(..., description="Texts answered without the model")
+    short_circuited_sarcastic: int
+    short_circuited_not_sarcastic: int
+    short_circuit_rate: float
+
+
+class ModelVersionInfo(BaseModel):
+    version: str
+    engine: str
+    path: str
+    loaded_at: float
+
+
+class ModelInfoResponse(BaseModel):
+    version: str
+    engine: str
+    path: Optional[str] = None
+    mock: bool
+    history: List[ModelVersionInfo] = Field(
+        default_factory=list,
+        description="Versions loaded by this process, newest first",
+    )
+
+
+class RulesInfoResponse(BaseModel):
+    name: str
+    version: str = Field(..., description="sha256 prefix of the rule pack file")
+    source: str
+    patterns: int
+    phrases: int
+
+
+class ExplanationJobResponse(BaseModel):
+    id: str
+    status: str = Field(..., description="pending, running, done, failed or rejected")
+    method: str
+    result: Optional[dict] = Field(
+        default=None,
+        description="Token-level scores once the job is done",
+    )
+    error: Optional[str] = None
+
+
+class BulkJobResponse(BaseModel):
+    id: str
+    status: str = Field(..., description="queued, running, done or failed")
+    format: str
+    filename: str
+    explain: bool
+    rows_done: int
+    rows_failed: int
+    rows_per_second: Optional[float] = Field(
+        default=None,
+        description="Throughput of the current (or last) run",
+    )
+    created_at: float
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    error: Optional[str] = None
+    results_url: Optional[str] = Field(
+        default=None,
+        description="Download link once the job is done",
+    )
+
+
 class HealthResponse(BaseModel):
     status: str
     model_loaded: bool
+    model_version: str
     device: str
 
 
+class ReadyResponse(BaseModel):
+    ready: bool
+    model_version: str
+
+
 class ErrorResponse(BaseModel):
     detail: str
@@ -0,0 +1,325 @@
+"""
+Bulk file scoring jobs.
+
+An uploaded CSV or JSONL file is spooled to ``JOBS_DIR/<id>/`` and scored
+in the background in batches of JOB_BATCH_SIZE on a dedicated thread, so
+large offline runs never queue behind (or in front of) interactive
+requests on the inference executor.  Results are appended to
+``results.jsonl`` and ``job.json`` is checkpointed after every batch with
+the rows done and the results file size; a job interrupted by a restart
+is picked up again at start-up from its last checkpoint.  A process runs
+a job only while holding an exclusive lock on its ``job.lock``, so when
+every uvicorn worker resumes the same jobs, each is run by one of them.
+"""
+
+import asyncio
+import csv
+import itertools
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, suppress
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from backend.config import JOB_BATCH_SIZE, JOBS_DIR
+from backend.services.model_service import predict_batch
+from backend.services.streaming import check_text, parse_line
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+logger = logging.getLogger(__name__)
+
+JOB_FORMATS = ("csv", "jsonl")
+_JOB_ID_RE = re.compile(r"[0-9a-f]{32}")
+
+# (text, id, error) for one input row
+Row = Tuple[Optional[str], Any, Optional[str]]
+
+
+# ── Job files ─────────────────────────────────────────────
+def _job_dir(job_id: str) -> Optional[Path]:
+    if not _JOB_ID_RE.fullmatch(job_id):
+        return None
+    return JOBS_DIR / job_id
+
+
+def _write_state(state: Dict) -> None:
+    """Atomically replace the job's checkpoint."""
+    job_dir = JOBS_DIR / state["id"]
+    fd, tmp = tempfile.mkstemp(dir=job_dir, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(state, f)
+        os.replace(tmp, job_dir / "job.json")
+    except BaseException:
+        with suppress(OSError):
+            os.unlink(tmp)
+        raise
+
+
+def read_job(job_id: str) -> Optional[Dict]:
+    job_dir = _job_dir(job_id)
+    if job_dir is None:
+        return None
+    try:
+        return json.loads((job_dir / "job.json").read_text())
+    except FileNotFoundError:
+        return None
+
+
+def results_path(job_id: str) -> Path:
+    return JOBS_DIR / job_id / "results.jsonl"
+
+
+def create_job(
+    fmt: str, filename: str, text_column: str = "text", id_column: str = "id",
+    explain: bool = False,
+) -> Tuple[Dict, Path]:
+    """Create the job directory; returns the new state and the input path to fill."""
+    if fmt not in JOB_FORMATS:
+        raise ValueError(f"Unsupported format {fmt!r} (expected one of: {', '.join(JOB_FORMATS)})")
+    job_id = uuid.uuid4().hex
+    (JOBS_DIR / job_id).mkdir(parents=True)
+    state = {
+        "id": job_id,
+        "status": "uploading",
+        "format": fmt,
+        "filename": filename,
+        "text_column": text_column,
+        "id_column": id_column,
+        "explain": explain,
+        "rows_done": 0,
+        "rows_failed": 0,
+        "results_bytes": 0,
+        "rows_per_second": None,
+        "created_at": time.time(),
+        "started_at": None,
+        "finished_at": None,
+        "error": None,
+    }
+    _write_state(state)
+    return state, JOBS_DIR / job_id / f"input.{fmt}"
+
+
+@contextmanager
+def _claim(job_id: str) -> Iterator[bool]:
+    """Hold the job's lock for the block; yields False if another process has it."""
+    with open(JOBS_DIR / job_id / "job.lock", "a+b") as f:
+        try:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:
+                msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+        except OSError:
+            yield False
+            return
+        # Closing the file releases the lock, also if the process dies
+        yield True
+
+
+# ── Reading input ─────────────────────────────────────────
+def _jsonl_rows(path: Path) -> Iterator[Row]:
+    with open(path, "rb") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                text, item_id = parse_line(line)
+            except (TypeError, ValueError) as exc:
+                yield None, None, str(exc)
+                continue
+            yield text, item_id, None
+
+
+def _csv_rows(path: Path, text_column: str, id_column: str) -> Iterator[Row]:
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        reader = csv.DictReader(f)
+        if text_column not in (reader.fieldnames or ()):
+            raise ValueError(f"CSV has no {text_column!r} column")
+        for record in reader:
+            text = record[text_column]
+            try:
+                check_text(text or "")
+            except ValueError as exc:
+                yield None, record.get(id_column), str(exc)
+                continue
+            yield text, record.get(id_column), None
+
+
+def _rows(state: Dict, path: Path) -> Iterator[Row]:
+    if state["format"] == "csv":
+        return _csv_rows(path, state["text_column"], state["id_column"])
+    return _jsonl_rows(path)
+
+
+# ── Scoring ───────────────────────────────────────────────
+def run_job(job_id: str, stop: Optional[threading.Event] = None) -> Optional[Dict]:
+    """
+    Score a job from its last checkpoint (blocking).  Returns the final
+    state; if *stop* is set the job halts after the current batch and
+    stays resumable.  Returns None, leaving the job alone, when another
+    process is already running it.
+    """
+    with _claim(job_id) as claimed:
+        if not claimed:
+            logger.info("Bulk job %s is running in another process", job_id)
+            return None
+        return _run_claimed(job_id, stop)
+
+
+def _run_claimed(job_id: str, stop: Optional[threading.Event]) -> Dict:
+    # Re-read under the lock: another process may have finished the job
+    state = read_job(job_id)
+    if state["status"] == "done":
+        return state
+    job_dir = JOBS_DIR / job_id
+    state.update(status="running", error=None)
+    state["started_at"] = state["started_at"] or time.time()
+    _write_state(state)
+
+    run_started, run_rows = time.monotonic(), 0
+    try:
+        rows = _rows(state, job_dir / f"input.{state['format']}")
+        rows = itertools.islice(rows, state["rows_done"], None)
+        with open(job_dir / "results.jsonl", "ab") as out:
+            # Drop anything written after the last checkpoint
+            out.truncate(state["results_bytes"])
+            index = state["rows_done"]
+            while True:
+                if stop is not None and stop.is_set():
+                    logger.info("Bulk job %s paused at row %d", job_id, index)
+                    return state
+                batch = list(itertools.islice(rows, max(1, JOB_BATCH_SIZE)))
+                if not batch:
+                    break
+                out.write(_score_batch(batch, index, state["explain"]))
+                out.flush()
+                os.fsync(out.fileno())
+                index += len(batch)
+                run_rows += len(batch)
+                state["rows_done"] = index
+                state["rows_failed"] += sum(1 for _, _, error in batch if error)
+                state["results_bytes"] = out.tell()
+                state["rows_per_second"] = round(
+                    run_rows / max(time.monotonic() - run_started, 1e-9), 1
+                )
+                _write_state(state)
+    except Exception as exc:
+        logger.exception("Bulk job %s failed", job_id)
+        state.update(status="failed", error=str(exc), finished_at=time.time())
+        _write_state(state)
+        return state
+
+    state.update(status="done", finished_at=time.time())
+    _write_state(state)
+    logger.info("Bulk job %s done: %d rows", job_id, state["rows_done"])
+    return state
+
+
+def _score_batch(batch: List[Row], start: int, explain: bool) -> bytes:
+    valid = [i for i, (_, _, error) in enumerate(batch) if error is None]
+    results = predict_batch([batch[i][0] for i in valid], explain, cache=False) if valid else []
+    by_row = dict(zip(valid, results))
+    lines = []
+    for i, (_, item_id, error) in enumerate(batch):
+        row: Dict[str, Any] = {"index": start + i}
+        if item_id is not None:
+            row["id"] = item_id
+        if error is not None:
+            row["error"] = error
+        else:
+            row.update(by_row[i])
+        lines.append(json.dumps(row).encode() + b"\n")
+    return b"".join(lines)
+
+
+# ── Background runner ─────────────────────────────────────
+class BulkJobRunner:
+    """
+    Runs queued jobs one at a time on its own thread.
+
+    Like MicroBatcher, the queue is bound to the running event loop and
+    started lazily.  ``close`` asks the running job to stop after its
+    current batch; its checkpoint lets ``resume`` continue it later.
+    """
+
+    def __init__(self):
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._stop = threading.Event()
+
+    def _ensure_worker(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._worker is None or self._worker.done():
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._stop.clear()
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="bulk")
+            self._worker = loop.create_task(self._run())
+
+    def submit(self, job_id: str) -> None:
+        self._ensure_worker()
+        state = read_job(job_id)
+        state["status"] = "queued"
+        _write_state(state)
+        self._queue.put_nowait(job_id)
+
+    def resume(self) -> List[str]:
+        """Re-queue jobs left queued or running by a previous process."""
+        self._ensure_worker()
+        pending = []
+        for path in sorted(JOBS_DIR.glob("*/job.json"), key=lambda p: p.stat().st_mtime):
+            job_id = path.parent.name
+            state = read_job(job_id)
+            if state and state["status"] in ("queued", "running"):
+                self._queue.put_nowait(job_id)
+                pending.append(job_id)
+        if pending:
+            logger.info("Resuming %d bulk job(s)", len(pending))
+        return pending
+
+    async def _run(self) -> None:
+        while True:
+            job_id = await self._queue.get()
+            await self._loop.run_in_executor(self._pool, run_job, job_id, self._stop)
+
+    async def close(self) -> None:
+        self._stop.set()
+        worker, self._worker = self._worker, None
+        if worker is not None and not worker.done():
+            worker.cancel()
+            if self._loop is asyncio.get_running_loop():
+                with suppress(asyncio.CancelledError):
+                    await worker
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
+            self._pool = None
+
+
+_runner = BulkJobRunner()
+
+
+def submit_job(job_id: str) -> None:
+    _runner.submit(job_id)
+
+
+def resume_jobs() -> List[str]:
+    return _runner.resume()
+
+
+async def close_jobs() -> None:
+    await _runner.close()
@@ -0,0 +1,248 @@
+"""
+Prediction caches.
+
+``PredictionCache`` is a bounded in-process LRU with a TTL;
+``SqlitePredictionCache`` keeps the same interface on a SQLite file in WAL
+mode so every uvicorn worker on a node shares one cache.
+
+Keys combine the model version with the normalised text, so a model swap
+never serves stale predictions, and both backends drop their entries when
+``set_model_version`` sees a new version.  Values are copied on the way in
+and out because callers enrich the returned dicts in place.
+"""
+
+import copy
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_text(text: str) -> str:
+    """
+    Collapse whitespace so trivial variants share an entry.  Case is kept:
+    capitals are a sarcasm cue and highlighted words echo the input.
+    """
+    return " ".join(text.split())
+
+
+def make_key(text: str, model_version: str, explain: bool = True) -> str:
+    return f"{model_version}|{int(explain)}|{normalize_text(text)}"
+
+
+class PredictionCache:
+    """Thread-safe LRU cache whose entries also expire after ``ttl_seconds``."""
+
+    backend = "memory"
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max(1, max_entries)
+        self.ttl_seconds = ttl_seconds
+        self._data: "OrderedDict[str, Tuple[float, Dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._model_version: Optional[str] = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[Dict]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            stored_at, value = entry
+            if self.ttl_seconds > 0 and time.monotonic() - stored_at > self.ttl_seconds:
+                del self._data[key]
+                self.evictions += 1
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+        return copy.deepcopy(value)
+
+    def put(self, key: str, value: Dict) -> None:
+        value = copy.deepcopy(value)
+        with self._lock:
+            self._data[key] = (time.monotonic(), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def set_model_version(self, version: str) -> None:
+        """Drop every entry if *version* differs from the last one seen."""
+        with self._lock:
+            if self._model_version not in (None, version):
+                self._data.clear()
+            self._model_version = version
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "backend": self.backend,
+                "entries": len(self._data),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+class SqlitePredictionCache:
+    """
+    Cross-process cache on a SQLite file (WAL mode, one connection per thread).
+
+    Entries expire after ``ttl_seconds``; once the stored values exceed
+    ``max_bytes`` the least recently used rows are evicted.  Hit and miss
+    counters are per process, the entry count is shared.
+    """
+
+    backend = "sqlite"
+    _EVICT_EVERY = 64  # puts between size checks
+
+    def __init__(self, path: Path, max_bytes: int, ttl_seconds: float):
+        self.path = Path(path)
+        self.max_bytes = max(1, max_bytes)
+        self.ttl_seconds = ttl_seconds
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._puts = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    # ── Connection ──────────────────────────────────────────
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS predictions ("
+                " key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL,"
+                " created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS predictions_accessed"
+                " ON predictions (accessed_at)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT)"
+            )
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def _digest(key: str) -> str:
+        return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+    # ── Cache interface ─────────────────────────────────────
+    def get(self, key: str) -> Optional[Dict]:
+        conn = self._conn()
+        digest = self._digest(key)
+        row = conn.execute(
+            "SELECT value, created_at FROM predictions WHERE key = ?", (digest,)
+        ).fetchone()
+        now = time.time()
+        if row is not None and self.ttl_seconds > 0 and now - row[1] > self.ttl_seconds:
+            conn.execute("DELETE FROM predictions WHERE key = ?", (digest,))
+            with self._lock:
+                self.evictions += 1
+            row = None
+        with self._lock:
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        conn.execute(
+            "UPDATE predictions SET accessed_at = ? WHERE key = ?", (now, digest)
+        )
+        return json.loads(row[0])
+
+    def put(self, key: str, value: Dict) -> None:
+        conn = self._conn()
+        payload = json.dumps(value)
+        now = time.time()
+        conn.execute(
+            "INSERT OR REPLACE INTO predictions VALUES (?, ?, ?, ?, ?)",
+            (self._digest(key), payload, len(payload), now, now),
+        )
+        with self._lock:
+            self._puts += 1
+            check = self._puts % self._EVICT_EVERY == 0
+        if check:
+            self._evict(conn)
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM predictions").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        # Trim to 90% so eviction doesn't run on every subsequent put
+        excess = total - int(self.max_bytes * 0.9)
+        victims = []
+        for digest, size in conn.execute(
+            "SELECT key, size FROM predictions ORDER BY accessed_at"
+        ):
+            if excess <= 0:
+                break
+            victims.append((digest,))
+            excess -= size
+        conn.executemany("DELETE FROM predictions WHERE key = ?", victims)
+        with self._lock:
+            self.evictions += len(victims)
+
+    def clear(self) -> None:
+        self._conn().execute("DELETE FROM predictions")
+
+    def set_model_version(self, version: str) -> None:
+        """Invalidate the shared cache when the model checkpoint changes."""
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT value FROM meta WHERE name = 'model_version'"
+            ).fetchone()
+            if row is None or row[0] != version:
+                if row is not None:
+                    logger.info("Model changed (%s → %s) — clearing cache", row[0], version)
+                conn.execute("DELETE FROM predictions")
+                conn.execute(
+                    "INSERT OR REPLACE INTO meta VALUES ('model_version', ?)", (version,)
+                )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def stats(self) -> Dict:
+        entries, size = self._conn().execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM predictions"
+        ).fetchone()
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "backend": self.backend,
+                "entries": entries,
+                "size_bytes": size,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
@@ -2,10 +2,18 @@
 Explainer service — attention-weight visualization & optional SHAP.
 """
 
+import functools
 import logging
+import threading
 from typing import Dict, List, Optional
 
-from backend.config import SHAP_ENABLED
+import numpy as np
+import torch
+import torch.nn.functional as F
+
+from backend.config import DEVICE, LABELS, NUM_LABELS, SHAP_ENABLED, SHAP_MAX_SAMPLES
+from backend.services import model_service
+from backend.services.model_service import encode_in_buckets
 
 logger = logging.getLogger(__name__)
 
@@ -38,49 +46,72 @@ def get_attention_explanation(
     return base
 
 
+# ── SHAP ──────────────────────────────────────────────────
+# Building a shap.Explainer (masker, partition tree) is far more expensive
+# than using one, so each inference worker keeps its explainer for the
+# active model version and rebuilds it only after a hot-swap.  Explainers
+# carry per-call state, hence one per worker thread rather than a global.
+_local = threading.local()
+
+
+def _predict_proba(model, tokenizer, texts: List[str]) -> np.ndarray:
+    """Class probabilities for SHAP's masked samples, in dynamically padded buckets."""
+    results = np.zeros((len(texts), NUM_LABELS), dtype=np.float32)
+    for indices, input_ids, attention_mask in encode_in_buckets(
+        tokenizer, [str(t) for t in texts]
+    ):
+        with torch.no_grad():
+            logits, _ = model(
+                input_ids.to(DEVICE),
+                attention_mask.to(DEVICE),
+                output_attentions=False,
+            )
+            probs = F.softmax(logits, dim=1)
+        results[indices] = probs.cpu().numpy()
+    return results
+
+
+def _get_shap_explainer():
+    """The SHAP explainer for the loaded model, built once per worker thread."""
+    import shap
+
+    version = model_service._model_version
+    cached = getattr(_local, "explainer", None)
+    if cached is None or cached[0] != version:
+        predict = functools.partial(
+            _predict_proba, model_service._model, model_service._tokenizer
+        )
+        explainer = shap.Explainer(
+            predict, shap.maskers.Text(model_service._tokenizer), output_names=LABELS
+        )
+        cached = _local.explainer = (version, explainer)
+        logger.info("Built SHAP explainer for model %s", version)
+    return cached[1]
+
+
 def get_shap_explanation(text: str) -> Optional[Dict]:
     """
     Generate SHAP-based explanations.
     Only runs when SHAP_ENABLED is True and the real model is loaded.
     Returns token-level SHAP values or None.
+
+    At most SHAP_MAX_SAMPLES masked samples are evaluated, all handed to
+    the model in one call so they are scored in length-bucketed batches.
     """
     if not SHAP_ENABLED:
         return None
 
+    if model_service._is_mock or model_service._model is None:
+        logger.info("SHAP explanation skipped — no real model loaded.")
+        return None
+
     try:
-        import shap
-        from backend.services.model_service import _model, _tokenizer, _is_mock
-
-        if _is_mock or _model is None:
-            logger.info("SHAP explanation skipped — no real model loaded.")
-            return None
-
-        def model_predict(texts: List[str]):
-            import torch
-            import torch.nn.functional as F
-            from backend.config import MAX_LENGTH, DEVICE
-
-            results = []
-            for t in texts:
-                enc = _tokenizer(
-                    t,
-                    max_length=MAX_LENGTH,
-                    padding="max_length",
-                    truncation=True,
-                    return_tensors="pt",
-                )
-                with torch.no_grad():
-                    logits, _ = _model(
-                        enc["input_ids"].to(DEVICE),
-                        enc["attention_mask"].to(DEVICE),
-                    )
-                    probs = F.softmax(logits, dim=1)
-                results.append(probs.cpu().numpy()[0])
-            import numpy as np
-            return np.array(results)
-
-        explainer = shap.Explainer(model_predict, _tokenizer)
-        shap_values = explainer([text])
+        shap_values = _get_shap_explainer()(
+            [text],
+            max_evals=SHAP_MAX_SAMPLES,
+            batch_size=SHAP_MAX_SAMPLES,
+            silent=True,
+        )
 
         tokens = shap_values.data[0]
         values = shap_values.values[0]
@@ -0,0 +1,184 @@
+"""
+Background explanation jobs.
+
+Expensive explanations (SHAP) are kept out of the ``/api/predict``
+response: the endpoint queues a job and returns its id, a small pool of
+workers drains the bounded queue, and clients poll
+``GET /api/explanations/{id}``.  Finished explanations are cached by text
+and model version, so a repeated text gets a job that is already done.
+"""
+
+import asyncio
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import suppress
+from typing import Callable, Dict, List, Optional
+
+from backend.config import (
+    CACHE_TTL_SECONDS,
+    EXPLANATION_CACHE_ENTRIES,
+    EXPLANATION_JOB_HISTORY,
+    EXPLANATION_QUEUE_SIZE,
+    EXPLANATION_WORKERS,
+)
+from backend.services.cache import PredictionCache, make_key
+from backend.services.explainer import get_shap_explanation
+from backend.services.model_service import get_model_version
+
+logger = logging.getLogger(__name__)
+
+# method name → blocking function returning the explanation (or None)
+EXPLAINERS: Dict[str, Callable[[str], Optional[Dict]]] = {
+    "shap": get_shap_explanation,
+}
+
+
+class ExplanationQueue:
+    """
+    Bounded queue of explanation jobs served by ``workers`` background tasks.
+
+    Each job runs on the queue's own thread pool so explanations never hold
+    up the inference executor.  When ``max_queued`` jobs are already
+    waiting, new ones are recorded as ``rejected`` instead of piling up.
+    Jobs for a text already in flight share that job.
+    """
+
+    def __init__(
+        self,
+        workers: int = EXPLANATION_WORKERS,
+        max_queued: int = EXPLANATION_QUEUE_SIZE,
+        max_jobs: int = EXPLANATION_JOB_HISTORY,
+        cache_entries: int = EXPLANATION_CACHE_ENTRIES,
+    ):
+        self.workers = max(1, workers)
+        self.max_queued = max(1, max_queued)
+        self.max_jobs = max(1, max_jobs)
+        self.cache = PredictionCache(cache_entries, CACHE_TTL_SECONDS)
+        self._jobs: "OrderedDict[str, Dict]" = OrderedDict()
+        self._in_flight: Dict[str, str] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._pool: Optional[ThreadPoolExecutor] = None
+
+    def _ensure_workers(self) -> None:
+        # Workers are bound to the running loop, as in MicroBatcher
+        loop = asyncio.get_running_loop()
+        if self._loop is loop and self._tasks and all(not t.done() for t in self._tasks):
+            return
+        for task in self._tasks:
+            task.cancel()
+        queued = []
+        while self._queue is not None and not self._queue.empty():
+            queued.append(self._queue.get_nowait())
+        self._loop = loop
+        self._queue = asyncio.Queue(maxsize=self.max_queued)
+        # Jobs still waiting carry over to the new workers
+        self._in_flight = {key: job["id"] for job, _, key in queued}
+        for item in queued:
+            self._queue.put_nowait(item)
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(
+                max_workers=self.workers, thread_name_prefix="explain"
+            )
+        self._tasks = [loop.create_task(self._run()) for _ in range(self.workers)]
+
+    def _new_job(self, method: str, status: str, **fields) -> Dict:
+        job = {
+            "id": uuid.uuid4().hex,
+            "status": status,
+            "method": method,
+            "result": None,
+            "error": None,
+            "created_at": time.time(),
+            **fields,
+        }
+        self._jobs[job["id"]] = job
+        while len(self._jobs) > self.max_jobs:
+            self._jobs.popitem(last=False)
+        return job
+
+    def submit(self, text: str, method: str = "shap") -> Dict:
+        """Queue an explanation of *text* and return its job (maybe already done)."""
+        if method not in EXPLAINERS:
+            raise ValueError(f"Unknown explanation method '{method}'")
+        self._ensure_workers()
+        key = f"{method}|{make_key(text, get_model_version())}"
+
+        cached = self.cache.get(key)
+        if cached is not None:
+            return self._new_job(method, "done", result=cached)
+        job_id = self._in_flight.get(key)
+        if job_id in self._jobs:
+            return self._jobs[job_id]
+
+        job = self._new_job(method, "pending")
+        try:
+            self._queue.put_nowait((job, text, key))
+        except asyncio.QueueFull:
+            logger.warning("Explanation queue full — rejecting %s job", method)
+            job["status"] = "rejected"
+            job["error"] = "explanation queue is full"
+            return job
+        self._in_flight[key] = job["id"]
+        return job
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        return self._jobs.get(job_id)
+
+    async def _run(self) -> None:
+        while True:
+            job, text, key = await self._queue.get()
+            job["status"] = "running"
+            try:
+                result = await self._loop.run_in_executor(
+                    self._pool, EXPLAINERS[job["method"]], text
+                )
+            except asyncio.CancelledError:
+                job["status"], job["error"] = "failed", "explanation worker stopped"
+                job["finished_at"] = time.time()
+                raise
+            except Exception as exc:
+                logger.exception("Explanation job %s failed", job["id"])
+                result, job["error"] = None, str(exc)
+            finally:
+                self._in_flight.pop(key, None)
+            if result is None:
+                job["status"] = "failed"
+                job["error"] = job["error"] or "explanation unavailable"
+            else:
+                self.cache.put(key, result)
+                job["status"], job["result"] = "done", result
+            job["finished_at"] = time.time()
+
+    async def close(self) -> None:
+        """Stop the workers; queued jobs are dropped."""
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        if self._loop is asyncio.get_running_loop():
+            for task in tasks:
+                with suppress(asyncio.CancelledError):
+                    await task
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+_explanations = ExplanationQueue()
+
+
+def submit_explanation(text: str, method: str = "shap") -> Dict:
+    """Queue an explanation job on the shared queue (call from the event loop)."""
+    return _explanations.submit(text, method)
+
+
+def get_explanation_job(job_id: str) -> Optional[Dict]:
+    return _explanations.get(job_id)
+
+
+async def close_explanations() -> None:
+    await _explanations.close()
@@ -5,22 +5,80 @@ Falls back to a mock predictor when no trained model file is found,
 so the app works out of the box for development / demo purposes.
 """
 
+import asyncio
+import copy
+import hashlib
+import json
 import logging
+import os
 import random
 import re
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager, suppress
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
 
+import pandas as pd
 import torch
 import torch.nn.functional as F
 
 from backend.config import (
+    BATCH_MAX_QUEUE,
+    BATCH_MAX_SIZE,
+    BATCH_MAX_WAIT_MS,
+    BUCKET_BATCH_SIZE,
+    CACHE_BACKEND,
+    CACHE_DB_MAX_MB,
+    CACHE_DB_PATH,
+    CACHE_ENABLED,
+    CACHE_MAX_ENTRIES,
+    CACHE_TTL_SECONDS,
+    CASCADE_ENABLED,
+    CASCADE_HIGH,
+    CASCADE_HIGH_PRECISION,
+    CASCADE_LOW,
+    CASCADE_LOW_PRECISION,
     DEVICE,
+    EXPLANATION_METHOD,
+    INFERENCE_ENGINE,
+    INFERENCE_EXECUTOR,
+    INFERENCE_WORKERS,
     LABELS,
+    LENGTH_BUCKETING,
     MAX_LENGTH,
     MODEL_PATH,
     NUM_LABELS,
+    ONNX_MODEL_PATH,
+    QUANTIZED_MODEL_PATH,
+    RULES_PATH,
     TOKENIZER_NAME,
+    TORCH_THREADS_PER_WORKER,
+    WARMUP_BATCH_SIZES,
+    WARMUP_ENABLED,
+    WARMUP_SEQ_LENGTHS,
+    WEIGHT_SHARING,
+)
+from backend.services.cache import PredictionCache, SqlitePredictionCache, make_key
+from backend.services.rules import (
+    LEXICONS,
+    RuleSet,
+    load_rule_pack,
+    pack_version,
+    rule_cues,
+    tokenize,
 )
 
 logger = logging.getLogger(__name__)
@@ -29,266 +87,742 @@ logger = logging.getLogger(__name__)
 _model = None
 _tokenizer = None
 _is_mock = True
+_model_version = "mock"
+_model_path: Optional[Path] = None
+_model_mtime: Optional[float] = None
+
+
+def _make_cache():
+    if not CACHE_ENABLED:
+        return None
+    if CACHE_BACKEND == "sqlite":
+        max_bytes = int(CACHE_DB_MAX_MB * 1024 * 1024)
+        return SqlitePredictionCache(CACHE_DB_PATH, max_bytes, CACHE_TTL_SECONDS)
+    return PredictionCache(CACHE_MAX_ENTRIES, CACHE_TTL_SECONDS)
+
+
+_cache = _make_cache()
 
 
 # ── BERT Classifier ──────────────────────────────────────
 class BertSarcasmClassifier(torch.nn.Module):
-    """Simple classifier head on top of BERT."""
+    """
+    Simple classifier head on top of BERT.
+
+    Without a *config* the encoder starts from the pretrained
+    ``bert-base-uncased`` weights (for fine-tuning).  With one, only the
+    architecture is built — use ``from_checkpoint`` for inference.
+    """
 
-    def __init__(self, num_labels: int = NUM_LABELS):
+    def __init__(self, num_labels: int = NUM_LABELS, config=None):
         super().__init__()
         from transformers import BertModel
 
-        self.bert = BertModel.from_pretrained(TOKENIZER_NAME)
+        if config is None:
+            self.bert = BertModel.from_pretrained(TOKENIZER_NAME)
+        else:
+            self.bert = BertModel(config)
         self.dropout = torch.nn.Dropout(0.3)
         self.classifier = torch.nn.Linear(self.bert.config.hidden_size, num_labels)
 
-    def forward(self, input_ids, attention_mask, token_type_ids=None):
+    def forward(
+        self,
+        input_ids,
+        attention_mask,
+        token_type_ids=None,
+        output_attentions=True,
+        inputs_embeds=None,
+    ):
         outputs = self.bert(
-            input_ids=input_ids,
+            input_ids=None if inputs_embeds is not None else input_ids,
             attention_mask=attention_mask,
             token_type_ids=token_type_ids,
-            output_attentions=True,
+            output_attentions=output_attentions,
+            inputs_embeds=inputs_embeds,
         )
         pooled = outputs.pooler_output
         pooled = self.dropout(pooled)
         logits = self.classifier(pooled)
         return logits, outputs.attentions
 
+    @classmethod
+    def from_checkpoint(cls, path: Path, num_labels: int = NUM_LABELS) -> "BertSarcasmClassifier":
+        """
+        Build the classifier from the BERT config alone and load *path*.
+
+        Parameters are created on the meta device (no allocation, no random
+        init) and then bound to the checkpoint's memory-mapped tensors.
+        """
+        state, config = load_checkpoint(path)
+        with _params_on_meta():
+            model = cls(num_labels, config=config)
+        model.load_state_dict(state, assign=True)
+        return model.eval()
+
+
+# ── Checkpoints ───────────────────────────────────────────
+@contextmanager
+def _params_on_meta():
+    """Register new parameters on the meta device; buffers stay real."""
+    register = torch.nn.Module.register_parameter
+
+    def register_on_meta(module, name, param):
+        register(module, name, param)
+        if param is not None:
+            meta = module._parameters[name].to("meta")
+            module._parameters[name] = torch.nn.Parameter(meta, param.requires_grad)
+
+    torch.nn.Module.register_parameter = register_on_meta
+    try:
+        yield
+    finally:
+        torch.nn.Module.register_parameter = register
+
+
+def save_checkpoint(model: "BertSarcasmClassifier", path: Path) -> None:
+    """Save weights; ``.safetensors`` files also embed the BERT config."""
+    path = Path(path)
+    if path.suffix == ".safetensors":
+        from safetensors.torch import save_file
+
+        state = {k: v.detach().contiguous().cpu() for k, v in model.state_dict().items()}
+        save_file(state, str(path), metadata={"bert_config": model.bert.config.to_json_string()})
+    else:
+        torch.save(model.state_dict(), path)
+
+
+def checkpoint_config(path: Path):
+    """
+    BERT config for a checkpoint: embedded in safetensors metadata, otherwise
+    the ``bert-base-uncased`` config (hub cache).
+    """
+    from transformers import BertConfig
+
+    path = Path(path)
+    if path.suffix == ".safetensors":
+        from safetensors import safe_open
+
+        with safe_open(str(path), framework="pt") as f:
+            metadata = f.metadata() or {}
+        if "bert_config" in metadata:
+            return BertConfig.from_dict(json.loads(metadata["bert_config"]))
+    return BertConfig.from_pretrained(TOKENIZER_NAME)
+
+
+def load_checkpoint(path: Path):
+    """Return ``(state_dict, BertConfig)`` for *path*, memory-mapped from disk."""
+    path = Path(path)
+    if path.suffix == ".safetensors":
+        from safetensors.torch import load_file
+
+        state = load_file(str(path), device="cpu")
+    else:
+        state = torch.load(path, map_location="cpu", mmap=True, weights_only=True)
+    return state, checkpoint_config(path)
+
+
+# ── INT8 quantization ─────────────────────────────────────
+def quantize_model(model: torch.nn.Module) -> torch.nn.Module:
+    """Apply dynamic int8 quantization to every Linear layer (CPU only)."""
+    return torch.ao.quantization.quantize_dynamic(
+        model.to("cpu").eval(), {torch.nn.Linear}, dtype=torch.qint8
+    )
+
+
+def save_quantized(
+    model: torch.nn.Module, path: Path = QUANTIZED_MODEL_PATH, source: Path = MODEL_PATH
+) -> None:
+    """Save int8 weights tagged with the digest of the checkpoint they came from."""
+    torch.save({"source_digest": _file_digest(source), "state_dict": model.state_dict()}, path)
+    logger.info("Saved int8 model → %s", path)
+
+
+def load_quantized(
+    path: Path = QUANTIZED_MODEL_PATH, source: Path = MODEL_PATH
+) -> Optional[torch.nn.Module]:
+    """
+    Rebuild the quantized module structure, then load the int8 weights.
+    Returns None when the artifact was not built from *source*.
+    """
+    # Packed int8 params are not plain tensors, so weights_only loading won't do
+    saved = torch.load(path, map_location="cpu", weights_only=False)
+    if not isinstance(saved, dict) or saved.get("source_digest") != _file_digest(source):
+        return None
+    model = _quantized_skeleton(checkpoint_config(source))
+    model.load_state_dict(saved["state_dict"], assign=True)
+    return model.eval()
+
+
+def _quantized_skeleton(config) -> torch.nn.Module:
+    """
+    The module structure ``quantize_model`` produces, without any weights:
+    float parameters stay on the meta device and every Linear layer becomes
+    an empty dynamic int8 Linear, so nothing fp32 is allocated or initialised.
+    """
+    from torch.ao.nn.quantized.dynamic import Linear as DynamicQuantizedLinear
+
+    with _params_on_meta():
+        model = BertSarcasmClassifier(NUM_LABELS, config=config)
+    for module in list(model.modules()):
+        for name, child in module.named_children():
+            if type(child) is torch.nn.Linear:
+                setattr(module, name, DynamicQuantizedLinear(
+                    child.in_features, child.out_features,
+                    bias_=child.bias is not None, dtype=torch.qint8,
+                ))
+    return model
+
+
+def _load_fp32(path: Path = MODEL_PATH) -> torch.nn.Module:
+    return BertSarcasmClassifier.from_checkpoint(path, NUM_LABELS).to(DEVICE)
+
+
+def _load_int8(path: Path = MODEL_PATH) -> torch.nn.Module:
+    """Load the int8 artifact, (re)building it when missing or from another checkpoint."""
+    if DEVICE != "cpu":
+        logger.warning("INT8 engine runs on CPU only — ignoring DEVICE=%s", DEVICE)
+    if Path(path) != Path(MODEL_PATH):
+        # The on-disk artifact belongs to MODEL_PATH; quantize other checkpoints in memory
+        return quantize_model(_load_fp32(path))
+    artifact = Path(QUANTIZED_MODEL_PATH)
+    if artifact.exists():
+        model = load_quantized(artifact, MODEL_PATH)
+        if model is not None:
+            return model
+        logger.info("%s was not built from %s — rebuilding", artifact, MODEL_PATH)
+    logger.info("Quantizing %s to int8 …", MODEL_PATH)
+    model = quantize_model(_load_fp32(MODEL_PATH))
+    save_quantized(model, artifact, MODEL_PATH)
+    return model
+
+
+# ── ONNX Runtime engine ───────────────────────────────────
+class OnnxSarcasmClassifier:
+    """
+    ONNX Runtime session exposing the same call signature as
+    ``BertSarcasmClassifier`` — returns ``(logits, attentions)`` tensors.
+
+    Only the last attention layer is exported, so ``attentions`` holds a
+    single tensor (or ``None`` for graphs exported without it).
+    """
+
+    def __init__(self, path: Path = ONNX_MODEL_PATH, num_threads: int = 0):
+        import onnxruntime as ort
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if num_threads > 0:
+            options.intra_op_num_threads = num_threads
+        self.session = ort.InferenceSession(
+            str(path), options, providers=["CPUExecutionProvider"]
+        )
+        outputs = {o.name for o in self.session.get_outputs()}
+        self.has_attention = "last_attention" in outputs
+
+    def __call__(self, input_ids, attention_mask, token_type_ids=None, output_attentions=True):
+        names = ["logits"]
+        if output_attentions and self.has_attention:
+            names.append("last_attention")
+        outputs = self.session.run(names, {
+            "input_ids": input_ids.cpu().numpy(),
+            "attention_mask": attention_mask.cpu().numpy(),
+        })
+        logits = torch.from_numpy(outputs[0])
+        attentions = (torch.from_numpy(outputs[1]),) if len(outputs) > 1 else None
+        return logits, attentions
+
+    def eval(self) -> "OnnxSarcasmClassifier":
+        return self
+
+
+def _load_onnx(path: Path = ONNX_MODEL_PATH) -> OnnxSarcasmClassifier:
+    if DEVICE != "cpu":
+        logger.warning("ONNX engine runs on CPU only — ignoring DEVICE=%s", DEVICE)
+    return OnnxSarcasmClassifier(path, _torch_threads_per_worker())
+
+
+_ENGINES = {
+    "fp32": (MODEL_PATH, _load_fp32),
+    "int8": (MODEL_PATH, _load_int8),
+    "onnx": (ONNX_MODEL_PATH, _load_onnx),
+}
+
 
 # ── Loader ────────────────────────────────────────────────
-def load_model() -> None:
-    """Load the model & tokenizer.  Uses mock mode if no .pt file exists."""
-    global _model, _tokenizer, _is_mock
+def _engine() -> Tuple[Path, Callable[[Path], Any]]:
+    if INFERENCE_ENGINE not in _ENGINES:
+        raise ValueError(
+            f"Unknown INFERENCE_ENGINE {INFERENCE_ENGINE!r} "
+            f"(expected one of: {', '.join(_ENGINES)})"
+        )
+    return _ENGINES[INFERENCE_ENGINE]
 
+
+def _load_tokenizer():
     from transformers import BertTokenizerFast
 
-    _tokenizer = BertTokenizerFast.from_pretrained(TOKENIZER_NAME)
+    return BertTokenizerFast.from_pretrained(TOKENIZER_NAME)
 
-    if Path(MODEL_PATH).exists():
-        logger.info("Loading trained model from %s …", MODEL_PATH)
-        _model = BertSarcasmClassifier(NUM_LABELS)
-        state = torch.load(MODEL_PATH, map_location=DEVICE)
-        _model.load_state_dict(state)
-        _model.to(DEVICE)
-        _model.eval()
-        _is_mock = False
-        logger.info("Model loaded on %s", DEVICE)
+
+def load_model(path: Optional[Path] = None) -> None:
+    """Load the model & tokenizer.  Uses mock mode if no model file exists."""
+    global _tokenizer, _is_mock, _model_version, _model_path
+
+    model_path, loader = _engine()
+    if EXPLANATION_METHOD not in _EXPLANATION_METHODS:
+        raise ValueError(
+            f"Unknown EXPLANATION_METHOD {EXPLANATION_METHOD!r} "
+            f"(expected one of: {', '.join(_EXPLANATION_METHODS)})"
+        )
+    if INFERENCE_EXECUTOR not in _EXECUTORS:
+        raise ValueError(
+            f"Unknown INFERENCE_EXECUTOR {INFERENCE_EXECUTOR!r} "
+            f"(expected one of: {', '.join(_EXECUTORS)})"
+        )
+    if WEIGHT_SHARING not in _WEIGHT_SHARING_MODES:
+        raise ValueError(
+            f"Unknown WEIGHT_SHARING {WEIGHT_SHARING!r} "
+            f"(expected one of: {', '.join(_WEIGHT_SHARING_MODES)})"
+        )
+    if EXPLANATION_METHOD != "attention" and INFERENCE_ENGINE == "onnx":
+        logger.warning(
+            "EXPLANATION_METHOD=%s needs every attention layer — the ONNX graph "
+            "exports the last one, so using attention",
+            EXPLANATION_METHOD,
+        )
+    elif EXPLANATION_METHOD == "gradient" and INFERENCE_ENGINE != "fp32":
+        logger.warning(
+            "EXPLANATION_METHOD=gradient needs the fp32 engine — using rollout with %s",
+            INFERENCE_ENGINE,
+        )
+    model_path = Path(path or model_path)
+    _model_path = model_path
+    _tokenizer = _load_tokenizer()
+
+    if model_path.exists():
+        logger.info("Loading trained model from %s …", model_path)
+        _install(loader(model_path), _tokenizer, _version_of(model_path), model_path)
+        logger.info("Model loaded (%s)", _model_version)
     else:
         logger.warning(
             "No model file at %s — running in MOCK mode. "
             "Run model/train.py to create a real model.",
-            MODEL_PATH,
+            model_path,
         )
         _is_mock = True
+        _model_version = "mock"
+        if _cache is not None:
+            _cache.set_model_version(_cache_version())
+
+
+def _version_of(path: Path) -> str:
+    return f"{INFERENCE_ENGINE}-{_file_digest(path)}"
+
+
+def _file_digest(path: Path, length: int = 12) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()[:length]
 
 
 def is_model_loaded() -> bool:
     return not _is_mock
 
 
+def get_model_version() -> str:
+    """``mock`` or ``<engine>-<checkpoint sha256 prefix>``."""
+    return _model_version
+
+
+def _cache_version() -> str:
+    """Cached predictions depend on both the model and the rule pack."""
+    return f"{_model_version}+rules-{_rules.version}"
+
+
+def get_cache_stats() -> Dict:
+    if _cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **_cache.stats()}
+
+
+# ── Warm-up & readiness ───────────────────────────────────
+_ready = False
+
+
+def _synthetic_text(num_tokens: int) -> str:
+    # "[CLS] ... [SEP]" — one word-piece per word for any BERT vocabulary
+    return " ".join(["a"] * max(1, num_tokens - 2))
+
+
+def warm_up(model=None, tokenizer=None) -> int:
+    """
+    Run synthetic batches for every WARMUP_SEQ_LENGTHS × WARMUP_BATCH_SIZES
+    shape, with and without attentions, so kernel initialisation and
+    allocator growth happen before real traffic.  Defaults to the active
+    model; returns the number of forward passes run.
+    """
+    model = _model if model is None else model
+    tokenizer = _tokenizer if tokenizer is None else tokenizer
+    if model is None or tokenizer is None:
+        return 0
+    passes = 0
+    started = time.perf_counter()
+    with torch.no_grad():
+        for seq_len in WARMUP_SEQ_LENGTHS:
+            text = _synthetic_text(min(seq_len, MAX_LENGTH))
+            for batch_size in WARMUP_BATCH_SIZES:
+                for _, input_ids, attention_mask in encode_in_buckets(
+                    tokenizer, [text] * batch_size
+                ):
+                    input_ids = input_ids.to(DEVICE)
+                    attention_mask = attention_mask.to(DEVICE)
+                    model(input_ids, attention_mask, output_attentions=False)
+                    explained_forward(model, input_ids, attention_mask)
+                    passes += 2
+    logger.info("Warm-up: %d forward passes in %.2fs", passes, time.perf_counter() - started)
+    return passes
+
+
+async def warm_up_workers() -> None:
+    """Warm every inference worker, then report ready."""
+    global _ready
+    if WARMUP_ENABLED and not _is_mock:
+        executor = get_executor()
+        if isinstance(executor, _InferencePool):
+            # Each process warms its own model in the initializer
+            await asyncio.to_thread(executor.wait_ready)
+        else:
+            # Threads share the active model
+            await asyncio.gather(
+                *(run_inference(warm_up) for _ in range(max(1, INFERENCE_WORKERS)))
+            )
+    _ready = True
+
+
+def is_ready() -> bool:
+    return _ready
+
+
+# ── Model registry & hot-swap ─────────────────────────────
+_registry: List[Dict] = []  # every version loaded by this process, oldest first
+_REGISTRY_SIZE = 20
+_reload_lock = threading.Lock()
+
+
+class ReloadInProgress(RuntimeError):
+    """Raised when a reload is requested while another one is running."""
+
+
+def _install(model, tokenizer, version: str, path: Path) -> None:
+    """Make *model* the active one; in-flight batches finish on the old one."""
+    global _model, _tokenizer, _is_mock, _model_version, _model_path, _model_mtime
+    # A forward pass holds its own reference to the old model, so swapping
+    # the globals never interrupts it.  The version is published last so a
+    # result is never cached under a version that had not been loaded yet.
+    _model, _tokenizer, _is_mock = model, tokenizer, False
+    _model_version = version
+    _model_path = Path(path)
+    _model_mtime = _model_path.stat().st_mtime
+    if _cache is not None:
+        _cache.set_model_version(_cache_version())
+    _registry.append({
+        "version": version,
+        "engine": INFERENCE_ENGINE,
+        "path": str(path),
+        "loaded_at": time.time(),
+    })
+    del _registry[:-_REGISTRY_SIZE]
+
+
+def reload_model(path: Optional[Path] = None) -> Dict:
+    """
+    Load a checkpoint in the background, warm it up and swap it in.
+
+    *path* defaults to the active checkpoint (re-read after an in-place
+    update).  On any failure the current model keeps serving.  Raises
+    ``ReloadInProgress`` if another reload is already running.
+    """
+    global _model_mtime
+    if not _reload_lock.acquire(blocking=False):
+        raise ReloadInProgress("A model reload is already in progress")
+    try:
+        default_path, loader = _engine()
+        path = Path(path or _model_path or default_path)
+        if not path.exists():
+            raise FileNotFoundError(f"No model file at {path}")
+        version = _version_of(path)
+        if version == _model_version and path == _model_path:
+            _model_mtime = path.stat().st_mtime  # touched, not changed
+            logger.info("Model %s is already active", version)
+            return get_model_info()
+
+        logger.info("Loading %s for hot-swap …", path)
+        started = time.perf_counter()
+        tokenizer = _tokenizer or _load_tokenizer()
+        model = loader(path)
+        warm_up(model, tokenizer)
+        pool = _start_process_workers(model, tokenizer, version, path, _rules.source)
+        previous = _model_version
+        _install(model, tokenizer, version, path)
+        _swap_executor(pool)
+        logger.info(
+            "Swapped model %s → %s in %.1fs", previous, version, time.perf_counter() - started
+        )
+        return get_model_info()
+    finally:
+        _reload_lock.release()
+
+
+def model_file_changed() -> bool:
+    """True when the active checkpoint file was replaced since it was loaded."""
+    if _model_path is None or not _model_path.exists():
+        return False
+    return _model_mtime is None or _model_path.stat().st_mtime != _model_mtime
+
+
+def rules_file_changed() -> bool:
+    """True when the active rule pack's file content differs from the loaded pack."""
+    try:
+        raw = Path(_rules.source).read_bytes()
+    except OSError:
+        return False
+    return pack_version(raw) != _rules.version
+
+
+async def watch_model_file(interval: float) -> None:
+    """
+    Poll the active checkpoint and rule pack and hot-swap whichever file
+    changes.  Admin reloads only reach the worker that serves them, so this
+    is how every uvicorn worker picks up a change.
+    """
+    while True:
+        await asyncio.sleep(interval)
+        if model_file_changed():
+            try:
+                await asyncio.to_thread(reload_model)
+            except ReloadInProgress:
+                pass
+            except Exception:
+                # Likely a partially written file — retry on the next tick
+                logger.exception("Hot-swap of %s failed; keeping %s", _model_path, _model_version)
+        if rules_file_changed():
+            try:
+                await asyncio.to_thread(reload_rules)
+            except Exception:
+                logger.exception("Reload of rule pack %s failed; keeping it", _rules.source)
+
+
+def reload_rules(path: Optional[Path] = None) -> Dict:
+    """
+    Compile the rule pack at *path* (default: the active pack, re-read) and
+    swap it in.  Scoring calls already running finish on the old rules.
+    Raises ``ValueError`` for an invalid pack; the old rules stay active.
+    """
+    global _rules
+    path = Path(path or _rules.source)
+    rules = load_rule_pack(path)
+    pool = _start_process_workers(
+        None if _is_mock else _model, _tokenizer, _model_version, _model_path, rules.source
+    )
+    previous, _rules = _rules, rules
+    if _cache is not None:
+        _cache.set_model_version(_cache_version())
+    _swap_executor(pool)
+    logger.info("Rule pack %s → %s (%s)", previous.version, rules.version, path)
+    return get_rules_info()
+
+
+def get_rules_info() -> Dict:
+    rules = _rules
+    return {
+        "name": rules.name,
+        "version": rules.version,
+        "source": rules.source,
+        "patterns": len(rules.rules),
+        "phrases": len(rules.phrases),
+    }
+
+
+def get_model_info() -> Dict:
+    return {
+        "version": _model_version,
+        "engine": INFERENCE_ENGINE,
+        "path": str(_model_path) if _model_path else None,
+        "mock": _is_mock,
+        "history": list(reversed(_registry)),
+    }
+
+
+def _seeded_rng(text: str) -> random.Random:
+    """Per-text RNG so mock outputs are deterministic (and thus cacheable)."""
+    return random.Random(hashlib.sha256(text.encode("utf-8")).digest())
+
+
+# ── Dynamic padding & length bucketing ────────────────────
+def length_buckets(lengths: Sequence[int], batch_size: int) -> List[List[int]]:
+    """Group indices into batches of at most *batch_size* similar lengths."""
+    order = sorted(range(len(lengths)), key=lengths.__getitem__)
+    return [order[i:i + batch_size] for i in range(0, len(order), batch_size)]
+
+
+def pad_batch(
+    sequences: Sequence[Sequence[int]], pad_token_id: int
+) -> Tuple[torch.Tensor, torch.Tensor]:
+    """Pad token id lists to the longest one; returns (input_ids, attention_mask)."""
+    width = max(len(seq) for seq in sequences)
+    input_ids = torch.full((len(sequences), width), pad_token_id, dtype=torch.long)
+    attention_mask = torch.zeros((len(sequences), width), dtype=torch.long)
+    for row, seq in enumerate(sequences):
+        input_ids[row, :len(seq)] = torch.tensor(seq, dtype=torch.long)
+        attention_mask[row, :len(seq)] = 1
+    return input_ids, attention_mask
+
+
+class WordAlignment(NamedTuple):
+    """Token → word mapping for one padded batch (see encode_in_buckets)."""
+
+    word_index: torch.Tensor  # (batch, seq) word of each token, -1 for special / padding
+    words: List[List[str]]  # surface text of each word, per row
+
+
+def _align_words(
+    encoding, texts: Sequence[str], indices: List[int], shape: torch.Size
+) -> WordAlignment:
+    word_index = torch.full(shape, -1, dtype=torch.long)
+    words = []
+    for row, i in enumerate(indices):
+        ids = [-1 if w is None else w for w in encoding.word_ids(i)]
+        word_index[row, :len(ids)] = torch.tensor(ids, dtype=torch.long)
+        # Truncation keeps a prefix, so the words are 0 … max id
+        spans = [encoding.word_to_chars(i, w) for w in range(max(ids) + 1)]
+        words.append([texts[i][span.start:span.end] for span in spans])
+    return WordAlignment(word_index, words)
+
+
+def encode_in_buckets(
+    tokenizer,
+    texts: Sequence[str],
+    batch_size: int = BUCKET_BATCH_SIZE,
+    bucketing: bool = LENGTH_BUCKETING,
+    words: bool = False,
+) -> Iterator[Tuple]:
+    """
+    Tokenize *texts* in one call and yield ``(indices, input_ids, attention_mask)``
+    batches padded to their own longest item.
+
+    With *bucketing*, texts of similar token length are grouped together;
+    otherwise batches keep the input order.  With *words* (fast tokenizers
+    only) each batch also carries a ``WordAlignment`` mapping its tokens
+    back to the words of the original text.
+    """
+    texts = list(texts)
+    encoding = tokenizer(texts, max_length=MAX_LENGTH, truncation=True)
+    encoded = encoding["input_ids"]
+    batch_size = max(1, batch_size)
+    if bucketing:
+        groups = length_buckets([len(ids) for ids in encoded], batch_size)
+    else:
+        groups = [
+            list(range(i, min(i + batch_size, len(encoded))))
+            for i in range(0, len(encoded), batch_size)
+        ]
+    for indices in groups:
+        input_ids, attention_mask = pad_batch(
+            [encoded[i] for i in indices], tokenizer.pad_token_id
+        )
+        if words:
+            alignment = _align_words(encoding, texts, indices, input_ids.shape)
+            yield indices, input_ids, attention_mask, alignment
+        else:
+            yield indices, input_ids, attention_mask
+
+
 # ── Sarcasm cues for mock & explanation ───────────────────
-_POSITIVE = {
-    "great", "awesome", "wonderful", "love", "fantastic", "amazing",
-    "excellent", "brilliant", "perfect", "best", "wow", "nice",
-    "beautiful", "incredible", "superb", "outstanding", "fabulous",
-    "thrilled", "delighted", "joyful", "terrific", "marvelous",
-    "genius", "impressive", "fun", "exciting", "thanks", "thank",
-    "please", "glad", "happy", "enjoy", "pleasure", "lucky",
-    "charming", "lovely", "splendid", "magnificent", "bravo",
-}
+# Lexicons, known phrases and weighted patterns come from the rule pack at
+# RULES_PATH (backend/rules/default.json); reload_rules() swaps in a new one.
+_rules: RuleSet = load_rule_pack(RULES_PATH)
+_QUOTED_RE = re.compile(r'["\'](\w+)["\']')
 
-_NEGATIVE = {
-    "not", "never", "hate", "worst", "terrible", "awful", "bad",
-    "boring", "annoying", "stupid", "ugly", "useless", "fail",
-    "horrible", "dreadful", "pathetic", "disgusting", "miserable",
-    "disappointing", "sucks", "ridiculous", "obviously", "clearly",
-    "sure", "totally", "right", "definitely", "oh", "slow",
-    "slower", "late", "later", "wrong", "broken", "lost", "stuck",
-    "waiting", "waste", "mess", "disaster", "ruin", "ruined",
-    "killed", "died", "dead", "crash", "crashed", "failed",
-}
 
-_SARCASM_MARKERS = {
-    "oh", "wow", "sure", "totally", "obviously", "clearly",
-    "definitely", "absolutely", "exactly", "precisely", "certainly",
-    "of course", "no kidding", "yeah right", "bravo", "genius",
-    "shocking", "shocker", "surprise", "surprised",
-}
+class _Structure(NamedTuple):
+    """Punctuation / capitalisation cues of one text (see _structure)."""
 
-# ── Regex patterns (ordered by specificity) ───────────────
-_SARCASM_PATTERNS = [
-    # Positive word + ironic context
-    (r"\boh\b.*\b(great|wow|fantastic|amazing|love|wonderful|brilliant)\b", 0.40,
-     "uses an ironic exclamation with overly positive words"),
-    (r"\byeah\b.*\bright\b", 0.45,
-     "uses 'yeah right' — a classic sarcastic dismissal"),
-    (r"\bas if\b", 0.45,
-     "uses 'as if' to express disbelief sarcastically"),
-
-    # Polite request + contradictory/absurd action (contextual sarcasm)
-    (r"\b(could|can|would)\b.*\bplease\b.*\b(slow|slower|later|worse|less|little)\b", 0.55,
-     "contains a polite request followed by a contradictory or absurd action — situational irony"),
-    (r"\b(could|can|would)\b.*\bplease\b.*\b(more|another|again|repeat)\b.*\b(slow|boring|annoying|loud|late)\b", 0.55,
-     "politely asks for more of something undesirable — contextual sarcasm"),
-
-    # Rhetorical questions with sarcastic undertone
-    (r"\bwho\b.*\b(would|could|knew|thought)\b", 0.30,
-     "rhetorical question suggesting the answer is obvious"),
-    (r"\bhow\b.*\b(surprising|original|creative|clever|smart|nice)\b", 0.40,
-     "rhetorical question with exaggerated praise"),
-    (r"\bwhat a\b.*\b(surprise|shock|day|life|joy|pleasure|delight|treat|genius|time)\b", 0.45,
-     "uses 'what a...' pattern expressing mock surprise or irony"),
-
-    # Common sarcastic phrases
-    (r"\bthanks?\b.*\b(a lot|so much|for nothing|for that)\b", 0.50,
-     "uses 'thanks' in an exaggerated or dismissive way"),
-    (r"\b(no|yeah)\b.*\b(kidding|duh|really|way|shit|sherlock)\b", 0.55,
-     "uses a common sarcastic interjection"),
-    (r"\btell me\b.*\bmore\b", 0.40,
-     "uses 'tell me more' sarcastically to show disinterest"),
-    (r"\bcan'?t\b.*\bwait\b", 0.40,
-     "expresses fake eagerness — 'can't wait' used ironically"),
-    (r"\bjust\b.*\b(what|exactly what)\b.*\b(need|want|asked)\b", 0.50,
-     "uses 'just what I needed' — sarcastic resignation"),
-    (r"\bexactly\b.*\b(what|how)\b.*\b(want|plan|expect|hope)\b", 0.45,
-     "uses 'exactly' with a contradictory outcome"),
-    (r"\bnothing\b.*\b(like|better|says)\b", 0.40,
-     "uses 'nothing like...' or 'nothing better' sarcastically"),
-    (r"\b(real|very)\b.*\b(helpful|useful|mature|smart|clever|original|classy|professional)\b", 0.45,
-     "uses 'real/very' + positive adjective sarcastically"),
-    (r"\bso\b.*\b(glad|happy|thrilled|excited|proud)\b.*\b(that|to|you|we|about)\b", 0.40,
-     "uses exaggerated positive emotion that may be insincere"),
-    (r"\bwow\b.*\b(just|so|that|this|really)\b", 0.40,
-     "uses 'wow' in a dismissive or mocking way"),
-    (r"\byou\b.*\b(must|should)\b.*\b(be|feel)\b.*\b(proud|happy|smart|special)\b", 0.45,
-     "sarcastically tells someone they should feel proud/happy"),
-    (r"\bi'?m?\b.*\bso\b.*\b(impressed|shocked|surprised|moved)\b", 0.45,
-     "expresses exaggerated surprise or fake impression"),
-    (r"\bkeep\b.*\b(up|going|it)\b.*\b(good|great)\b.*\bwork\b", 0.30,
-     "could be genuine encouragement or sarcastic depending on context"),
-
-    # Contradictory superlatives / understatement
-    (r"\best\b.*\b(ever|idea|plan|day|thing)\b", 0.35,
-     "uses superlative ('best ever') which may be ironic"),
-    (r"\ba little\b", 0.15,
-     "uses understatement ('a little') which can signal irony"),
-    (r"\b(story|excuse|reason)\b.*\b(of my|of the|ever)\b", 0.35,
-     "references a story/excuse in an exaggerated way"),
-
-    # Situational patterns (describing unfortunate situations positively)
-    (r"\b(love|enjoy|like)\b.*\b(being|getting|having|sitting|standing|waiting|stuck)\b", 0.50,
-     "expresses positive sentiment about an unpleasant situation — situational sarcasm"),
-    (r"\b(love|enjoy|like)\b.*\b(traffic|rain|monday|queue|line|spam|ads|mosquito|cold|flu)\b", 0.55,
-     "expresses enjoyment of something typically unpleasant — strong sarcasm signal"),
-    (r"\b(best|favorite)\b.*\b(part|thing|moment)\b.*\b(when|is|was)\b", 0.35,
-     "uses 'best part' which can be ironic framing"),
-
-    # Exaggeration markers
-    (r"\b(so|very|incredibly|extremely|absolutely|truly)\b.*\b(fun|exciting|interesting|original|helpful)\b", 0.35,
-     "uses intensifier + positive adjective which can indicate exaggerated/sarcastic praise"),
-
-    # Basic markers (lower confidence)
-    (r"\bsure\b", 0.25, "uses 'sure' which can be a sarcastic concession"),
-    (r"\btotally\b", 0.25, "uses 'totally' which can indicate mock agreement"),
-    (r"\bobviously\b", 0.30, "uses 'obviously' to sarcastically state something self-evident"),
-    (r"\bclearly\b", 0.25, "uses 'clearly' in a potentially sarcastic way"),
-    (r"\bbrilliant\b", 0.30, "uses 'brilliant' which is a common sarcasm word"),
-    (r"\bgenius\b", 0.35, "uses 'genius' sarcastically to mock intelligence"),
-    (r"\bshocker\b", 0.50, "uses 'shocker' to express mock surprise"),
-]
-
-# ── Whole-sentence known sarcastic phrases ────────────────
-_KNOWN_SARCASTIC = [
-    "could you please do that a little slower",
-    "could you be any slower",
-    "take your time",
-    "no rush",
-    "i'm shocked",
-    "color me surprised",
-    "tell me something i don't know",
-    "that's a first",
-    "what a shocker",
-    "how original",
-    "how creative",
-    "how surprising",
-    "story of my life",
-    "just my luck",
-    "because that makes sense",
-    "that's just great",
-    "that's just perfect",
-    "good for you",
-    "way to go",
-    "nice going",
-    "smooth move",
-    "well done",
-    "great job",
-    "big surprise",
-    "real nice",
-    "very helpful",
-    "thanks for nothing",
-    "you don't say",
-    "i couldn't care less",
-    "like i care",
-    "like that's going to happen",
-    "what else is new",
-    "join the club",
-    "life is so fair",
-    "because that always works",
-    "my favorite thing",
-    "i live for this",
-    "i'm living the dream",
-    "couldn't be happier",
-    "best day ever",
-    "this is fine",
-    "everything is fine",
-    "no worries at all",
-    "it's not like i had plans",
-    "it's not like i was busy",
-]
+    exclaim: bool
+    ellipsis: bool
+    rhetorical: bool
+    quoted: List[str]
+    caps_words: List[str]
 
 
-def _detect_sarcasm_cues(text: str) -> Tuple[List[str], float, str]:
+_RHETORICAL_WORDS = ("could", "would", "can", "really")
+
+
+def _structure(text: str) -> _Structure:
+    lower = text.lower()
+    return _Structure(
+        exclaim=text.endswith("!"),
+        ellipsis=text.endswith("..."),
+        rhetorical="?" in text and any(w in lower for w in _RHETORICAL_WORDS),
+        quoted=_QUOTED_RE.findall(text) if '"' in text or "'" in text else [],
+        caps_words=[]
+        if text.isupper()
+        else [w for w in text.split() if w.isupper() and len(w) > 1],
+    )
+
+
+def _score_cues(
+    text: str, structure: Optional[_Structure] = None
+) -> Tuple[List[str], float, List[str]]:
     """
-    Advanced heuristic sarcasm detection used in mock mode & explanations.
+    Advanced heuristic sarcasm scoring used in mock mode, explanations and
+    the inference cascade.  Returns (cue words, raw score, reasons).
 
     Combines multiple signal types:
     - Keyword sentiment clash (positive + negative)
     - 50+ regex patterns for contextual/situational sarcasm
     - Known sarcastic phrase matching
     - Structural cues (punctuation, capitalisation, quotation marks)
+
+    The text is tokenized once; every lexicon and rule works off that.
+    *structure* may be passed in when it was computed column-wise.
     """
+    rules = _rules  # one pack for the whole call, even across a reload
     lower = text.lower().strip()
-    words = re.findall(r"\b\w+\b", lower)
-    found_positive = [w for w in words if w in _POSITIVE]
-    found_negative = [w for w in words if w in _NEGATIVE]
-    found_markers = [w for w in words if w in _SARCASM_MARKERS]
+    tokens = tokenize(lower)
+    words = tokens.words
+    found: Dict[str, List[str]] = {label: [] for label in (*LEXICONS, "known")}
+    for hit in rules.phrases.find_tokens(lower, words, tokens.spans):
+        for label in hit.labels:
+            found[label].append(hit.phrase)
+    found_positive = found["positive"]
+    found_negative = found["negative"]
+    found_markers = found["markers"]
 
     cue_words: List[str] = []
     score = 0.0
     reasons: List[str] = []
 
     # ── 1. Known sarcastic phrases (highest priority) ─────
-    for phrase in _KNOWN_SARCASTIC:
-        if phrase in lower:
-            score += 0.60
-            cue_words.extend(phrase.split()[:4])
-            reasons.append(
-                f"contains the known sarcastic phrase '{phrase}'"
-            )
-            break  # one match is enough
+    if found["known"]:
+        # One match is enough; earlier entries in the list win
+        phrase = min(found["known"], key=rules.known_rank.__getitem__)
+        score += 0.60
+        cue_words.extend(phrase.split()[:4])
+        reasons.append(
+            f"contains the known sarcastic phrase '{phrase}'"
+        )
 
-    # ── 2. Regex pattern matching ─────────────────────────
+    # ── 2. Rule matching ──────────────────────────────────
     pattern_reasons: List[str] = []
-    for pattern, weight, reason in _SARCASM_PATTERNS:
-        if re.search(pattern, lower):
-            score += weight
-            pattern_reasons.append(reason)
-            # Extract matched words as cues
-            match = re.search(pattern, lower)
-            if match:
-                matched_words = re.findall(r"\b\w+\b", match.group())
-                cue_words.extend(matched_words[:3])
+    for rule in rules.rules:
+        matched_words = rule_cues(rule, tokens)
+        if matched_words is None:
+            continue
+        score += rule.weight
+        pattern_reasons.append(rule.reason)
+        cue_words.extend(matched_words[:3])
     if pattern_reasons:
         # Take top 2 most specific reasons
         reasons.extend(pattern_reasons[:2])
@@ -311,42 +845,36 @@ def _detect_sarcasm_cues(text: str) -> Tuple[List[str], float, str]:
             )
 
     # ── 5. Structural cues ────────────────────────────────
-    if text.endswith("!") or text.endswith("!!") or text.endswith("!!!"):
+    if structure is None:
+        structure = _structure(text)
+    if structure.exclaim:
         score += 0.08
         reasons.append("emphatic punctuation suggests exaggeration")
-    if text.endswith("..."):
+    if structure.ellipsis:
         score += 0.08
         reasons.append("trailing ellipsis suggests ironic trailing-off")
-    if "?" in text and any(w in lower for w in ["could", "would", "can", "really"]):
+    if structure.rhetorical:
         score += 0.10
         reasons.append("rhetorical question structure detected")
-    if '"' in text or "'" in text:
+    quoted = structure.quoted
+    if quoted:
         # Quotation marks around words can indicate air-quotes / sarcasm
-        quoted = re.findall(r'["\'](\w+)["\']', text)
-        if quoted:
-            score += 0.12
-            cue_words.extend(quoted[:2])
-            reasons.append(
-                f"uses quotation marks around '{', '.join(quoted[:2])}' suggesting air-quotes / irony"
-            )
+        score += 0.12
+        cue_words.extend(quoted[:2])
+        reasons.append(
+            f"uses quotation marks around '{', '.join(quoted[:2])}' suggesting air-quotes / irony"
+        )
     # Mixed caps (words in ALL CAPS mid-sentence)
-    if any(c.isupper() for c in text) and not text.isupper():
-        caps_words = [w for w in text.split() if w.isupper() and len(w) > 1]
-        if caps_words:
-            score += 0.08
-            cue_words.extend([w.lower() for w in caps_words[:2]])
-            reasons.append("mixed capitalisation indicates emphasis or irony")
+    caps_words = structure.caps_words
+    if caps_words:
+        score += 0.08
+        cue_words.extend([w.lower() for w in caps_words[:2]])
+        reasons.append("mixed capitalisation indicates emphasis or irony")
 
     # ── 6. Contextual contradiction check ─────────────────
     # Positive verbs describing negative situations
-    pos_verbs = {"love", "enjoy", "adore", "like", "appreciate"}
-    neg_situations = {
-        "waiting", "stuck", "traffic", "slow", "late", "rain",
-        "monday", "queue", "spam", "boring", "cold", "flu",
-        "broken", "crashed", "lost", "failed", "waste",
-    }
-    found_pos_verbs = [w for w in words if w in pos_verbs]
-    found_neg_sits = [w for w in words if w in neg_situations]
+    found_pos_verbs = found["positive_verbs"]
+    found_neg_sits = found["negative_situations"]
     if found_pos_verbs and found_neg_sits:
         score += 0.35
         cue_words.extend(found_pos_verbs[:2] + found_neg_sits[:2])
@@ -358,94 +886,336 @@ def _detect_sarcasm_cues(text: str) -> Tuple[List[str], float, str]:
     # ── Normalise & deduplicate ───────────────────────────
     score = min(score, 0.98)
     cue_words = list(dict.fromkeys(cue_words))[:8]  # unique, max 8
+    return cue_words, score, reasons
+
+
+def heuristic_score(text: str) -> float:
+    """Raw heuristic sarcasm score in [0, 0.98] (no random fallback)."""
+    return _score_cues(text)[1]
+
+
+def _detect_sarcasm_cues(text: str) -> Tuple[List[str], float, str]:
+    """Heuristic cues, score and explanation; weak scores are jittered."""
+    return _with_fallback(text, *_score_cues(text))
 
+
+def _with_fallback(
+    text: str, cue_words: List[str], score: float, reasons: List[str]
+) -> Tuple[List[str], float, str]:
     if score < 0.15:
-        score = random.uniform(0.08, 0.30)
+        score = _seeded_rng(text).uniform(0.08, 0.30)
         reasons = reasons or [
             "no strong sarcasm indicators found; the text appears straightforward"
         ]
 
-    explanation = (
+    return cue_words, score, _explain(reasons)
+
+
+def _explain(reasons: List[str]) -> str:
+    return (
         "The sentence " + "; ".join(reasons[:3]) + "."
         if reasons
         else "The text appears to be a straightforward statement."
     )
-    return cue_words, score, explanation
 
 
-# ── Predict (real model) ─────────────────────────────────
-def _predict_real(text: str) -> Dict:
-    """Run inference with the trained BERT model."""
-    encoding = _tokenizer(
-        text,
-        max_length=MAX_LENGTH,
-        padding="max_length",
-        truncation=True,
-        return_tensors="pt",
+# ── Batch heuristics ──────────────────────────────────────
+def _structure_columns(texts: pd.Series) -> List[_Structure]:
+    """_structure() for a whole column of texts using pandas string ops."""
+    lower = texts.str.lower()
+    all_caps = texts.str.isupper()
+    # Whitespace-split words, ALL CAPS and longer than one character
+    words = texts.str.split().explode()
+    caps = words[
+        words.str.isupper().fillna(False).astype(bool)
+        & (words.str.len() > 1)
+        & ~all_caps.reindex(words.index)
+    ]
+    caps_words = caps.groupby(level=0).agg(list).reindex(texts.index)
+    columns = zip(
+        texts.str.endswith("!"),
+        texts.str.endswith("..."),
+        texts.str.contains("?", regex=False)
+        & lower.str.contains("|".join(_RHETORICAL_WORDS)),
+        texts.str.findall(_QUOTED_RE),
+        caps_words,
     )
-    input_ids = encoding["input_ids"].to(DEVICE)
-    attention_mask = encoding["attention_mask"].to(DEVICE)
+    return [
+        _Structure(bool(e), bool(d), bool(r), q, c if isinstance(c, list) else [])
+        for e, d, r, q, c in columns
+    ]
 
-    with torch.no_grad():
-        logits, attentions = _model(input_ids, attention_mask)
-        probs = F.softmax(logits, dim=1)
-        confidence, pred_idx = torch.max(probs, dim=1)
-
-    # Attention-based highlighting (last layer, mean over heads)
-    last_attn = attentions[-1].squeeze(0).mean(dim=0)  # (seq, seq)
-    cls_attn = last_attn[0]  # CLS row
-    tokens = _tokenizer.convert_ids_to_tokens(input_ids.squeeze())
-    mask = attention_mask.squeeze().bool()
-
-    word_scores = {}
-    for tok, score, m in zip(tokens, cls_attn, mask):
-        if not m or tok in ("[CLS]", "[SEP]", "[PAD]"):
-            continue
-        clean = tok.replace("##", "")
-        word_scores[clean] = max(word_scores.get(clean, 0), score.item())
 
-    sorted_words = sorted(word_scores.items(), key=lambda x: x[1], reverse=True)
-    highlighted = [w for w, _ in sorted_words[:8]]
+def _score_unique(texts: List[str]) -> List[Tuple[List[str], float, List[str]]]:
+    """_score_cues() over distinct texts, structural cues computed column-wise."""
+    structures = _structure_columns(pd.Series(texts, dtype=object))
+    return [_score_cues(t, st) for t, st in zip(texts, structures)]
 
-    _, mock_score, explanation = _detect_sarcasm_cues(text)
 
-    label = LABELS[pred_idx.item()]
-    conf = round(confidence.item(), 4)
+def _init_cues_worker(rules_path: str) -> None:
+    global _rules
+    torch.set_num_threads(1)
+    if rules_path != _rules.source:
+        _rules = load_rule_pack(Path(rules_path))
 
-    attention_dict = {w: round(s, 4) for w, s in sorted_words[:15]}
 
+def detect_sarcasm_cues_batch(
+    texts: Sequence[str], processes: int = 1, chunk_size: int = 10_000
+) -> pd.DataFrame:
+    """
+    Heuristic cues for many texts at once, for offline analysis.
+
+    Returns a DataFrame aligned with *texts* (keeping the index of a
+    Series) with ``cues``, ``score``, ``raw_score`` and ``explanation``
+    columns; each row equals ``_detect_sarcasm_cues`` / ``heuristic_score``
+    for that text.  Duplicate texts are scored once, and punctuation and
+    capitalisation cues are computed over the whole column.  With
+    ``processes > 1`` the distinct texts are split into *chunk_size*
+    pieces and scored on a process pool.  Missing values (None/NaN) are
+    scored as empty text.
+    """
+    series = texts if isinstance(texts, pd.Series) else pd.Series(list(texts), dtype=object)
+    strings = series.astype(object).where(series.notna(), "").astype(str)
+    codes, uniques = pd.factorize(strings, use_na_sentinel=False)
+    uniques = list(uniques)
+    if processes > 1 and len(uniques) > chunk_size:
+        chunks = [uniques[i:i + chunk_size] for i in range(0, len(uniques), chunk_size)]
+        with ProcessPoolExecutor(
+            max_workers=processes,
+            mp_context=torch.multiprocessing.get_context("spawn"),
+            initializer=_init_cues_worker,
+            initargs=(_rules.source,),
+        ) as pool:
+            scored = [row for part in pool.map(_score_unique, chunks) for row in part]
+    else:
+        scored = _score_unique(uniques)
+
+    rows = []
+    for text, (cue_words, raw_score, reasons) in zip(uniques, scored):
+        _, score, explanation = _with_fallback(text, cue_words, raw_score, reasons)
+        rows.append((cue_words, score, raw_score, explanation))
+    unique_frame = pd.DataFrame(rows, columns=["cues", "score", "raw_score", "explanation"])
+    frame = unique_frame.iloc[codes].reset_index(drop=True)
+    frame.index = series.index
+    return frame
+
+
+# ── Predict (real model) ─────────────────────────────────
+def _predict_real_batch(
+    texts: List[str],
+    explain: bool = True,
+    cues: Optional[List[Tuple[List[str], float, List[str]]]] = None,
+) -> List[Dict]:
+    """
+    Run batched inference: one tokenizer call, one padded pass per bucket.
+    *cues* are the texts' ``_score_cues`` results when already computed.
+    """
+    results: List[Optional[Dict]] = [None] * len(texts)
+    for indices, input_ids, attention_mask, *alignment in encode_in_buckets(
+        _tokenizer, texts, words=explain
+    ):
+        input_ids = input_ids.to(DEVICE)
+        attention_mask = attention_mask.to(DEVICE)
+        if not explain:
+            for i, result in zip(indices, _classify_batch(input_ids, attention_mask)):
+                results[i] = result
+            continue
+        bucket = _forward_batch(input_ids, attention_mask, alignment[0])
+        for i, result in zip(indices, bucket):
+            scored = cues[i] if cues is not None else _score_cues(texts[i])
+            _, _, result["explanation"] = _with_fallback(texts[i], *scored)
+            results[i] = result
+    return results
+
+
+_NO_EXPLANATION = "Explanation not requested."
+
+
+def _label_only(label: str, confidence: float) -> Dict:
     return {
         "prediction": label,
-        "confidence": conf,
-        "highlighted_words": highlighted,
-        "explanation": explanation,
-        "attention_scores": attention_dict,
+        "confidence": confidence,
+        "highlighted_words": [],
+        "explanation": _NO_EXPLANATION,
+        "attention_scores": None,
     }
 
 
+def _classify_batch(input_ids: torch.Tensor, attention_mask: torch.Tensor) -> List[Dict]:
+    """Lean forward pass — no attention tensors are materialised."""
+    with torch.no_grad():
+        logits, _ = _model(input_ids, attention_mask, output_attentions=False)
+        confidence, pred_idx = torch.max(F.softmax(logits, dim=1), dim=1)
+    return [
+        _label_only(LABELS[pred], round(conf, 4))
+        for conf, pred in zip(confidence.cpu().tolist(), pred_idx.cpu().tolist())
+    ]
+
+
+def pool_word_scores(token_scores: torch.Tensor, alignment: WordAlignment) -> torch.Tensor:
+    """
+    Max-pool ``(batch, seq)`` token scores into ``(batch, words)`` word scores
+    with one scatter; words a row does not have score 0.
+    """
+    n_words = max((len(w) for w in alignment.words), default=0)
+    index = alignment.word_index.to(token_scores.device)
+    # Special and padding tokens land in an extra column that is dropped
+    index = torch.where(index < 0, n_words, index)
+    pooled = torch.zeros(
+        (token_scores.shape[0], n_words + 1),
+        dtype=token_scores.dtype,
+        device=token_scores.device,
+    )
+    pooled = pooled.scatter_reduce(1, index, token_scores, reduce="amax", include_self=False)
+    return pooled[:, :n_words]
+
+
+def _ranked_words(
+    word_scores: torch.Tensor, alignment: WordAlignment, limit: int
+) -> List[List[Tuple[str, float]]]:
+    """Top *limit* distinct words of each row, highest score first."""
+    scores, order = word_scores.sort(dim=1, descending=True)
+    ranked = []
+    for words, row_scores, row_order in zip(alignment.words, scores.tolist(), order.tolist()):
+        best: Dict[str, float] = {}
+        for score, j in zip(row_scores, row_order):
+            if j >= len(words):
+                continue
+            # A repeated word keeps its highest-scoring occurrence
+            best.setdefault(words[j], score)
+            if len(best) == limit:
+                break
+        ranked.append(list(best.items()))
+    return ranked
+
+
+_EXPLANATION_METHODS = ("attention", "rollout", "gradient")
+
+
+def attention_rollout(attentions: Sequence[torch.Tensor]) -> torch.Tensor:
+    """
+    Attention rollout (Abnar & Zuidema, 2020): head-averaged attention of
+    every layer, mixed with the identity for the residual path and
+    multiplied through the stack.  Returns ``(batch, seq, seq)``.
+    """
+    rollout = None
+    for layer in attentions:
+        attn = layer.mean(dim=1)
+        attn = 0.5 * attn + 0.5 * torch.eye(attn.shape[-1], dtype=attn.dtype, device=attn.device)
+        attn = attn / attn.sum(dim=-1, keepdim=True)
+        rollout = attn if rollout is None else attn @ rollout
+    return rollout
+
+
+def gradient_x_input(
+    model, input_ids: torch.Tensor, attention_mask: torch.Tensor
+) -> Tuple[torch.Tensor, torch.Tensor]:
+    """
+    Gradient × input saliency of each row's predicted class from one
+    backward pass over the whole batch (rows do not interact, so the
+    summed logit separates per row).  Returns ``(logits, token_scores)``
+    with each row's scores summing to 1.
+    """
+    embeddings = model.bert.embeddings.word_embeddings(input_ids).detach().requires_grad_()
+    with torch.enable_grad():
+        logits, _ = model(
+            input_ids, attention_mask, output_attentions=False, inputs_embeds=embeddings
+        )
+        target = logits.gather(1, logits.argmax(dim=1, keepdim=True)).sum()
+        (grad,) = torch.autograd.grad(target, embeddings)
+    saliency = (grad * embeddings).sum(dim=-1).abs() * attention_mask
+    saliency = saliency / saliency.sum(dim=1, keepdim=True).clamp_min(1e-12)
+    return logits.detach(), saliency.detach()
+
+
+def _explanation_method(model) -> str:
+    method = EXPLANATION_METHOD
+    # Quantized and ONNX models cannot be differentiated
+    if method == "gradient" and not (
+        INFERENCE_ENGINE == "fp32" and isinstance(model, BertSarcasmClassifier)
+    ):
+        method = "rollout"
+    # The ONNX graph only exports the last attention layer, nothing to roll out
+    if method == "rollout" and isinstance(model, OnnxSarcasmClassifier):
+        method = "attention"
+    return method
+
+
+def explained_forward(
+    model, input_ids: torch.Tensor, attention_mask: torch.Tensor
+) -> Tuple[torch.Tensor, Optional[torch.Tensor]]:
+    """
+    Forward pass returning ``(logits, token_scores)`` where the
+    ``(batch, seq)`` token scores follow EXPLANATION_METHOD (``None`` when
+    the model exposes no attention to explain with).
+    """
+    method = _explanation_method(model)
+    if method == "gradient":
+        return gradient_x_input(model, input_ids, attention_mask)
+    with torch.no_grad():
+        logits, attentions = model(input_ids, attention_mask)
+        if attentions is None:  # ONNX graph exported without attention
+            return logits, None
+        if method == "rollout":
+            return logits, attention_rollout(attentions)[:, 0, :]
+        # Last layer, mean over heads, CLS row
+        return logits, attentions[-1].mean(dim=1)[:, 0, :]
+
+
+def _forward_batch(
+    input_ids: torch.Tensor, attention_mask: torch.Tensor, alignment: WordAlignment
+) -> List[Dict]:
+    """One explained forward pass; softmax, argmax and word pooling on the batch tensor."""
+    logits, token_scores = explained_forward(_model, input_ids, attention_mask)
+    with torch.no_grad():
+        confidence, pred_idx = torch.max(F.softmax(logits, dim=1), dim=1)
+        if token_scores is not None:
+            ranked = _ranked_words(pool_word_scores(token_scores, alignment), alignment, 15)
+        else:  # nothing to highlight
+            ranked = [[] for _ in range(input_ids.shape[0])]
+
+    results = []
+    for words, conf, pred in zip(ranked, confidence.cpu().tolist(), pred_idx.cpu().tolist()):
+        results.append({
+            "prediction": LABELS[pred],
+            "confidence": round(conf, 4),
+            "highlighted_words": [w for w, _ in words[:8]],
+            "explanation": "",
+            "attention_scores": {w: round(s, 4) for w, s in words},
+        })
+    return results
+
+
 # ── Predict (mock) ────────────────────────────────────────
-def _predict_mock(text: str) -> Dict:
+def _predict_mock(
+    text: str, explain: bool = True, cues: Optional[Tuple[List[str], float, str]] = None
+) -> Dict:
     """Heuristic-based mock prediction for development / demo."""
-    cue_words, score, explanation = _detect_sarcasm_cues(text)
+    cue_words, score, explanation = cues if cues is not None else _detect_sarcasm_cues(text)
     is_sarcastic = score >= 0.45
+    rng = _seeded_rng(text)
 
     if is_sarcastic:
-        confidence = round(random.uniform(max(score, 0.70), 0.97), 4)
+        confidence = round(rng.uniform(max(score, 0.70), 0.97), 4)
     else:
-        confidence = round(random.uniform(0.60, 0.88), 4)
+        confidence = round(rng.uniform(0.60, 0.88), 4)
+
+    label = "Sarcastic" if is_sarcastic else "Not Sarcastic"
+    if not explain:
+        return _label_only(label, confidence)
 
     # Generate pseudo attention scores
     words = re.findall(r"\b\w+\b", text)
     attention_scores = {}
     for w in words[:15]:
         wl = w.lower()
-        if wl in _POSITIVE or wl in _NEGATIVE:
-            attention_scores[w] = round(random.uniform(0.15, 0.40), 4)
+        if wl in _rules.lexicons["positive"] or wl in _rules.lexicons["negative"]:
+            attention_scores[w] = round(rng.uniform(0.15, 0.40), 4)
         else:
-            attention_scores[w] = round(random.uniform(0.01, 0.10), 4)
+            attention_scores[w] = round(rng.uniform(0.01, 0.10), 4)
 
     return {
-        "prediction": "Sarcastic" if is_sarcastic else "Not Sarcastic",
+        "prediction": label,
         "confidence": confidence,
         "highlighted_words": cue_words if cue_words else words[:3],
         "explanation": explanation,
@@ -453,14 +1223,504 @@ def _predict_mock(text: str) -> Dict:
     }
 
 
+# ── Heuristic cascade ─────────────────────────────────────
+_cascade_lock = threading.Lock()
+_cascade_counts = {"total": 0, "sarcastic": 0, "not_sarcastic": 0}
+_cascade_tally = threading.local()  # set while _predict_counted() runs
+
+
+def _record_cascade(counts: Dict[str, int]) -> None:
+    tally = getattr(_cascade_tally, "counts", None)
+    if tally is not None:
+        for key, count in counts.items():
+            tally[key] += count
+        return
+    with _cascade_lock:
+        for key, count in counts.items():
+            _cascade_counts[key] += count
+
+
+def _predict_counted(texts: List[str], explain: bool) -> Tuple[List[Dict], Dict[str, int]]:
+    """
+    ``_predict_uncached`` for the inference executor.  Also returns this
+    call's cascade counts for the caller to record — a process worker
+    would otherwise count into its own copy, which /api/stats never sees.
+    """
+    _cascade_tally.counts = dict.fromkeys(_cascade_counts, 0)
+    try:
+        return _predict_uncached(texts, explain), _cascade_tally.counts
+    finally:
+        _cascade_tally.counts = None
+
+
+def _predict_cascade(texts: List[str], explain: bool) -> List[Dict]:
+    """
+    Answer texts whose heuristic score is at or beyond the calibrated
+    thresholds directly; only the uncertain middle goes through the model.
+    Short-circuited answers report the threshold's calibrated precision as
+    their confidence — the heuristic score itself is not a probability.
+    """
+    results: List[Optional[Dict]] = [None] * len(texts)
+    uncertain: List[int] = []
+    uncertain_cues: List[Tuple[List[str], float, List[str]]] = []
+    short_circuited = {"sarcastic": 0, "not_sarcastic": 0}
+    for i, text in enumerate(texts):
+        cue_words, score, reasons = _score_cues(text)
+        if score >= CASCADE_HIGH:
+            label, confidence = "Sarcastic", CASCADE_HIGH_PRECISION
+            short_circuited["sarcastic"] += 1
+        elif score <= CASCADE_LOW:
+            label, confidence = "Not Sarcastic", CASCADE_LOW_PRECISION
+            short_circuited["not_sarcastic"] += 1
+        else:
+            uncertain.append(i)
+            uncertain_cues.append((cue_words, score, reasons))
+            continue
+        confidence = round(confidence, 4)
+        if not explain:
+            results[i] = _label_only(label, confidence)
+            continue
+        results[i] = {
+            "prediction": label,
+            "confidence": confidence,
+            "highlighted_words": cue_words,
+            "explanation": _explain(reasons),
+            "attention_scores": None,
+        }
+
+    if uncertain:
+        computed = _predict_real_batch([texts[i] for i in uncertain], explain, uncertain_cues)
+        for i, result in zip(uncertain, computed):
+            results[i] = result
+
+    _record_cascade({"total": len(texts), **short_circuited})
+    return results
+
+
+def get_cascade_stats() -> Dict:
+    with _cascade_lock:
+        counts = dict(_cascade_counts)
+    skipped = counts["sarcastic"] + counts["not_sarcastic"]
+    return {
+        "enabled": CASCADE_ENABLED,
+        "high_threshold": CASCADE_HIGH,
+        "low_threshold": CASCADE_LOW,
+        "high_precision": CASCADE_HIGH_PRECISION,
+        "low_precision": CASCADE_LOW_PRECISION,
+        "total": counts["total"],
+        "short_circuited": skipped,
+        "short_circuited_sarcastic": counts["sarcastic"],
+        "short_circuited_not_sarcastic": counts["not_sarcastic"],
+        "short_circuit_rate": round(skipped / counts["total"], 4) if counts["total"] else 0.0,
+    }
+
+
 # ── Public API ────────────────────────────────────────────
-def predict(text: str) -> Dict:
-    """Return a sarcasm prediction for the given text."""
+def predict(text: str, explain: bool = True) -> Dict:
+    """
+    Return a sarcasm prediction for the given text.
+
+    With ``explain=False`` only the label and confidence are computed;
+    attention weights are never materialised.
+    """
+    return predict_batch([text], explain)[0]
+
+
+def _predict_uncached(texts: List[str], explain: bool) -> List[Dict]:
     if _is_mock:
-        return _predict_mock(text)
-    return _predict_real(text)
+        cues = detect_sarcasm_cues_batch(texts)
+        return [
+            _predict_mock(t, explain, (c, score, expl))
+            for t, c, score, expl in zip(texts, cues["cues"], cues["score"], cues["explanation"])
+        ]
+    if CASCADE_ENABLED:
+        return _predict_cascade(texts, explain)
+    return _predict_real_batch(texts, explain)
+
+
+def predict_batch(texts: List[str], explain: bool = True, cache: bool = True) -> List[Dict]:
+    """
+    Return predictions for a batch of texts.
+
+    Cached predictions are served directly; only the misses go through
+    the model, in a single batch.  ``cache=False`` bypasses the cache
+    entirely (bulk scoring would only evict interactive entries).
+    """
+    if _cache is None or not cache:
+        return _predict_uncached(texts, explain)
+    version, results, misses = _cache_lookup(texts, explain)
+    if misses:
+        computed = _predict_uncached([texts[ix[0]] for ix in misses.values()], explain)
+        _cache_fill(version, results, misses, computed)
+    return results
+
+
+async def predict_batch_async(
+    texts: List[str], explain: bool = True, cache: bool = True
+) -> List[Dict]:
+    """
+    ``predict_batch`` for the event loop.  The cache is consulted here, in
+    the API process, and only the misses run on the inference executor —
+    process workers would otherwise each keep (and count) a cache of their
+    own.
+    """
+    if _cache is None or not cache:
+        return await _run_counted(texts, explain)
+    # SQLite lookups touch the disk; keep them off the event loop
+    off_loop = _cache.backend == "sqlite"
+    if off_loop:
+        version, results, misses = await asyncio.to_thread(_cache_lookup, texts, explain)
+    else:
+        version, results, misses = _cache_lookup(texts, explain)
+    if misses:
+        computed = await _run_counted([texts[ix[0]] for ix in misses.values()], explain)
+        if off_loop:
+            await asyncio.to_thread(_cache_fill, version, results, misses, computed)
+        else:
+            _cache_fill(version, results, misses, computed)
+    return results
+
+
+async def _run_counted(texts: List[str], explain: bool) -> List[Dict]:
+    results, counts = await run_inference(_predict_counted, texts, explain)
+    _record_cascade(counts)
+    return results
+
+
+def _cache_lookup(
+    texts: List[str], explain: bool
+) -> Tuple[str, List[Optional[Dict]], Dict[str, List[int]]]:
+    """Return ``(version, results, misses)`` — misses maps each missing key to its indices."""
+    version = _cache_version()
+    keys = [make_key(t, version, explain) for t in texts]
+    results: List[Optional[Dict]] = [_cache.get(k) for k in keys]
+    # Repeats within one batch are computed once
+    misses: Dict[str, List[int]] = {}
+    for i, result in enumerate(results):
+        if result is None:
+            misses.setdefault(keys[i], []).append(i)
+    return version, results, misses
+
+
+def _cache_fill(
+    version: str,
+    results: List[Optional[Dict]],
+    misses: Dict[str, List[int]],
+    computed: List[Dict],
+) -> None:
+    # Skip the write if a model or rule hot-swap landed mid-batch
+    cacheable = _cache_version() == version
+    for (key, indices), result in zip(misses.items(), computed):
+        if cacheable:
+            _cache.put(key, result)
+        for i in indices:
+            results[i] = copy.deepcopy(result)
+
+
+# ── Inference executor ────────────────────────────────────
+_executor: Optional[Executor] = None
+_EXECUTORS = ("thread", "process")
+_WEIGHT_SHARING_MODES = ("mmap", "shm")
+
+
+def _torch_threads_per_worker() -> int:
+    if TORCH_THREADS_PER_WORKER > 0:
+        return TORCH_THREADS_PER_WORKER
+    return max(1, (os.cpu_count() or 1) // max(1, INFERENCE_WORKERS))
+
+
+def _init_process_worker(
+    num_threads: int,
+    shared_state: Optional[Tuple] = None,
+    model_path: Optional[Path] = None,
+    rules_path: Optional[str] = None,
+    ready: Optional[Any] = None,
+) -> None:
+    global _model, _tokenizer, _is_mock, _model_version, _rules
+    torch.set_num_threads(num_threads)
+    if rules_path is not None and rules_path != _rules.source:
+        _rules = load_rule_pack(Path(rules_path))  # compiled form comes from the cache
+    if shared_state is None:
+        # Safetensors/.pt weights are memory-mapped, so every worker maps
+        # the same page-cache pages rather than holding a private copy.
+        load_model(model_path)
+    else:
+        _model, _tokenizer, _model_version = shared_state
+        _is_mock = False
+        if _cache is not None:
+            _cache.set_model_version(_cache_version())
+    # Warm up here rather than in a task: the pool hands tasks to any idle
+    # worker, so N warm-up tasks need not reach N workers.
+    if WARMUP_ENABLED:
+        warm_up()
+    if ready is not None:
+        with ready.get_lock():
+            ready.value += 1
+
+
+class _InferencePool(ProcessPoolExecutor):
+    """
+    Inference process pool.  Each worker loads and warms up its model in
+    the initializer, then counts itself in ``ready``.
+    """
+
+    def __init__(self, workers: int, initargs: Tuple):
+        context = torch.multiprocessing.get_context("spawn")
+        self.workers = workers
+        self.ready = context.Value("i", 0)
+        super().__init__(
+            max_workers=workers,
+            mp_context=context,
+            initializer=_init_process_worker,
+            initargs=(*initargs, self.ready),
+        )
+
+    def wait_ready(self) -> None:
+        """Start every worker and block until each one is loaded and warm."""
+        while True:
+            # Workers are spawned on demand: a task finding no idle worker
+            # starts one, and a new worker runs the initializer first.
+            for future in [self.submit(int) for _ in range(self.workers)]:
+                future.result()
+            if self.ready.value >= self.workers:
+                return
+            time.sleep(0.05)
+
+
+def _shared_state(model=None, tokenizer=None, version: Optional[str] = None) -> Optional[Tuple]:
+    """
+    Move the fp32 model (default: the active one) into shared memory for
+    process workers.
+    """
+    if model is None:
+        if _is_mock:
+            return None
+        model, tokenizer, version = _model, _tokenizer, _model_version
+    if WEIGHT_SHARING != "shm":
+        return None
+    if INFERENCE_ENGINE != "fp32":
+        logger.warning(
+            "WEIGHT_SHARING=shm needs the fp32 engine — %s workers load their own model",
+            INFERENCE_ENGINE,
+        )
+        return None
+    model.share_memory()
+    return model, tokenizer, version
+
+
+def _create_executor(
+    shared_state: Optional[Tuple], model_path: Optional[Path], rules_path: Optional[str]
+) -> Executor:
+    workers = max(1, INFERENCE_WORKERS)
+    num_threads = _torch_threads_per_worker()
+    if INFERENCE_EXECUTOR == "process":
+        # torch.multiprocessing passes shared-memory tensors by handle,
+        # so "shm" workers map the parent's weights instead of copying.
+        executor = _InferencePool(
+            workers, (num_threads, shared_state, model_path, rules_path)
+        )
+    else:
+        executor = ThreadPoolExecutor(
+            max_workers=workers,
+            thread_name_prefix="inference",
+            initializer=torch.set_num_threads,
+            initargs=(num_threads,),
+        )
+    logger.info(
+        "Inference executor: %d %s worker(s), %d torch thread(s) each",
+        workers, INFERENCE_EXECUTOR, num_threads,
+    )
+    return executor
+
+
+def get_executor() -> Executor:
+    """Return the shared inference executor, creating it on first use."""
+    global _executor
+    if _executor is None:
+        _executor = _create_executor(_shared_state(), _model_path, _rules.source)
+    return _executor
+
+
+async def run_inference(fn: Callable[..., Any], *args: Any) -> Any:
+    """Run blocking inference *fn* on the executor without blocking the loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_executor(), fn, *args)
+
+
+def _start_process_workers(
+    model=None, tokenizer=None, version: Optional[str] = None,
+    model_path: Optional[Path] = None, rules_path: Optional[str] = None,
+) -> Optional[Executor]:
+    """
+    Process workers hold their own model and rules, so a swap needs new
+    ones.  Start a pool for the given model (None: mock mode) and rule
+    pack and wait until every worker has loaded and warmed up, so the
+    first requests after the swap never pay a cold start.  Returns None
+    when there is no process pool to replace.  Blocking.
+    """
+    if INFERENCE_EXECUTOR != "process" or _executor is None:
+        return None
+    state = _shared_state(model, tokenizer, version) if model is not None else None
+    pool = _create_executor(state, model_path, rules_path)
+    try:
+        pool.wait_ready()
+    except BaseException:
+        pool.shutdown(wait=False, cancel_futures=True)
+        raise
+    return pool
+
+
+def _swap_executor(pool: Optional[Executor]) -> None:
+    global _executor
+    if pool is None:
+        return
+    old, _executor = _executor, pool
+    # Work already queued still completes on the old workers
+    old.shutdown(wait=False)
+
+
+def shutdown_executor() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=True, cancel_futures=True)
+        _executor = None
+
+
+# ── Micro-batching ────────────────────────────────────────
+class MicroBatcher:
+    """
+    Coalesces concurrent single-text predictions into batched forward passes.
+
+    Callers are queued and flushed together through ``predict_batch_async``
+    once ``max_batch_size`` texts are waiting or ``max_wait_ms`` has passed
+    since the first one arrived.  Each caller only receives its own result.
+
+    Batches run on the inference executor; at most ``max_concurrency`` are
+    in flight, and new requests keep queueing (growing the next batch)
+    while every worker is busy.  Once ``max_queue`` texts are waiting
+    (0 = unbounded), ``submit`` itself waits, pushing back on callers.
+    """
+
+    def __init__(
+        self,
+        max_batch_size: int = BATCH_MAX_SIZE,
+        max_wait_ms: float = BATCH_MAX_WAIT_MS,
+        max_concurrency: int = INFERENCE_WORKERS,
+        max_queue: int = BATCH_MAX_QUEUE,
+    ):
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_queue = max(0, max_queue)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._flushes: Set[asyncio.Task] = set()
+
+    def _ensure_worker(self) -> None:
+        # The worker is bound to the running loop; restart it if the loop
+        # changed (e.g. between test cases) or the task died.
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._worker is None or self._worker.done():
+            self._loop = loop
+            self._queue = asyncio.Queue(maxsize=self.max_queue)
+            self._slots = asyncio.Semaphore(self.max_concurrency)
+            self._worker = loop.create_task(self._run())
+
+    async def submit(self, text: str, explain: bool = True) -> Dict:
+        """Queue *text* and wait for its prediction."""
+        self._ensure_worker()
+        future = self._loop.create_future()
+        queue = self._queue
+        await queue.put((text, explain, future))
+        if queue is not self._queue:
+            future.cancel()  # closed while waiting for room in the queue
+        return await future
+
+    async def _collect(self, batch: List[Tuple[str, bool, asyncio.Future]]) -> None:
+        """Fill *batch* in place, so a cancelled worker can release its callers."""
+        batch.append(await self._queue.get())
+        deadline = self._loop.time() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+            remaining = deadline - self._loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except TimeoutError:
+                break
+
+    async def _run(self) -> None:
+        while True:
+            await self._slots.acquire()
+            batch: List[Tuple[str, bool, asyncio.Future]] = []
+            try:
+                await self._collect(batch)
+            except BaseException:
+                self._slots.release()
+                for _, _, future in batch:
+                    future.cancel()
+                raise
+            flush = self._loop.create_task(self._flush(batch))
+            self._flushes.add(flush)
+            flush.add_done_callback(self._flushes.discard)
+
+    async def _flush(self, batch: List[Tuple[str, bool, asyncio.Future]]) -> None:
+        try:
+            # Explained and label-only requests need different forward passes
+            for explain in (True, False):
+                pending = [(t, f) for t, e, f in batch if e is explain and not f.done()]
+                if pending:
+                    await self._predict_group(pending, explain)
+        finally:
+            self._slots.release()
+
+    @staticmethod
+    async def _predict_group(
+        pending: List[Tuple[str, asyncio.Future]], explain: bool
+    ) -> None:
+        try:
+            results = await predict_batch_async([t for t, _ in pending], explain)
+        except Exception as exc:
+            # Any inference failure belongs to every caller in the batch
+            logger.exception("Micro-batch of %d text(s) failed", len(pending))
+            for _, future in pending:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        for (_, future), result in zip(pending, results):
+            if not future.done():
+                future.set_result(result)
+
+    async def close(self) -> None:
+        """
+        Stop the worker task.  Callers still queued are cancelled; batches
+        already running finish first.
+        """
+        worker, self._worker = self._worker, None
+        queue, self._queue = self._queue, None
+        if worker is not None and not worker.done():
+            worker.cancel()
+            if self._loop is asyncio.get_running_loop():
+                with suppress(asyncio.CancelledError):
+                    await worker
+        while queue is not None and not queue.empty():
+            queue.get_nowait()[2].cancel()
+        if self._flushes and self._loop is asyncio.get_running_loop():
+            await asyncio.gather(*self._flushes, return_exceptions=True)
+
+
+_batcher = MicroBatcher()
+
+
+async def predict_async(text: str, explain: bool = True) -> Dict:
+    """Return a prediction for *text* via the shared micro-batcher."""
+    return await _batcher.submit(text, explain)
 
 
-def predict_batch(texts: List[str]) -> List[Dict]:
-    """Return predictions for a batch of texts."""
-    return [predict(t) for t in texts]
+async def close_batcher() -> None:
+    await _batcher.close()
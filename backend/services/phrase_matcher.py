@@ -0,0 +1,134 @@
+"""
+Multi-pattern phrase matcher (word-level Aho–Corasick).
+
+Phrases are tokenized into words and compiled once into an automaton, so
+finding every phrase and lexicon hit is a single pass over the text's
+tokens regardless of how many phrases are loaded.  Working on words rather
+than characters means hits always fall on word boundaries; multi-word
+candidates are then checked against the exact surface text, so the
+punctuation inside a phrase ("i'm shocked") must match too.  Phrases should
+start and end with a word character.
+"""
+
+import re
+from collections import deque
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+_WORD_RE = re.compile(r"\b\w+\b")
+
+
+class PhraseMatch(NamedTuple):
+    start: int  # character offsets into the scanned text
+    end: int
+    phrase: str
+    labels: Tuple[str, ...]
+    first_token: int
+    last_token: int
+
+
+class PhraseMatcher:
+    """
+    Finds every occurrence of a set of labelled phrases in one scan.
+
+    >>> m = PhraseMatcher([("of course", "marker"), ("great", "positive")])
+    >>> [(h.phrase, h.start) for h in m.find("great, of course")]
+    [('great', 0), ('of course', 7)]
+    """
+
+    def __init__(self, phrases: Iterable[Tuple[str, str]] = ()):
+        self._labels: Dict[str, List[str]] = {}
+        for phrase, label in phrases:
+            self.add(phrase, label)
+        self._compiled = False
+
+    def add(self, phrase: str, label: str) -> None:
+        """Register *phrase* (case-sensitive; callers lower-case) under *label*."""
+        labels = self._labels.setdefault(phrase, [])
+        if label not in labels:
+            labels.append(label)
+        self._compiled = False
+
+    def __len__(self) -> int:
+        return len(self._labels)
+
+    # ── Compilation ─────────────────────────────────────────
+    def compile(self) -> "PhraseMatcher":
+        """Build the automaton (done lazily on the first scan otherwise)."""
+        goto: List[Dict[str, int]] = [{}]
+        outputs: List[List[int]] = [[]]
+        patterns: List[Tuple[str, int, bool, Tuple[str, ...]]] = []
+        for phrase, labels in self._labels.items():
+            words = _WORD_RE.findall(phrase)
+            if not words:
+                continue
+            state = 0
+            for word in words:
+                nxt = goto[state].get(word)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][word] = nxt
+                    goto.append({})
+                    outputs.append([])
+                state = nxt
+            outputs[state].append(len(patterns))
+            # Anything but a bare word is confirmed against the surface text
+            verify = len(words) > 1 or words[0] != phrase
+            patterns.append((phrase, len(words), verify, tuple(labels)))
+
+        # Breadth-first failure links; each state inherits its fallback's outputs
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for word, nxt in goto[state].items():
+                queue.append(nxt)
+                f = fail[state]
+                while f and word not in goto[f]:
+                    f = fail[f]
+                fail[nxt] = goto[f].get(word, 0)
+                outputs[nxt] = outputs[nxt] + outputs[fail[nxt]]
+
+        self._goto, self._fail, self._outputs, self._patterns = goto, fail, outputs, patterns
+        self._compiled = True
+        return self
+
+    # ── Matching ────────────────────────────────────────────
+    def find(self, text: str) -> List[PhraseMatch]:
+        spans = [m.span() for m in _WORD_RE.finditer(text)]
+        words = [text[s:e] for s, e in spans]
+        return self.find_tokens(text, words, spans)
+
+    def find_tokens(
+        self,
+        text: str,
+        words: Sequence[str],
+        spans: Sequence[Tuple[int, int]],
+        labels: Optional[Iterable[str]] = None,
+    ) -> List[PhraseMatch]:
+        """
+        Scan pre-tokenized *text* (``words`` with their character ``spans``)
+        and return the hits ordered by position.  *labels* restricts the
+        result to phrases carrying one of them.
+        """
+        if not self._compiled:
+            self.compile()
+        wanted = set(labels) if labels is not None else None
+        goto, fail, outputs, patterns = self._goto, self._fail, self._outputs, self._patterns
+        hits: List[PhraseMatch] = []
+        state = 0
+        for i, word in enumerate(words):
+            while state and word not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(word, 0)
+            for pid in outputs[state]:
+                phrase, length, verify, phrase_labels = patterns[pid]
+                if wanted is not None and wanted.isdisjoint(phrase_labels):
+                    continue
+                first = i - length + 1
+                start, end = spans[first][0], spans[i][1]
+                # Separators inside the phrase must match exactly
+                if verify and text[start:end] != phrase:
+                    continue
+                hits.append(PhraseMatch(start, end, phrase, phrase_labels, first, i))
+        hits.sort(key=lambda h: (h.start, h.end))
+        return hits
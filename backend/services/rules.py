@@ -0,0 +1,299 @@
+"""
+Heuristic rule packs.
+
+A rule pack (JSON or YAML — see ``backend/rules/default.json``) holds the
+sentiment lexicons, marker words, known sarcastic phrases and weighted
+regex patterns behind the heuristic scorer.  ``load_rule_pack`` compiles
+it into a ``RuleSet``: one phrase automaton for every lexicon and phrase,
+and per-pattern token matchers.  Compiled packs are pickled under
+``RULES_CACHE_DIR`` keyed by the pack's content hash, so workers loading
+an unchanged pack skip compilation.
+
+Patterns made of plain word alternations joined by ".*" are evaluated on
+the token list: the leftmost start and greedy end the regex would find are
+located by index lookups, with no backtracking over the text.  The rest
+(and any text spanning several lines, where "." stops at "\\n") use the
+compiled regex behind a token pre-check.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import pickle
+import re
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, List, NamedTuple, Optional, Tuple
+
+from backend.config import RULES_CACHE_DIR
+from backend.services.phrase_matcher import PhraseMatcher
+
+logger = logging.getLogger(__name__)
+
+# Bump when the compiled structures change so stale pickles are ignored
+COMPILER_VERSION = 1
+
+_WORD_RE = re.compile(r"\b\w+\b")
+_PLAIN_ALTERNATIVE = re.compile(r"[a-z]+(?: [a-z]+)*")
+
+# Pack lexicon name → PhraseMatcher label
+LEXICONS = ("positive", "negative", "markers", "positive_verbs", "negative_situations")
+
+# A segment is its alternatives in regex order, each a tuple of words
+_Segment = Tuple[Tuple[str, ...], ...]
+
+
+# ── Compiled rules ────────────────────────────────────────
+class Rule(NamedTuple):
+    regex: "re.Pattern[str]"
+    weight: float
+    reason: str
+    # One entry per ".*"-separated segment, None if not a plain alternation
+    segments: Tuple[Optional[_Segment], ...]
+    # Words that can start each segment (None = unconstrained)
+    triggers: Tuple[Optional[FrozenSet[str]], ...]
+
+
+def _parse_segment(segment: str) -> Optional[_Segment]:
+    r"""``\b(could|can)\b`` → (("could",), ("can",)); ``\bwhat a\b`` → (("what", "a"),)."""
+    if not (segment.startswith(r"\b") and segment.endswith(r"\b")):
+        return None
+    body = segment[2:-2]
+    if body.startswith("(") and body.endswith(")"):
+        body = body[1:-1]
+    alternatives = body.split("|")
+    if not all(_PLAIN_ALTERNATIVE.fullmatch(alt) for alt in alternatives):
+        return None
+    return tuple(tuple(alt.split()) for alt in alternatives)
+
+
+def compile_rule(pattern: str, weight: float, reason: str) -> Rule:
+    segments = tuple(_parse_segment(seg) for seg in pattern.split(".*"))
+    triggers = tuple(
+        frozenset(alt[0] for alt in seg) if seg is not None else None for seg in segments
+    )
+    return Rule(re.compile(pattern), weight, reason, segments, triggers)
+
+
+class RuleSet(NamedTuple):
+    name: str
+    version: str  # sha256 prefix of the pack file
+    source: str
+    lexicons: Dict[str, FrozenSet[str]]
+    known_phrases: Tuple[str, ...]
+    patterns: Tuple[Tuple[str, float, str], ...]
+    rules: Tuple[Rule, ...]
+    # Every lexicon entry and known phrase (label "known") in one automaton
+    phrases: PhraseMatcher
+    known_rank: Dict[str, int]
+
+
+# ── Compilation ───────────────────────────────────────────
+def compile_rule_pack(pack: Dict[str, Any], version: str = "", source: str = "") -> RuleSet:
+    """
+    Validate a parsed rule pack and build its matchers.  Raises TypeError
+    when *pack* is not a mapping and ValueError for invalid contents.
+    """
+    if not isinstance(pack, dict):
+        raise TypeError("Rule pack must be a mapping")
+    raw_lexicons = pack.get("lexicons", {})
+    unknown = set(raw_lexicons) - set(LEXICONS)
+    if unknown:
+        raise ValueError(f"Unknown lexicons: {', '.join(sorted(unknown))}")
+    lexicons = {
+        name: frozenset(w.lower() for w in raw_lexicons.get(name, [])) for name in LEXICONS
+    }
+    known_phrases = tuple(p.lower() for p in pack.get("known_phrases", []))
+
+    patterns, rules = [], []
+    for i, entry in enumerate(pack.get("patterns", [])):
+        try:
+            pattern, weight, reason = entry["pattern"], float(entry["weight"]), entry["reason"]
+            rules.append(compile_rule(pattern, weight, reason))
+        except (KeyError, TypeError, ValueError) as e:
+            raise ValueError(f"Invalid pattern #{i}: {e}") from e
+        except re.error as e:
+            raise ValueError(f"Invalid regex in pattern #{i} ({entry['pattern']!r}): {e}") from e
+        patterns.append((pattern, weight, reason))
+
+    known_rank: Dict[str, int] = {}
+    for i, phrase in enumerate(known_phrases):
+        known_rank.setdefault(phrase, i)
+
+    phrases = PhraseMatcher()
+    for name in LEXICONS:
+        for word in lexicons[name]:
+            phrases.add(word, name)
+    for phrase in known_phrases:
+        phrases.add(phrase, "known")
+
+    return RuleSet(
+        name=pack.get("name", Path(source).stem if source else "inline"),
+        version=version,
+        source=source,
+        lexicons=lexicons,
+        known_phrases=known_phrases,
+        patterns=tuple(patterns),
+        rules=tuple(rules),
+        phrases=phrases.compile(),
+        known_rank=known_rank,
+    )
+
+
+def _parse(raw: bytes, path: Path) -> Dict[str, Any]:
+    if path.suffix in (".yaml", ".yml"):
+        try:
+            import yaml
+        except ImportError as e:
+            raise ValueError("YAML rule packs need PyYAML (pip install pyyaml)") from e
+        try:
+            return yaml.safe_load(raw)
+        except yaml.YAMLError as e:
+            raise ValueError(str(e)) from e
+    return json.loads(raw)
+
+
+def pack_version(raw: bytes) -> str:
+    """Version of a rule pack: a hash of its file content."""
+    return hashlib.sha256(raw).hexdigest()[:12]
+
+
+def load_rule_pack(path: Path, cache_dir: Optional[Path] = RULES_CACHE_DIR) -> RuleSet:
+    """
+    Load and compile the pack at *path*, reusing the cached compiled form
+    when the file content is unchanged.  Raises ValueError on a bad pack.
+    """
+    path = Path(path)
+    raw = path.read_bytes()
+    digest = hashlib.sha256(b"%d:" % COMPILER_VERSION + raw).hexdigest()
+    version = pack_version(raw)
+    artifact = Path(cache_dir) / f"{digest}.pickle" if cache_dir else None
+
+    if artifact is not None and artifact.exists():
+        try:
+            with open(artifact, "rb") as f:
+                rules = pickle.load(f)
+            return rules._replace(source=str(path))
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            logger.warning("Ignoring unreadable compiled rule pack %s", artifact)
+
+    try:
+        pack = _parse(raw, path)
+    except ValueError as e:
+        raise ValueError(f"Cannot parse rule pack {path}: {e}") from e
+    try:
+        rules = compile_rule_pack(pack, version, str(path))
+    except TypeError as e:
+        raise ValueError(f"Invalid rule pack {path}: {e}") from e
+
+    if artifact is not None:
+        try:
+            artifact.parent.mkdir(parents=True, exist_ok=True)
+            # Write-then-rename so concurrent workers never read a partial file
+            fd, tmp = tempfile.mkstemp(dir=artifact.parent, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(rules, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, artifact)
+        except OSError as e:
+            logger.warning("Could not cache compiled rule pack: %s", e)
+    logger.info("Compiled rule pack %s (%s, %d patterns)", rules.name, version, len(rules.rules))
+    return rules
+
+
+# ── Matching ──────────────────────────────────────────────
+class Tokens(NamedTuple):
+    lower: str
+    words: List[str]
+    spans: List[Tuple[int, int]]
+    positions: Dict[str, List[int]]
+
+
+def tokenize(lower: str) -> Tokens:
+    words, spans = [], []
+    positions: Dict[str, List[int]] = {}
+    for i, m in enumerate(_WORD_RE.finditer(lower)):
+        word = m.group()
+        words.append(word)
+        spans.append(m.span())
+        positions.setdefault(word, []).append(i)
+    return Tokens(lower, words, spans, positions)
+
+
+def _may_match(rule: Rule, tokens: Tokens) -> bool:
+    """Necessary condition: every segment's start word occurs, in order."""
+    pos = -1
+    for words in rule.triggers:
+        if words is None:
+            continue
+        nxt = None
+        for w in words:
+            for i in tokens.positions.get(w, ()):
+                if i > pos:
+                    if nxt is None or i < nxt:
+                        nxt = i
+                    break
+        if nxt is None:
+            return False
+        pos = nxt
+    return True
+
+
+def _segment_matches(segment: _Segment, tokens: Tokens) -> List[Tuple[int, List[int]]]:
+    """(start token, end tokens of the matching alternatives in regex order), by start."""
+    words, spans, lower = tokens.words, tokens.spans, tokens.lower
+    ends_at: Dict[int, List[int]] = {}
+    for alt in segment:
+        k = len(alt)
+        for i in tokens.positions.get(alt[0], ()):
+            if tuple(words[i:i + k]) != alt:
+                continue
+            # Words of a multi-word alternative must be separated by one space
+            if any(lower[spans[j][1]:spans[j + 1][0]] != " " for j in range(i, i + k - 1)):
+                continue
+            ends_at.setdefault(i, []).append(i + k - 1)
+    return sorted(ends_at.items())
+
+
+def _match_tokens(rule: Rule, tokens: Tokens) -> Optional[Tuple[int, int]]:
+    """
+    First and last token of ``rule.regex.search(lower)`` for a plain rule:
+    the leftmost start that can complete the chain, and the greedy ``.*``
+    end — the latest-starting final segment reachable from that start.
+    """
+    matches = []
+    for segment in rule.segments:
+        found = _segment_matches(segment, tokens)
+        if not found:
+            return None
+        matches.append(found)
+
+    first, middle, last = matches[0], matches[1:-1], matches[-1]
+    for start, ends in first:
+        if len(matches) == 1:
+            return start, ends[0]
+        end = min(ends)
+        for found in middle:
+            end = next((min(e) for s, e in found if s > end), None)
+            if end is None:
+                break
+        if end is None:
+            continue
+        final = next(((s, e) for s, e in reversed(last) if s > end), None)
+        if final is not None:
+            return start, final[1][0]
+    return None
+
+
+def rule_cues(rule: Rule, tokens: Tokens) -> Optional[List[str]]:
+    """Words of the rule's match (as the regex would find it), or None."""
+    if not _may_match(rule, tokens):
+        return None
+    if None in rule.segments or "\n" in tokens.lower:
+        match = rule.regex.search(tokens.lower)
+        return _WORD_RE.findall(match.group()) if match else None
+    span = _match_tokens(rule, tokens)
+    if span is None:
+        return None
+    start, end = span
+    return tokens.words[start:end + 1]
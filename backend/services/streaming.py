@@ -0,0 +1,153 @@
+"""
+Streaming NDJSON prediction.
+
+Input is newline-delimited JSON — each line a text (``"..."``) or an
+object ``{"text": "...", "id": ...}`` — read incrementally from any async
+byte stream (a chunked request body or a generator).  Texts are grouped
+into batches of STREAM_BATCH_SIZE and run through ``predict_batch_async`` on
+the inference executor — bypassing the prediction cache, so a backfill never
+evicts interactive entries — and each batch's results are emitted as
+NDJSON as soon as it finishes.  One batch is scored while the next is read, so
+memory stays bounded by two batches whatever the input size.
+"""
+
+import asyncio
+import json
+import logging
+from typing import Any, AsyncIterable, AsyncIterator, Dict, List, Optional, Tuple, Union
+
+from pydantic import ValidationError
+
+from backend.config import STREAM_BATCH_SIZE, STREAM_MAX_LINE_BYTES
+from backend.schemas import PredictRequest
+from backend.services.explainer import get_attention_explanation
+from backend.services.model_service import predict_batch_async
+
+logger = logging.getLogger(__name__)
+
+
+class LineTooLong(ValueError):
+    pass
+
+
+async def iter_lines(
+    chunks: AsyncIterable[bytes], max_line_bytes: int = STREAM_MAX_LINE_BYTES
+) -> AsyncIterator[Union[bytes, LineTooLong]]:
+    """
+    Split a byte stream into lines without holding more than one partial line.
+
+    A line longer than *max_line_bytes* is dropped (up to its newline) and
+    yielded as a ``LineTooLong`` instance instead of bytes.
+    """
+    buffer = b""
+    skipping = False  # inside an over-long line whose start was reported
+    async for chunk in chunks:
+        *lines, buffer = (buffer + chunk).split(b"\n")
+        for line in lines:
+            if skipping:
+                skipping = False
+            elif len(line) > max_line_bytes:
+                yield LineTooLong(f"line longer than {max_line_bytes} bytes")
+            else:
+                yield line
+        if not skipping and len(buffer) > max_line_bytes:
+            yield LineTooLong(f"line longer than {max_line_bytes} bytes")
+            skipping = True
+        if skipping:
+            buffer = b""
+    if buffer:
+        yield buffer
+
+
+def parse_line(line: Union[bytes, str]) -> Tuple[str, Any]:
+    """
+    Return ``(text, id)`` for one NDJSON line.  Raises ValueError for bad
+    JSON or text, TypeError when the line holds no text string.
+    """
+    item = json.loads(line)
+    if isinstance(item, dict):
+        text, item_id = item.get("text"), item.get("id")
+    else:
+        text, item_id = item, None
+    if not isinstance(text, str):
+        raise TypeError("expected a JSON string or an object with a 'text' string")
+    check_text(text)
+    return text, item_id
+
+
+def check_text(text: str) -> None:
+    """Apply /api/predict's text limits; raises ValueError."""
+    try:
+        PredictRequest(text=text)
+    except ValidationError as exc:
+        raise ValueError(exc.errors()[0]["msg"]) from None
+
+
+async def _batches(
+    chunks: AsyncIterable[bytes], batch_size: int
+) -> AsyncIterator[List[Dict]]:
+    """Group parsed lines into batches; invalid lines become error rows."""
+    batch: List[Dict] = []
+    index = 0
+    async for line in iter_lines(chunks):
+        if isinstance(line, LineTooLong):
+            batch.append({"index": index, "error": str(line)})
+        elif line.strip():
+            try:
+                text, item_id = parse_line(line)
+                batch.append({"index": index, "id": item_id, "text": text})
+            except (TypeError, ValueError) as exc:
+                batch.append({"index": index, "error": str(exc)})
+        else:
+            continue  # blank lines are not counted
+        index += 1
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+async def _score(batch: List[Dict], explain: bool) -> bytes:
+    rows = [row for row in batch if "text" in row]
+    if rows:
+        try:
+            results = await predict_batch_async([r["text"] for r in rows], explain, cache=False)
+        except Exception:
+            logger.exception("Streaming batch of %d texts failed", len(rows))
+            results = [{"error": "prediction failed"}] * len(rows)
+        for row, result in zip(rows, results):
+            if explain and result.get("attention_scores"):
+                result["explanation"] = get_attention_explanation(
+                    result["attention_scores"], result["prediction"], result["confidence"]
+                )
+            del row["text"]
+            if row["id"] is None:
+                del row["id"]
+            row.update(result)
+    return b"".join(json.dumps(row).encode() + b"\n" for row in batch)
+
+
+async def stream_predictions(
+    chunks: AsyncIterable[bytes],
+    explain: bool = True,
+    batch_size: int = STREAM_BATCH_SIZE,
+) -> AsyncIterator[bytes]:
+    """
+    Score an NDJSON byte stream and yield NDJSON results, one chunk per batch.
+
+    Each output line carries the input line's ``index`` (and ``id`` when
+    given) plus the prediction fields, or an ``error`` for invalid lines.
+    """
+    pending: Optional[asyncio.Future] = None
+    try:
+        async for batch in _batches(chunks, max(1, batch_size)):
+            previous, pending = pending, asyncio.ensure_future(_score(batch, explain))
+            if previous is not None:
+                yield await previous
+        if pending is not None:
+            last, pending = pending, None
+            yield await last
+    finally:
+        if pending is not None:
+            pending.cancel()
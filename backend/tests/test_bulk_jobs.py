@@ -0,0 +1,88 @@
+"""Unit tests for bulk file scoring jobs."""
+
+import json
+import threading
+
+import pytest
+
+from backend.services import bulk_jobs
+
+
+@pytest.fixture
+def jobs_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(bulk_jobs, "JOBS_DIR", tmp_path)
+    monkeypatch.setattr(bulk_jobs, "JOB_BATCH_SIZE", 3)
+    return tmp_path
+
+
+def _fake_predict_batch(calls):
+    def predict_batch(texts, explain=True, cache=True):
+        calls.append(list(texts))
+        return [{"prediction": "Sarcastic", "length": len(t)} for t in texts]
+    return predict_batch
+
+
+def _results(job_id):
+    return [json.loads(line) for line in bulk_jobs.results_path(job_id).read_text().splitlines()]
+
+
+def test_job_resumes_from_its_checkpoint(jobs_dir, monkeypatch):
+    calls = []
+    stop = threading.Event()
+    fake = _fake_predict_batch(calls)
+
+    def stop_after_first_batch(texts, explain=True, cache=True):
+        stop.set()
+        return fake(texts, explain, cache)
+
+    job, input_path = bulk_jobs.create_job("jsonl", "in.jsonl")
+    lines = [json.dumps({"text": f"text {i}", "id": i}) for i in range(7)] + ['{"text": ""}']
+    input_path.write_text("\n".join(lines) + "\n")
+
+    monkeypatch.setattr(bulk_jobs, "predict_batch", stop_after_first_batch)
+    state = bulk_jobs.run_job(job["id"], stop)
+    assert (state["status"], state["rows_done"]) == ("running", 3)
+
+    # Output written after the checkpoint (a crash mid-batch) is discarded
+    with open(bulk_jobs.results_path(job["id"]), "ab") as f:
+        f.write(b'{"index": 3, "partial"')
+    monkeypatch.setattr(bulk_jobs, "predict_batch", fake)
+    state = bulk_jobs.run_job(job["id"])
+
+    assert state["status"] == "done"
+    assert (state["rows_done"], state["rows_failed"]) == (8, 1)
+    assert state["rows_per_second"] > 0
+    rows = _results(job["id"])
+    assert [r["index"] for r in rows] == list(range(8))
+    assert [r.get("id") for r in rows[:7]] == list(range(7))
+    assert "error" in rows[7]
+    assert calls == [["text 0", "text 1", "text 2"], ["text 3", "text 4", "text 5"], ["text 6"]]
+
+
+def test_a_job_claimed_by_another_process_is_left_alone(jobs_dir, monkeypatch):
+    calls = []
+    monkeypatch.setattr(bulk_jobs, "predict_batch", _fake_predict_batch(calls))
+    job, input_path = bulk_jobs.create_job("jsonl", "in.jsonl")
+    input_path.write_text('"hello"\n')
+
+    with bulk_jobs._claim(job["id"]) as claimed:
+        assert claimed
+        assert bulk_jobs.run_job(job["id"]) is None
+    assert calls == []
+    assert bulk_jobs.run_job(job["id"])["status"] == "done"
+
+
+def test_csv_jobs_read_the_text_column(jobs_dir, monkeypatch):
+    monkeypatch.setattr(bulk_jobs, "predict_batch", _fake_predict_batch([]))
+    job, input_path = bulk_jobs.create_job("csv", "in.csv", text_column="message")
+    input_path.write_text('id,message\na1,"Oh great, Monday"\na2,"multi\nline"\n')
+
+    assert bulk_jobs.run_job(job["id"])["status"] == "done"
+    rows = _results(job["id"])
+    assert [(r["id"], r["length"]) for r in rows] == [("a1", 16), ("a2", 10)]
+
+    job, input_path = bulk_jobs.create_job("csv", "in.csv", text_column="missing")
+    input_path.write_text("id,message\n1,hi\n")
+    state = bulk_jobs.run_job(job["id"])
+    assert state["status"] == "failed"
+    assert "missing" in state["error"]
@@ -0,0 +1,40 @@
+"""Unit tests for the explainer service."""
+
+import pytest
+
+from backend.services import explainer, model_service
+from backend.tests.test_model_service import stub_model  # noqa: F401 — fixture
+
+
+def test_attention_explanation_names_the_top_words():
+    text = explainer.get_attention_explanation({"great": 0.4, "monday": 0.3}, "Sarcastic", 0.9)
+    assert "90.0%" in text
+    assert "great, monday" in text
+
+
+def test_shap_explainer_is_reused_and_respects_the_sample_budget(stub_model, monkeypatch):  # noqa: F811
+    shap = pytest.importorskip("shap")
+    built = []
+    real_explainer = shap.Explainer
+
+    def counting_explainer(*args, **kwargs):
+        built.append(args)
+        return real_explainer(*args, **kwargs)
+
+    monkeypatch.setattr(shap, "Explainer", counting_explainer)
+    monkeypatch.setattr(explainer, "SHAP_ENABLED", True)
+    monkeypatch.setattr(explainer, "SHAP_MAX_SAMPLES", 20)
+    monkeypatch.setattr(explainer, "_local", explainer.threading.local())
+
+    first = explainer.get_shap_explanation("oh great monday")
+    second = explainer.get_shap_explanation("i love traffic !")
+    assert first and second
+    assert len(built) == 1
+    # Partition SHAP may overshoot max_evals by one batch plus the two
+    # all-masked / unmasked rows
+    assert sum(rows for rows, _ in stub_model.calls) <= 2 * (2 * 20 + 2)
+
+    # A hot-swapped model gets a fresh explainer
+    monkeypatch.setattr(model_service, "_model_version", "stub-2")
+    explainer.get_shap_explanation("oh great monday")
+    assert len(built) == 2
@@ -0,0 +1,83 @@
+"""Unit tests for the background explanation queue."""
+
+import asyncio
+import threading
+
+import pytest
+
+from backend.services import explanation_jobs
+from backend.services.explanation_jobs import ExplanationQueue
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.mark.anyio
+async def test_queue_is_bounded_and_shares_in_flight_jobs(monkeypatch):
+    release = threading.Event()
+
+    def slow_explainer(text):
+        release.wait(5)
+        return {"text": text}
+
+    monkeypatch.setitem(explanation_jobs.EXPLAINERS, "shap", slow_explainer)
+    queue = ExplanationQueue(workers=1, max_queued=1)
+
+    running = queue.submit("first")
+    while running["status"] != "running":
+        await asyncio.sleep(0.01)
+    waiting = queue.submit("second")
+    assert waiting["status"] == "pending"
+    assert queue.submit("second")["id"] == waiting["id"]
+    assert queue.submit("third")["status"] == "rejected"
+
+    release.set()
+    while waiting["status"] != "done":
+        await asyncio.sleep(0.01)
+    assert running["result"] == {"text": "first"}
+    assert queue.get(waiting["id"])["result"] == {"text": "second"}
+    await queue.close()
+
+
+@pytest.mark.anyio
+async def test_failed_explanations_are_reported_not_cached(monkeypatch):
+    monkeypatch.setitem(explanation_jobs.EXPLAINERS, "shap", lambda text: None)
+    queue = ExplanationQueue(workers=1, max_queued=4)
+
+    job = queue.submit("hello")
+    while job["status"] in ("pending", "running"):
+        await asyncio.sleep(0.01)
+    assert job["status"] == "failed"
+    assert queue.submit("hello")["status"] == "pending"
+    await queue.close()
+
+
+@pytest.mark.anyio
+async def test_queued_jobs_survive_a_worker_restart(monkeypatch):
+    release = threading.Event()
+
+    def slow_explainer(text):
+        release.wait(5)
+        return {"text": text}
+
+    monkeypatch.setitem(explanation_jobs.EXPLAINERS, "shap", slow_explainer)
+    queue = ExplanationQueue(workers=1, max_queued=4)
+
+    running = queue.submit("first")
+    while running["status"] != "running":
+        await asyncio.sleep(0.01)
+    waiting = queue.submit("second")
+    queue._tasks[0].cancel()
+    while not queue._tasks[0].done():
+        await asyncio.sleep(0.01)
+    assert running["status"] == "failed"
+
+    release.set()
+    late = queue.submit("third")
+    while late["status"] != "done":
+        await asyncio.sleep(0.01)
+    assert waiting["status"] == "done"
+    assert queue.submit("second")["status"] == "done"
+    await queue.close()
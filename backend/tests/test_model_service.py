@@ -0,0 +1,806 @@
+"""Unit tests for the model service."""
+
+import asyncio
+import os
+import time
+
+import pytest
+import torch
+
+from backend.services import model_service
+from backend.services.cache import PredictionCache, SqlitePredictionCache
+from backend.services.model_service import MicroBatcher
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+# ── Micro-batching ────────────────────────────────────────
+def _patch_predict(monkeypatch, fake):
+    """Route the batcher's cache misses (all of them) to *fake*."""
+    monkeypatch.setattr(model_service, "_predict_uncached", fake)
+    monkeypatch.setattr(model_service, "_cache", None)
+
+
+@pytest.mark.anyio
+async def test_batcher_coalesces_concurrent_requests(monkeypatch):
+    calls = []
+
+    def fake_predict_batch(texts, explain=True):
+        calls.append(list(texts))
+        return [{"text": t} for t in texts]
+
+    _patch_predict(monkeypatch, fake_predict_batch)
+    batcher = MicroBatcher(max_batch_size=8, max_wait_ms=50)
+
+    texts = [f"text {i}" for i in range(5)]
+    results = await asyncio.gather(*(batcher.submit(t) for t in texts))
+    await batcher.close()
+
+    assert [r["text"] for r in results] == texts
+    assert calls == [texts]
+
+
+@pytest.mark.anyio
+async def test_batcher_flushes_at_max_batch_size(monkeypatch):
+    calls = []
+
+    def fake_predict_batch(texts, explain=True):
+        calls.append(len(texts))
+        return [{"text": t} for t in texts]
+
+    _patch_predict(monkeypatch, fake_predict_batch)
+    batcher = MicroBatcher(max_batch_size=2, max_wait_ms=50)
+
+    results = await asyncio.gather(*(batcher.submit(str(i)) for i in range(5)))
+    await batcher.close()
+
+    assert [r["text"] for r in results] == ["0", "1", "2", "3", "4"]
+    assert calls == [2, 2, 1]
+
+
+@pytest.mark.anyio
+async def test_batcher_propagates_errors(monkeypatch):
+    def failing_predict_batch(texts, explain=True):
+        raise RuntimeError("boom")
+
+    _patch_predict(monkeypatch, failing_predict_batch)
+    batcher = MicroBatcher(max_batch_size=4, max_wait_ms=1)
+
+    with pytest.raises(RuntimeError):
+        await batcher.submit("hello")
+    await batcher.close()
+
+
+@pytest.mark.anyio
+async def test_batcher_close_cancels_queued_callers(monkeypatch):
+    import threading
+
+    release = threading.Event()
+
+    def blocking_predict_batch(texts, explain=True):
+        release.wait(5)
+        return [{"text": t} for t in texts]
+
+    _patch_predict(monkeypatch, blocking_predict_batch)
+    batcher = MicroBatcher(max_batch_size=1, max_wait_ms=0, max_concurrency=1, max_queue=2)
+    tasks = [asyncio.ensure_future(batcher.submit(str(i))) for i in range(5)]
+    await asyncio.sleep(0.1)
+
+    closing = asyncio.ensure_future(batcher.close())
+    await asyncio.sleep(0.05)
+    release.set()  # the running batch finishes; everything else is cancelled
+    await asyncio.wait_for(closing, 2)
+    results = await asyncio.wait_for(asyncio.gather(*tasks, return_exceptions=True), 2)
+
+    assert results[0] == {"text": "0"}
+    assert all(isinstance(r, asyncio.CancelledError) for r in results[1:])
+    assert not batcher._flushes
+
+
+# ── Real (batched) inference path ─────────────────────────
+class _StubClassifier(torch.nn.Module):
+    """Stands in for BertSarcasmClassifier; records each forward's shape."""
+
+    def __init__(self):
+        super().__init__()
+        self.calls = []
+
+    def forward(self, input_ids, attention_mask, token_type_ids=None, output_attentions=True):
+        self.calls.append(tuple(input_ids.shape))
+        batch, seq = input_ids.shape
+        logits = torch.stack([attention_mask.sum(dim=1).float(), torch.zeros(batch)], dim=1)
+        if not output_attentions:
+            return logits, None
+        attn = torch.softmax(torch.arange(seq, dtype=torch.float).expand(batch, 2, seq, seq), dim=-1)
+        return logits, (attn,)
+
+
+@pytest.fixture
+def stub_model(tmp_path, monkeypatch):
+    from transformers import BertTokenizerFast
+
+    vocab = ["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]", "oh", "great", "monday", "i", "love", "traffic", "!"]
+    vocab_file = tmp_path / "vocab.txt"
+    vocab_file.write_text("\n".join(vocab))
+    model = _StubClassifier()
+    monkeypatch.setattr(model_service, "_tokenizer", BertTokenizerFast(vocab_file=str(vocab_file)))
+    monkeypatch.setattr(model_service, "_model", model)
+    monkeypatch.setattr(model_service, "_is_mock", False)
+    monkeypatch.setattr(model_service, "_model_version", "stub")
+    monkeypatch.setattr(model_service, "_cache", None)
+    return model
+
+
+def test_predict_batch_runs_single_forward_pass(stub_model):
+    texts = ["Oh great, Monday!", "I love traffic", "great"]
+    results = model_service.predict_batch(texts)
+
+    assert len(stub_model.calls) == 1
+    assert stub_model.calls[0][0] == len(texts)
+    assert len(results) == len(texts)
+    for r in results:
+        assert r["prediction"] in ("Sarcastic", "Not Sarcastic")
+        assert "[PAD]" not in r["attention_scores"]
+
+
+def test_predict_batch_matches_single_predictions(stub_model):
+    texts = ["Oh great, Monday!", "I love traffic"]
+    batched = model_service.predict_batch(texts)
+    single = [model_service.predict(t) for t in texts]
+    for b, s in zip(batched, single):
+        assert b["prediction"] == s["prediction"]
+        assert b["highlighted_words"] == s["highlighted_words"]
+
+
+def test_predict_batch_without_explanations(stub_model):
+    explained = model_service.predict_batch(["Oh great, Monday!"])
+    lean = model_service.predict_batch(["Oh great, Monday!"], explain=False)
+
+    assert lean[0]["prediction"] == explained[0]["prediction"]
+    assert lean[0]["confidence"] == explained[0]["confidence"]
+    assert lean[0]["attention_scores"] is None
+    assert lean[0]["highlighted_words"] == []
+
+
+def test_attention_is_pooled_per_original_word(stub_model, tmp_path, monkeypatch):
+    from transformers import BertTokenizerFast
+
+    vocab = ["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]", "un", "##bel", "##ievable", "great", "!"]
+    vocab_file = tmp_path / "wordpiece.txt"
+    vocab_file.write_text("\n".join(vocab))
+    monkeypatch.setattr(model_service, "_tokenizer", BertTokenizerFast(vocab_file=str(vocab_file)))
+
+    texts = ["Unbelievable, GREAT!", "great unbelievable great"]
+    results = model_service.predict_batch(texts)
+
+    assert set(results[0]["attention_scores"]) == {"Unbelievable", ",", "GREAT", "!"}
+    assert set(results[1]["attention_scores"]) == {"great", "unbelievable"}
+    assert not any("##" in w or w in ("un", "bel") for r in results for w in r["highlighted_words"])
+
+    # Pooling matches a per-token max over each word's pieces
+    [(_, input_ids, _, alignment)] = model_service.encode_in_buckets(
+        model_service._tokenizer, texts, words=True
+    )
+    token_scores = torch.rand(input_ids.shape)
+    pooled = model_service.pool_word_scores(token_scores, alignment).tolist()
+    for row, words in enumerate(alignment.words):
+        for w in range(len(words)):
+            pieces = token_scores[row][alignment.word_index[row] == w]
+            assert pooled[row][w] == pytest.approx(pieces.max().item())
+
+
+@pytest.mark.anyio
+async def test_batcher_separates_explained_and_lean_requests(monkeypatch):
+    calls = []
+
+    def fake_predict_batch(texts, explain=True):
+        calls.append((list(texts), explain))
+        return [{"text": t, "explain": explain} for t in texts]
+
+    _patch_predict(monkeypatch, fake_predict_batch)
+    batcher = MicroBatcher(max_batch_size=8, max_wait_ms=50)
+
+    results = await asyncio.gather(
+        batcher.submit("a"), batcher.submit("b", explain=False), batcher.submit("c")
+    )
+    await batcher.close()
+
+    assert [r["explain"] for r in results] == [True, False, True]
+    assert calls == [(["a", "c"], True), (["b"], False)]
+
+
+@pytest.mark.anyio
+async def test_batcher_queue_is_bounded(monkeypatch):
+    import threading
+
+    release = threading.Event()
+
+    def blocking_predict_batch(texts, explain=True):
+        release.wait(5)
+        return [{"text": t} for t in texts]
+
+    _patch_predict(monkeypatch, blocking_predict_batch)
+    batcher = MicroBatcher(max_batch_size=1, max_wait_ms=0, max_concurrency=1, max_queue=2)
+
+    tasks = [asyncio.ensure_future(batcher.submit(str(i))) for i in range(6)]
+    await asyncio.sleep(0.1)
+    # One text is being predicted, two wait in the queue, the rest in submit()
+    assert batcher._queue.qsize() == 2
+    release.set()
+    results = await asyncio.gather(*tasks)
+    await batcher.close()
+    assert [r["text"] for r in results] == [str(i) for i in range(6)]
+
+
+def test_length_buckets_groups_similar_lengths():
+    lengths = [30, 5, 28, 6, 31, 4]
+    buckets = model_service.length_buckets(lengths, batch_size=3)
+    assert buckets == [[5, 1, 3], [2, 0, 4]]
+
+
+def test_encode_in_buckets_pads_each_bucket_to_its_longest(stub_model):
+    texts = ["oh great great great great great great great", "oh", "great", "oh great great great great great great"]
+    batches = list(model_service.encode_in_buckets(model_service._tokenizer, texts, batch_size=2))
+    assert [sorted(idx) for idx, _, _ in batches] == [[1, 2], [0, 3]]
+    assert [ids.shape[1] for _, ids, _ in batches] == [3, 10]
+
+
+@pytest.mark.anyio
+async def test_inference_runs_off_the_event_loop(monkeypatch):
+    def slow_predict_batch(texts, explain=True):
+        time.sleep(0.3)
+        return [{"text": t} for t in texts]
+
+    _patch_predict(monkeypatch, slow_predict_batch)
+    batcher = MicroBatcher(max_batch_size=4, max_wait_ms=1)
+
+    task = asyncio.ensure_future(batcher.submit("slow"))
+    await asyncio.sleep(0.05)
+    # The loop keeps serving other work while the forward pass runs
+    assert not task.done()
+    assert (await task)["text"] == "slow"
+    await batcher.close()
+
+
+# ── Prediction cache ──────────────────────────────────────
+def test_cache_serves_repeats_without_recomputing(monkeypatch):
+    calls = []
+
+    def fake_predict_uncached(texts, explain):
+        calls.append(list(texts))
+        return [{"text": t} for t in texts]
+
+    monkeypatch.setattr(model_service, "_predict_uncached", fake_predict_uncached)
+    monkeypatch.setattr(model_service, "_cache", PredictionCache(100, 60))
+
+    first = model_service.predict_batch(["Yeah right", "hello"])
+    second = model_service.predict_batch(["Yeah   right ", "YEAH RIGHT", "new", "new"])
+
+    assert calls == [["Yeah right", "hello"], ["YEAH RIGHT", "new"]]
+    assert second[0] == first[0]
+    assert model_service.get_cache_stats()["hits"] == 1
+
+
+@pytest.mark.anyio
+async def test_async_batches_use_the_callers_cache(monkeypatch):
+    dispatched = []
+
+    async def fake_run_inference(fn, texts, explain):
+        dispatched.append(list(texts))
+        return [{"text": t} for t in texts], {}
+
+    monkeypatch.setattr(model_service, "run_inference", fake_run_inference)
+    monkeypatch.setattr(model_service, "_cache", PredictionCache(100, 60))
+
+    await model_service.predict_batch_async(["a", "b"])
+    results = await model_service.predict_batch_async(["a", "c", "c"])
+
+    # Only misses reach the (possibly out-of-process) executor
+    assert dispatched == [["a", "b"], ["c"]]
+    assert [r["text"] for r in results] == ["a", "c", "c"]
+    assert model_service.get_cache_stats()["hits"] == 1
+
+
+def test_cache_evicts_least_recently_used():
+    cache = PredictionCache(max_entries=2, ttl_seconds=60)
+    cache.put("a", {"v": 1})
+    cache.put("b", {"v": 2})
+    cache.get("a")
+    cache.put("c", {"v": 3})
+
+    assert cache.get("b") is None
+    assert cache.get("a") == {"v": 1}
+    assert cache.stats()["evictions"] == 1
+
+
+def test_cache_returns_copies():
+    cache = PredictionCache(max_entries=2, ttl_seconds=60)
+    cache.put("a", {"words": ["x"]})
+    cache.get("a")["words"].append("y")
+    assert cache.get("a") == {"words": ["x"]}
+
+
+def test_sqlite_cache_is_shared_and_invalidated_on_model_change(tmp_path):
+    path = tmp_path / "cache.sqlite3"
+    writer = SqlitePredictionCache(path, max_bytes=1 << 20, ttl_seconds=60)
+    reader = SqlitePredictionCache(path, max_bytes=1 << 20, ttl_seconds=60)
+    writer.set_model_version("v1")
+    writer.put("k", {"prediction": "Sarcastic"})
+
+    assert reader.get("k") == {"prediction": "Sarcastic"}
+
+    reader.set_model_version("v2")
+    assert writer.get("k") is None
+
+
+def test_sqlite_cache_evicts_by_size(tmp_path):
+    cache = SqlitePredictionCache(tmp_path / "cache.sqlite3", max_bytes=2000, ttl_seconds=60)
+    for i in range(SqlitePredictionCache._EVICT_EVERY):
+        cache.put(f"k{i}", {"text": "x" * 100})
+
+    stats = cache.stats()
+    assert stats["size_bytes"] <= 2000
+    assert stats["evictions"] > 0
+    assert cache.get(f"k{SqlitePredictionCache._EVICT_EVERY - 1}") is not None
+
+
+def test_mock_predictions_are_deterministic():
+    text = "The meeting is at noon."
+    assert model_service._predict_mock(text) == model_service._predict_mock(text)
+
+
+# ── Checkpoints ───────────────────────────────────────────
+def _tiny_classifier():
+    from transformers import BertConfig
+
+    config = BertConfig(
+        vocab_size=32, hidden_size=16, num_hidden_layers=1,
+        num_attention_heads=2, intermediate_size=32,
+    )
+    torch.manual_seed(0)
+    return model_service.BertSarcasmClassifier(2, config=config).eval()
+
+
+# ── Explanation methods ───────────────────────────────────
+def test_attention_rollout_multiplies_residual_mixed_layers():
+    torch.manual_seed(0)
+    layers = [torch.softmax(torch.randn(2, 3, 4, 4), dim=-1) for _ in range(2)]
+    rollout = model_service.attention_rollout(layers)
+
+    eye = torch.eye(4)
+    first, second = (0.5 * a.mean(dim=1) + 0.5 * eye for a in layers)
+    assert torch.allclose(rollout, second @ first, atol=1e-6)
+    assert torch.allclose(rollout.sum(dim=-1), torch.ones(2, 4), atol=1e-6)
+
+
+def test_gradient_x_input_is_batched_per_row(stub_model, monkeypatch):
+    model = _tiny_classifier()
+    monkeypatch.setattr(model_service, "_model", model)
+    monkeypatch.setattr(model_service, "INFERENCE_ENGINE", "fp32")
+    monkeypatch.setattr(model_service, "EXPLANATION_METHOD", "gradient")
+
+    texts = ["oh great monday !", "i love traffic"]
+    [(_, input_ids, attention_mask)] = model_service.encode_in_buckets(
+        model_service._tokenizer, texts, bucketing=False
+    )
+    _, batched = model_service.gradient_x_input(model, input_ids, attention_mask)
+    assert torch.allclose(batched.sum(dim=1), torch.ones(2))
+    assert batched[1][attention_mask[1] == 0].sum() == 0
+    for row in range(2):
+        length = int(attention_mask[row].sum())
+        _, alone = model_service.gradient_x_input(
+            model, input_ids[row:row + 1, :length], attention_mask[row:row + 1, :length]
+        )
+        assert torch.allclose(batched[row, :length], alone[0], atol=1e-4)
+
+    results = model_service.predict_batch(texts)
+    assert set(results[1]["attention_scores"]) == {"i", "love", "traffic"}
+
+
+def test_gradient_method_falls_back_to_rollout_without_autograd(monkeypatch):
+    monkeypatch.setattr(model_service, "EXPLANATION_METHOD", "gradient")
+    monkeypatch.setattr(model_service, "INFERENCE_ENGINE", "int8")
+    assert model_service._explanation_method(_tiny_classifier()) == "rollout"
+
+
+@pytest.mark.parametrize("method", ["rollout", "gradient"])
+def test_onnx_models_fall_back_to_last_layer_attention(monkeypatch, method):
+    monkeypatch.setattr(model_service, "EXPLANATION_METHOD", method)
+    monkeypatch.setattr(model_service, "INFERENCE_ENGINE", "onnx")
+    onnx_model = object.__new__(model_service.OnnxSarcasmClassifier)
+    assert model_service._explanation_method(onnx_model) == "attention"
+
+
+def test_from_checkpoint_builds_from_config_without_pretrained_weights(tmp_path):
+    model = _tiny_classifier()
+    path = tmp_path / "model.safetensors"
+    model_service.save_checkpoint(model, path)
+
+    loaded = model_service.BertSarcasmClassifier.from_checkpoint(path, num_labels=2)
+
+    assert not any(p.is_meta for p in loaded.parameters())
+    input_ids = torch.tensor([[2, 5, 6, 3]])
+    mask = torch.ones_like(input_ids)
+    with torch.no_grad():
+        assert torch.allclose(model(input_ids, mask)[0], loaded(input_ids, mask)[0])
+
+
+def test_shm_sharing_hands_workers_the_parent_model(monkeypatch):
+    model = _tiny_classifier()
+    monkeypatch.setattr(model_service, "_model", model)
+    monkeypatch.setattr(model_service, "_tokenizer", object())
+    monkeypatch.setattr(model_service, "_is_mock", False)
+    monkeypatch.setattr(model_service, "_model_version", "fp32-test")
+    monkeypatch.setattr(model_service, "WEIGHT_SHARING", "shm")
+    monkeypatch.setattr(model_service, "INFERENCE_ENGINE", "fp32")
+
+    state = model_service._shared_state()
+    assert all(p.is_shared() for p in model.parameters())
+
+    monkeypatch.setattr(model_service, "_model", None)
+    monkeypatch.setattr(model_service, "_is_mock", True)
+    monkeypatch.setattr(model_service, "WARMUP_ENABLED", False)
+    model_service._init_process_worker(1, state)
+    assert model_service._model is model
+    assert model_service.get_model_version() == "fp32-test"
+
+
+def test_mmap_sharing_lets_workers_load_their_own_mapping(monkeypatch):
+    monkeypatch.setattr(model_service, "WEIGHT_SHARING", "mmap")
+    assert model_service._shared_state() is None
+
+
+@pytest.mark.parametrize("setting", ["INFERENCE_EXECUTOR", "WEIGHT_SHARING"])
+def test_unknown_executor_settings_are_rejected(setting, monkeypatch):
+    monkeypatch.setattr(model_service, setting, "bogus")
+    with pytest.raises(ValueError, match=setting):
+        model_service.load_model()
+
+
+def test_every_process_worker_warms_up_before_ready(stub_model, monkeypatch):
+    monkeypatch.setattr(model_service, "WEIGHT_SHARING", "shm")
+    monkeypatch.setattr(model_service, "_model", _tiny_classifier())
+    pool = model_service._InferencePool(2, (1, model_service._shared_state(), None, None))
+    try:
+        pool.wait_ready()
+        assert pool.ready.value == 2
+    finally:
+        pool.shutdown()
+
+
+# ── Heuristic rule engine ─────────────────────────────────
+def test_compiled_rules_match_the_reference_scorer():
+    import random
+    import re
+
+    from model.bench_heuristics import SAMPLE_SENTENCES, make_texts, naive_score_cues
+
+    rules = model_service._rules
+    sources = [p for p, _, _ in rules.patterns]
+    sources += list(rules.lexicons["markers"]) + list(rules.known_phrases)
+    vocab = sorted({w for src in sources for w in re.findall(r"[a-z']+", src)})
+    separators = [" ", " ", "  ", ", ", "\n", "'", "!", "..."]
+    rng = random.Random(0)
+    texts = SAMPLE_SENTENCES + make_texts(20, 1000)
+    for _ in range(2000):
+        texts.append("".join(
+            rng.choice(vocab) + rng.choice(separators) for _ in range(rng.randint(0, 12))
+        ))
+
+    for text in texts:
+        assert model_service._score_cues(text) == naive_score_cues(text), text
+
+
+def test_multi_word_markers_and_known_phrases_match_whole_words():
+    cues, _, reasons = model_service._score_cues("Yeah right, of course it works")
+    assert "of course" in cues
+    assert any("of course" in r for r in reasons)
+
+    _, _, reasons = model_service._score_cues("The piano rush hour")
+    assert not any("known sarcastic phrase" in r for r in reasons)
+
+
+def test_batch_cues_match_the_per_text_scorer():
+    import pandas as pd
+
+    from model.bench_heuristics import SAMPLE_SENTENCES, make_texts
+
+    texts = SAMPLE_SENTENCES + make_texts(50, 200) + [
+        "", "   ", "ALL CAPS HERE!", "Oh GREAT... could it be?", "a 'nice' \"day\"",
+    ]
+    texts = pd.Series(texts * 2, index=range(100, 100 + 2 * len(texts)))
+    frame = model_service.detect_sarcasm_cues_batch(texts)
+
+    assert list(frame.index) == list(texts.index)
+    for text, row in zip(texts, frame.itertuples()):
+        expected = model_service._detect_sarcasm_cues(text)
+        assert (row.cues, row.score, row.explanation) == expected, text
+        assert row.raw_score == model_service.heuristic_score(text)
+
+
+def test_batch_cues_score_missing_values_as_empty_text():
+    import numpy as np
+
+    frame = model_service.detect_sarcasm_cues_batch(["x", None, "OH GREAT", np.nan])
+    empty = model_service._detect_sarcasm_cues("")
+
+    for i in (1, 3):
+        assert (frame.cues[i], frame.score[i], frame.explanation[i]) == empty
+    assert frame.cues[2] == model_service._detect_sarcasm_cues("OH GREAT")[0]
+
+
+def test_reload_rules_swaps_the_pack_and_invalidates_cached_predictions(tmp_path, monkeypatch):
+    import json
+
+    from backend.config import RULES_PATH
+
+    monkeypatch.setattr(model_service, "_rules", model_service._rules)
+    monkeypatch.setattr(model_service, "_cache", PredictionCache(100, 0))
+    text = "What a lovely morning"
+    before = model_service.predict(text)
+
+    pack = json.loads(RULES_PATH.read_text())
+    pack["known_phrases"].append("what a lovely morning")
+    path = tmp_path / "custom.json"
+    path.write_text(json.dumps(pack))
+    info = model_service.reload_rules(path)
+
+    assert info["source"] == str(path)
+    assert not model_service.rules_file_changed()
+    after = model_service.predict(text)
+    assert after["explanation"] != before["explanation"]
+    assert "known sarcastic phrase" in after["explanation"]
+
+    path.write_text(json.dumps({**pack, "patterns": [{"pattern": "(", "weight": 1, "reason": ""}]}))
+    with pytest.raises(ValueError):
+        model_service.reload_rules(path)
+    assert model_service.get_rules_info()["version"] == info["version"]
+    assert model_service.rules_file_changed()
+
+
+def test_rules_reload_warms_new_process_workers_before_the_swap(tmp_path, monkeypatch):
+    from concurrent.futures import ThreadPoolExecutor
+
+    old_pool = ThreadPoolExecutor(1)
+    created, warmed = [], []
+
+    class FakePool(ThreadPoolExecutor):
+        def wait_ready(self):
+            warmed.append(model_service._executor is old_pool)
+
+    def fake_create_executor(shared_state, model_path, rules_path):
+        created.append(rules_path)
+        return FakePool(1)
+
+    monkeypatch.setattr(model_service, "_rules", model_service._rules)
+    monkeypatch.setattr(model_service, "INFERENCE_EXECUTOR", "process")
+    monkeypatch.setattr(model_service, "_executor", old_pool)
+    monkeypatch.setattr(model_service, "_create_executor", fake_create_executor)
+
+    info = model_service.reload_rules()
+
+    assert created == [info["source"]]
+    assert warmed == [True]  # every worker was warm while the old pool served
+    assert model_service._executor is not old_pool
+    model_service._executor.shutdown()
+
+
+# ── Heuristic cascade ─────────────────────────────────────
+@pytest.fixture
+def cascade(stub_model, monkeypatch):
+    monkeypatch.setattr(model_service, "CASCADE_ENABLED", True)
+    monkeypatch.setattr(model_service, "CASCADE_HIGH", 0.9)
+    monkeypatch.setattr(model_service, "CASCADE_LOW", 0.0)
+    monkeypatch.setattr(model_service, "CASCADE_HIGH_PRECISION", 0.96)
+    monkeypatch.setattr(model_service, "CASCADE_LOW_PRECISION", 0.9)
+    monkeypatch.setattr(
+        model_service, "_cascade_counts", {"total": 0, "sarcastic": 0, "not_sarcastic": 0}
+    )
+    return stub_model
+
+
+def test_cascade_skips_the_model_on_confident_heuristics(cascade):
+    obvious = "Oh great, I just love being stuck in traffic. Thanks for nothing!"
+    plain = "The meeting is at noon"
+    uncertain = "Oh great, Monday!"
+    assert model_service.heuristic_score(obvious) >= 0.9
+    assert model_service.heuristic_score(plain) == 0.0
+
+    results = model_service.predict_batch([obvious, plain, uncertain])
+
+    assert len(cascade.calls) == 1
+    assert cascade.calls[0][0] == 1  # only the uncertain text reached the model
+    assert results[0]["prediction"] == "Sarcastic"
+    assert results[0]["confidence"] == 0.96
+    assert results[0]["attention_scores"] is None
+    assert results[1]["prediction"] == "Not Sarcastic"
+    assert results[1]["confidence"] == 0.9
+    assert results[2]["attention_scores"]
+    stats = model_service.get_cascade_stats()
+    assert stats["total"] == 3
+    assert stats["short_circuited"] == 2
+    assert stats["short_circuit_rate"] == pytest.approx(2 / 3, abs=1e-4)
+
+
+def test_cascade_scores_uncertain_texts_with_the_rules_once(cascade, monkeypatch):
+    calls = []
+    score_cues = model_service._score_cues
+
+    def counting_score_cues(text, structure=None):
+        calls.append(text)
+        return score_cues(text, structure)
+
+    monkeypatch.setattr(model_service, "_score_cues", counting_score_cues)
+    result = model_service.predict("Oh great, Monday!")
+
+    assert calls == ["Oh great, Monday!"]
+    assert result["explanation"] == model_service._detect_sarcasm_cues("Oh great, Monday!")[2]
+
+
+def test_cascade_label_only_results(cascade):
+    result = model_service.predict("The meeting is at noon", explain=False)
+    assert result["prediction"] == "Not Sarcastic"
+    assert result["highlighted_words"] == []
+    assert cascade.calls == []
+
+
+@pytest.mark.anyio
+async def test_process_workers_report_cascade_and_cache_stats(stub_model, monkeypatch):
+    # Spawned workers read the cascade settings from the environment
+    monkeypatch.setenv("CASCADE_ENABLED", "true")
+    monkeypatch.setenv("CASCADE_HIGH", "0.9")
+    monkeypatch.setenv("CASCADE_LOW", "0.0")
+    monkeypatch.setattr(model_service, "INFERENCE_EXECUTOR", "process")
+    monkeypatch.setattr(model_service, "INFERENCE_WORKERS", 1)
+    monkeypatch.setattr(model_service, "WEIGHT_SHARING", "shm")
+    monkeypatch.setattr(model_service, "_model", _tiny_classifier())
+    monkeypatch.setattr(model_service, "_executor", None)
+    monkeypatch.setattr(model_service, "_cache", PredictionCache(100, 60))
+    monkeypatch.setattr(
+        model_service, "_cascade_counts", {"total": 0, "sarcastic": 0, "not_sarcastic": 0}
+    )
+    texts = [
+        "Oh great, I just love being stuck in traffic. Thanks for nothing!",
+        "The meeting is at noon",
+        "Oh great, Monday!",
+    ]
+    try:
+        await model_service.predict_batch_async(texts)
+        await model_service.predict_batch_async(texts)
+    finally:
+        model_service.shutdown_executor()
+
+    stats = model_service.get_cascade_stats()
+    assert (stats["total"], stats["short_circuited"]) == (3, 2)
+    assert model_service.get_cache_stats()["hits"] == 3
+
+
+# ── Warm-up ───────────────────────────────────────────────
+def test_warm_up_covers_every_configured_shape(stub_model, monkeypatch):
+    monkeypatch.setattr(model_service, "WARMUP_SEQ_LENGTHS", [8, 32])
+    monkeypatch.setattr(model_service, "WARMUP_BATCH_SIZES", [1, 4])
+
+    assert model_service.warm_up() == 8
+    shapes = set(stub_model.calls)
+    assert shapes == {(1, 8), (4, 8), (1, 32), (4, 32)}
+
+
+# ── Hot-swap ──────────────────────────────────────────────
+@pytest.fixture
+def swappable(stub_model, tmp_path, monkeypatch):
+    monkeypatch.setattr(model_service, "INFERENCE_ENGINE", "fp32")
+    monkeypatch.setattr(model_service, "_model_path", None)
+    monkeypatch.setattr(model_service, "_model_mtime", None)
+    monkeypatch.setattr(model_service, "_registry", [])
+    path = tmp_path / "model.safetensors"
+    model_service.save_checkpoint(_tiny_classifier(), path)
+    return path
+
+
+def test_reload_swaps_in_a_new_checkpoint(swappable):
+    before = model_service.predict_batch(["Oh great, Monday!"])
+
+    info = model_service.reload_model(swappable)
+
+    assert isinstance(model_service._model, model_service.BertSarcasmClassifier)
+    assert info["version"].startswith("fp32-")
+    assert info["version"] == model_service.get_model_version()
+    assert [h["version"] for h in info["history"]] == [info["version"]]
+    after = model_service.predict_batch(["Oh great, Monday!"])
+    assert after[0]["confidence"] != before[0]["confidence"]
+    assert not model_service.model_file_changed()
+
+
+def test_reload_keeps_serving_the_old_model_on_failure(swappable, tmp_path):
+    from safetensors import SafetensorError
+
+    old = model_service._model
+    swappable.write_bytes(b"not a checkpoint")
+
+    with pytest.raises(SafetensorError):
+        model_service.reload_model(swappable)
+    with pytest.raises(FileNotFoundError):
+        model_service.reload_model(tmp_path / "missing.safetensors")
+
+    assert model_service._model is old
+    assert model_service.get_model_version() == "stub"
+
+
+def test_concurrent_reloads_are_rejected(swappable):
+    with model_service._reload_lock, pytest.raises(model_service.ReloadInProgress):
+        model_service.reload_model(swappable)
+
+
+def test_model_file_changed_detects_replaced_checkpoint(swappable):
+    model_service.reload_model(swappable)
+    mtime = swappable.stat().st_mtime
+    model_service.save_checkpoint(_tiny_classifier(), swappable)
+    os.utime(swappable, (mtime + 5, mtime + 5))
+
+    assert model_service.model_file_changed()
+
+
+# ── INT8 engine ───────────────────────────────────────────
+def test_quantize_model_replaces_linear_layers():
+    model = torch.nn.Sequential(torch.nn.Linear(8, 8), torch.nn.ReLU(), torch.nn.Linear(8, 2))
+    qmodel = model_service.quantize_model(model)
+
+    assert not any(type(m) is torch.nn.Linear for m in qmodel.modules())
+    x = torch.randn(4, 8)
+    assert torch.allclose(model(x), qmodel(x), atol=0.1)
+
+
+def test_int8_artifact_from_another_checkpoint_is_rebuilt(tmp_path, monkeypatch):
+    model_path, other_path = tmp_path / "model.safetensors", tmp_path / "other.safetensors"
+    artifact = tmp_path / "model.int8.pt"
+    model = _tiny_classifier()
+    model_service.save_checkpoint(model, model_path)
+    with torch.no_grad():
+        model.classifier.weight.add_(1.0)
+    model_service.save_checkpoint(model, other_path)
+    monkeypatch.setattr(model_service, "MODEL_PATH", model_path)
+    monkeypatch.setattr(model_service, "QUANTIZED_MODEL_PATH", artifact)
+
+    model_service.save_quantized(
+        model_service.quantize_model(_tiny_classifier()), artifact, other_path
+    )
+    assert model_service.load_quantized(artifact, model_path) is None
+
+    model_service._load_int8(model_path)
+    assert model_service.load_quantized(artifact, model_path) is not None
+
+
+def test_load_quantized_matches_the_quantized_model(tmp_path):
+    model_path, artifact = tmp_path / "model.safetensors", tmp_path / "model.int8.pt"
+    model = _tiny_classifier()
+    model_service.save_checkpoint(model, model_path)
+    qmodel = model_service.quantize_model(model)
+    model_service.save_quantized(qmodel, artifact, model_path)
+
+    loaded = model_service.load_quantized(artifact, model_path)
+
+    assert not any(p.is_meta for p in loaded.parameters())
+    ids = torch.randint(0, 32, (2, 8))
+    mask = torch.ones_like(ids)
+    assert torch.equal(loaded(ids, mask)[0], qmodel(ids, mask)[0])
+
+
+# ── ONNX Runtime engine ───────────────────────────────────
+def test_onnx_engine_matches_torch(stub_model, tmp_path):
+    pytest.importorskip("onnxruntime")
+    from model.export_onnx import export
+
+    texts = ["Oh great, Monday!", "I love traffic"]
+    expected = model_service.predict_batch(texts)
+
+    export(stub_model, tmp_path / "model.onnx")
+    model_service._model = model_service.OnnxSarcasmClassifier(tmp_path / "model.onnx")
+    results = model_service.predict_batch(texts)
+
+    for r, e in zip(results, expected):
+        assert r["prediction"] == e["prediction"]
+        assert r["confidence"] == pytest.approx(e["confidence"], abs=1e-3)
+        assert r["highlighted_words"] == e["highlighted_words"]
@@ -0,0 +1,65 @@
+"""Unit tests for the Aho–Corasick phrase matcher."""
+
+import random
+import re
+
+from backend.services.phrase_matcher import PhraseMatcher
+
+
+def _brute_force(phrases, text):
+    hits = set()
+    for phrase in phrases:
+        # Lookahead so overlapping occurrences are all reported
+        for m in re.finditer(r"(?<!\w)(?=(" + re.escape(phrase) + r")(?!\w))", text):
+            hits.add((m.start(1), m.end(1), phrase))
+    return sorted(hits)
+
+
+def test_finds_overlapping_phrases_with_positions():
+    matcher = PhraseMatcher([
+        ("of course", "marker"),
+        ("course", "noun"),
+        ("yeah right", "marker"),
+        ("right", "negative"),
+    ])
+    hits = matcher.find("yeah right, of course")
+
+    assert [(h.phrase, h.start, h.end) for h in hits] == [
+        ("yeah right", 0, 10),
+        ("right", 5, 10),
+        ("of course", 12, 21),
+        ("course", 15, 21),
+    ]
+    assert hits[2].labels == ("marker",)
+    assert (hits[2].first_token, hits[2].last_token) == (2, 3)
+
+
+def test_matches_respect_word_boundaries_and_separators():
+    matcher = PhraseMatcher([("no rush", "known"), ("i'm shocked", "known")])
+
+    assert matcher.find("piano rush, no rushing") == []
+    assert matcher.find("no  rush") == []
+    assert [h.phrase for h in matcher.find("i'm shocked")] == ["i'm shocked"]
+    assert matcher.find("i m shocked") == []
+
+
+def test_labels_are_merged_and_filterable():
+    matcher = PhraseMatcher([("wow", "positive"), ("wow", "marker"), ("bad", "negative")])
+    hits = matcher.find("wow, bad")
+
+    assert hits[0].labels == ("positive", "marker")
+    assert [h.phrase for h in matcher.find_tokens(
+        "wow, bad", ["wow", "bad"], [(0, 3), (5, 8)], labels=["negative"]
+    )] == ["bad"]
+
+
+def test_agrees_with_brute_force_on_thousands_of_phrases():
+    rng = random.Random(0)
+    vocab = [f"w{i}" for i in range(60)]
+    phrases = {" ".join(rng.choices(vocab, k=rng.randint(1, 4))) for _ in range(3000)}
+    matcher = PhraseMatcher((p, "rule") for p in phrases).compile()
+
+    for _ in range(10):
+        text = " ".join(rng.choices(vocab, k=200))
+        found = sorted((h.start, h.end, h.phrase) for h in matcher.find(text))
+        assert found == _brute_force(phrases, text)
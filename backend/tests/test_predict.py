@@ -1,5 +1,7 @@
 """Unit tests for the backend API endpoints."""
 
+import json
+
 import pytest
 from httpx import ASGITransport, AsyncClient
 
@@ -26,9 +28,80 @@ async def test_health(client):
     data = resp.json()
     assert data["status"] == "ok"
     assert "model_loaded" in data
+    assert data["model_version"] == "mock"
     assert "device" in data
 
 
+@pytest.mark.anyio
+async def test_ready_only_after_warm_up(client, monkeypatch):
+    from backend.services import model_service
+
+    monkeypatch.setattr(model_service, "_ready", False)
+    resp = await client.get("/api/ready")
+    assert resp.status_code == 503
+    assert resp.json()["ready"] is False
+
+    await model_service.warm_up_workers()
+    resp = await client.get("/api/ready")
+    assert resp.status_code == 200
+    assert resp.json()["ready"] is True
+
+
+@pytest.mark.anyio
+async def test_cascade_stats(client):
+    resp = await client.get("/api/stats/cascade")
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["enabled"] is False
+    assert 0.0 <= data["short_circuit_rate"] <= 1.0
+
+
+# ── Admin ─────────────────────────────────────────────────
+@pytest.mark.anyio
+async def test_admin_api_disabled_without_token(client):
+    resp = await client.post("/api/admin/reload")
+    assert resp.status_code == 403
+
+
+@pytest.mark.anyio
+async def test_admin_reload_requires_matching_token(client, monkeypatch):
+    from backend.api import admin
+
+    monkeypatch.setattr(admin, "ADMIN_TOKEN", "secret")
+    resp = await client.post("/api/admin/reload", headers={"X-Admin-Token": "wrong"})
+    assert resp.status_code == 401
+
+    resp = await client.post(
+        "/api/admin/reload",
+        json={"path": "/nonexistent/model.safetensors"},
+        headers={"X-Admin-Token": "secret"},
+    )
+    assert resp.status_code == 404
+
+    resp = await client.get("/api/admin/model", headers={"X-Admin-Token": "secret"})
+    assert resp.status_code == 200
+    assert resp.json()["version"] == "mock"
+
+
+@pytest.mark.anyio
+async def test_admin_rules_reload(client, monkeypatch, tmp_path):
+    from backend.api import admin
+    from backend.services import model_service
+
+    monkeypatch.setattr(admin, "ADMIN_TOKEN", "secret")
+    monkeypatch.setattr(model_service, "_rules", model_service._rules)
+    headers = {"X-Admin-Token": "secret"}
+
+    resp = await client.post("/api/admin/rules/reload", headers=headers)
+    assert resp.status_code == 200
+    assert resp.json()["name"] == "default"
+
+    bad = tmp_path / "bad.json"
+    bad.write_text("{not json")
+    resp = await client.post("/api/admin/rules/reload", json={"path": str(bad)}, headers=headers)
+    assert resp.status_code == 422
+
+
 # ── Single predict ────────────────────────────────────────
 @pytest.mark.anyio
 async def test_predict_success(client):
@@ -41,6 +114,18 @@ async def test_predict_success(client):
     assert isinstance(data["explanation"], str)
 
 
+@pytest.mark.anyio
+async def test_predict_without_explanation(client):
+    resp = await client.post(
+        "/api/predict", json={"text": "Oh great, another Monday!", "explain": False}
+    )
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["prediction"] in ("Sarcastic", "Not Sarcastic")
+    assert data["highlighted_words"] == []
+    assert data["attention_scores"] is None
+
+
 @pytest.mark.anyio
 async def test_predict_empty_text(client):
     resp = await client.post("/api/predict", json={"text": ""})
@@ -59,6 +144,156 @@ async def test_predict_too_long(client):
     assert resp.status_code == 422
 
 
+@pytest.mark.anyio
+async def test_stream_predict_returns_ndjson(client):
+    body = '"I love Mondays"\n{"text": "Oh great, another Monday!", "id": "m-1"}\n{"text": ""}\n'
+    resp = await client.post("/api/predict/stream?explain=false", content=body)
+    assert resp.status_code == 200
+    assert resp.headers["content-type"] == "application/x-ndjson"
+    rows = [json.loads(line) for line in resp.text.splitlines()]
+    assert [r["index"] for r in rows] == [0, 1, 2]
+    assert rows[0]["prediction"] in ("Sarcastic", "Not Sarcastic")
+    assert rows[1]["id"] == "m-1"
+    assert "error" in rows[2]
+
+
+@pytest.mark.anyio
+async def test_bulk_job_upload_progress_and_download(client, monkeypatch, tmp_path):
+    import asyncio
+
+    from backend.services import bulk_jobs
+
+    monkeypatch.setattr(bulk_jobs, "JOBS_DIR", tmp_path)
+    csv_body = "id,text\n1,I love Mondays\n2,\"Oh great, another Monday!\"\n"
+    resp = await client.post("/api/jobs", files={"file": ("texts.csv", csv_body, "text/csv")})
+    assert resp.status_code == 202
+    job = resp.json()
+    assert job["status"] == "queued"
+
+    for _ in range(200):
+        job = (await client.get(f"/api/jobs/{job['id']}")).json()
+        if job["status"] == "done":
+            break
+        await asyncio.sleep(0.01)
+    assert job["rows_done"] == 2
+    resp = await client.get(job["results_url"])
+    assert resp.status_code == 200
+    rows = [json.loads(line) for line in resp.text.splitlines()]
+    assert [r["id"] for r in rows] == ["1", "2"]
+
+    resp = await client.post("/api/jobs", files={"file": ("texts.txt", "hi", "text/plain")})
+    assert resp.status_code == 422
+    assert (await client.get("/api/jobs/not-a-job")).status_code == 404
+    await bulk_jobs.close_jobs()
+
+
+@pytest.mark.anyio
+async def test_bulk_job_upload_limit(client, monkeypatch, tmp_path):
+    import io
+
+    from fastapi import UploadFile
+
+    from backend.api import jobs
+    from backend.services import bulk_jobs
+
+    monkeypatch.setattr(bulk_jobs, "JOBS_DIR", tmp_path)
+    monkeypatch.setattr(jobs, "JOB_MAX_UPLOAD_MB", 1 / 1024)  # 1 KiB
+    body = '"hello"\n' * 200
+    resp = await client.post("/api/jobs", files={"file": ("t.jsonl", body, "text/plain")})
+    assert resp.status_code == 413
+    assert list(tmp_path.iterdir()) == []
+
+    # Uploads of unknown size are cut off while copying
+    upload = UploadFile(io.BytesIO(body.encode()))
+    assert upload.size is None
+    assert not jobs._spool(upload, tmp_path / "input.jsonl", 1024)
+    assert (tmp_path / "input.jsonl").stat().st_size <= 1024
+
+
+def test_websocket_replies_are_tagged_with_message_ids():
+    from starlette.testclient import TestClient
+
+    with TestClient(app).websocket_connect("/ws/predict?explain=false") as ws:
+        ws.send_text(json.dumps({"text": "Oh great, another Monday!", "id": "a"}))
+        ws.send_text(json.dumps({"text": "", "id": "bad"}))
+        ws.send_text(json.dumps({"text": 3, "id": "typed"}))
+        ws.send_text('"I love Mondays"')
+        replies = {r["id"]: r for r in (ws.receive_json() for _ in range(4))}
+
+    assert replies["a"]["prediction"] in ("Sarcastic", "Not Sarcastic")
+    assert replies["a"]["attention_scores"] is None
+    assert "error" in replies["bad"]
+    assert "error" in replies["typed"]
+    assert "prediction" in replies[None]
+
+
+def test_websocket_limits_messages_in_flight(monkeypatch):
+    import asyncio
+
+    from starlette.testclient import TestClient
+
+    from backend import main
+
+    in_flight, peak = 0, 0
+
+    async def slow_predict(text, explain=True):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.02)
+        in_flight -= 1
+        return {"prediction": "Sarcastic", "text": text}
+
+    monkeypatch.setattr(main, "predict_async", slow_predict)
+    monkeypatch.setattr(main, "WS_MAX_IN_FLIGHT", 2)
+    with TestClient(app).websocket_connect("/ws/predict") as ws:
+        for i in range(6):
+            ws.send_text(json.dumps({"text": f"message {i}", "id": i}))
+        replies = [ws.receive_json() for _ in range(6)]
+
+    assert sorted(r["id"] for r in replies) == list(range(6))
+    assert peak == 2
+
+
+@pytest.mark.anyio
+async def test_predict_queues_shap_and_caches_it(client, monkeypatch):
+    import asyncio
+
+    from backend.api import predict
+    from backend.services import explanation_jobs
+
+    calls = []
+
+    def fake_shap(text):
+        calls.append(text)
+        return {"great": 0.5}
+
+    queue = explanation_jobs.ExplanationQueue(workers=1, max_queued=4)
+    monkeypatch.setattr(explanation_jobs, "_explanations", queue)
+    monkeypatch.setitem(explanation_jobs.EXPLAINERS, "shap", fake_shap)
+    monkeypatch.setattr(predict, "SHAP_ENABLED", True)
+    monkeypatch.setattr(predict, "is_model_loaded", lambda: True)
+
+    data = (await client.post("/api/predict", json={"text": "Oh great, Monday!"})).json()
+    job_id = data["explanation_job_id"]
+    assert job_id
+    for _ in range(100):
+        job = (await client.get(f"/api/explanations/{job_id}")).json()
+        if job["status"] == "done":
+            break
+        await asyncio.sleep(0.01)
+    assert job["result"] == {"great": 0.5}
+
+    # A repeated text is answered from the cache, inline
+    data = (await client.post("/api/predict", json={"text": "Oh great, Monday!"})).json()
+    assert data["attention_scores"]["_shap"] == {"great": 0.5}
+    assert calls == ["Oh great, Monday!"]
+
+    resp = await client.get("/api/explanations/nope")
+    assert resp.status_code == 404
+    await queue.close()
+
+
 # ── Batch predict ─────────────────────────────────────────
 @pytest.mark.anyio
 async def test_batch_predict_success(client):
@@ -88,3 +323,17 @@ async def test_stats(client):
     assert "accuracy" in data
     assert "f1_score" in data
     assert "confusion_matrix" in data
+
+
+@pytest.mark.anyio
+async def test_cache_stats(client):
+    text = "Cache me if you can!"
+    await client.post("/api/predict", json={"text": text})
+    await client.post("/api/predict", json={"text": text})
+
+    resp = await client.get("/api/stats/cache")
+    assert resp.status_code == 200
+    data = resp.json()
+    if data["enabled"]:
+        assert data["hits"] >= 1
+        assert data["entries"] >= 1
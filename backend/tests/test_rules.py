@@ -0,0 +1,82 @@
+"""Unit tests for heuristic rule packs."""
+
+import json
+
+import pytest
+
+from backend.config import RULES_PATH
+from backend.services import rules
+
+
+def test_token_matcher_mirrors_greedy_regex_spans():
+    rule = rules.compile_rule(r"\boh\b.*\b(great|love)\b", 0.4, "")
+    tokens = rules.tokenize("well oh no, oh great, i love it")
+    assert rules.rule_cues(rule, tokens) == ["oh", "no", "oh", "great", "i", "love"]
+    assert rule.regex.search(tokens.lower).group() == "oh no, oh great, i love"
+
+    tokens = rules.tokenize("great oh")
+    assert rules.rule_cues(rule, tokens) is None
+
+
+def test_default_pack_compiles():
+    pack = rules.load_rule_pack(RULES_PATH, cache_dir=None)
+    assert pack.name == "default"
+    assert len(pack.rules) == len(pack.patterns) > 0
+    assert "of course" in pack.lexicons["markers"]
+    assert pack.known_rank[pack.known_phrases[0]] == 0
+
+
+def test_compiled_pack_is_cached_by_content_hash(tmp_path, monkeypatch):
+    cache_dir = tmp_path / "cache"
+    path = tmp_path / "pack.json"
+    path.write_text(RULES_PATH.read_text())
+
+    first = rules.load_rule_pack(path, cache_dir)
+    assert len(list(cache_dir.glob("*.pickle"))) == 1
+
+    def fail(*args, **kwargs):
+        raise AssertionError("recompiled an unchanged pack")
+
+    monkeypatch.setattr(rules, "compile_rule_pack", fail)
+    second = rules.load_rule_pack(path, cache_dir)
+    assert second.version == first.version
+    assert second.patterns == first.patterns
+
+    monkeypatch.undo()
+    path.write_text(json.dumps({"known_phrases": ["as if"]}))
+    third = rules.load_rule_pack(path, cache_dir)
+    assert third.version != first.version
+    assert len(list(cache_dir.glob("*.pickle"))) == 2
+
+
+def test_yaml_packs(tmp_path):
+    pytest.importorskip("yaml")
+    path = tmp_path / "pack.yaml"
+    path.write_text(
+        "name: tiny\n"
+        "lexicons:\n  markers: [sure]\n"
+        "patterns:\n  - {pattern: '\\bsure\\b', weight: 0.25, reason: mock agreement}\n"
+    )
+    pack = rules.load_rule_pack(path, cache_dir=None)
+    assert pack.name == "tiny"
+    assert pack.patterns == ((r"\bsure\b", 0.25, "mock agreement"),)
+
+
+@pytest.mark.parametrize("pack, message", [
+    ({"lexicons": {"sentiment": []}}, "Unknown lexicons"),
+    ({"patterns": [{"pattern": "(", "weight": 1, "reason": ""}]}, "Invalid regex"),
+    ({"patterns": [{"pattern": "x"}]}, "Invalid pattern"),
+])
+def test_invalid_packs_are_rejected(pack, message):
+    with pytest.raises(ValueError, match=message):
+        rules.compile_rule_pack(pack)
+
+
+def test_non_mapping_packs_are_rejected(tmp_path):
+    with pytest.raises(TypeError, match="mapping"):
+        rules.compile_rule_pack(["not", "a", "pack"])
+
+    path = tmp_path / "pack.json"
+    path.write_text("[1, 2]")
+    with pytest.raises(ValueError, match="mapping"):
+        rules.load_rule_pack(path, cache_dir=None)
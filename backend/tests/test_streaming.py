@@ -0,0 +1,59 @@
+"""Unit tests for streaming NDJSON prediction."""
+
+import asyncio
+import json
+
+import pytest
+
+from backend.services import streaming
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+async def _chunks(*parts):
+    for part in parts:
+        yield part
+
+
+@pytest.mark.anyio
+async def test_iter_lines_splits_across_chunks_and_drops_long_lines():
+    chunks = _chunks(b'"a"\n"b', b'"\n' + b"x" * 5, b"x" * 20, b'xx\n"c"\n', b'"d"')
+    lines = [line async for line in streaming.iter_lines(chunks, max_line_bytes=10)]
+
+    assert lines[:2] == [b'"a"', b'"b"']
+    assert isinstance(lines[2], streaming.LineTooLong)
+    assert lines[3:] == [b'"c"', b'"d"']
+
+
+@pytest.mark.anyio
+async def test_results_stream_before_the_input_ends(monkeypatch):
+    scored = []
+
+    async def fake_predict_batch_async(texts, explain, cache):
+        assert cache is False  # a backfill must not evict interactive entries
+        scored.append(len(texts))
+        return [{"prediction": "Sarcastic", "text_len": len(t)} for t in texts]
+
+    monkeypatch.setattr(streaming, "predict_batch_async", fake_predict_batch_async)
+    first_output = asyncio.Event()
+
+    async def body():
+        for i in range(4):
+            yield json.dumps({"text": f"text {i}", "id": f"m{i}"}).encode() + b"\n"
+        # Only continue once the first batch has been streamed back
+        await asyncio.wait_for(first_output.wait(), 5)
+        yield b'"last"\n{"text": 3}\n'
+
+    out = []
+    async for chunk in streaming.stream_predictions(body(), explain=False, batch_size=2):
+        out.extend(json.loads(line) for line in chunk.splitlines())
+        first_output.set()
+
+    assert [row["index"] for row in out] == [0, 1, 2, 3, 4, 5]
+    assert [row.get("id") for row in out[:4]] == ["m0", "m1", "m2", "m3"]
+    assert "id" not in out[4] and out[4]["text_len"] == 4
+    assert "error" in out[5]
+    assert scored == [2, 2, 1]
@@ -0,0 +1,209 @@
+"""
+Benchmark the compiled heuristic rule engine against the original scorer.
+
+Usage:
+    python -m model.bench_heuristics
+    python -m model.bench_heuristics --chars 1000 --texts 500
+
+``naive_score_cues`` is the scorer as it was before the rules were
+compiled (two ``re.search`` calls per pattern, re-parsed every time, and
+one search per known phrase and marker); the benchmark checks both return
+identical cue words, scores and reasons before timing them.
+"""
+
+import argparse
+import random
+import re
+import sys
+import time
+from pathlib import Path
+from typing import List, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from backend.services import model_service
+from backend.services.model_service import _score_cues
+
+SAMPLE_SENTENCES = [
+    "Oh great, another Monday morning meeting!",
+    "I love being stuck in traffic for hours.",
+    "Could you please do that a little slower?",
+    "The quarterly report is attached for review.",
+    "Wow, what a surprise, the train is late again...",
+    "Thanks a lot for the 'help' with my homework.",
+    "We are meeting at the usual place at noon.",
+    "Yeah right, like that's going to happen.",
+    "The weather forecast says it will rain tomorrow",
+    "You must be so proud of yourself, GENIUS.",
+    "Nothing like a cold shower in the morning",
+    "She finished the marathon in under four hours.",
+    "Of course the piano rush hour is my favorite thing, no rush.",
+    "I'm shocked, SHOCKED, that this is fine.",
+]
+
+
+def _whole_words(phrase: str) -> str:
+    return r"(?<!\w)" + re.escape(phrase) + r"(?!\w)"
+
+
+def naive_score_cues(text: str) -> Tuple[List[str], float, List[str]]:
+    """The original uncompiled scorer, kept as the reference implementation."""
+    rules = model_service._rules
+    _POSITIVE = rules.lexicons["positive"]
+    _NEGATIVE = rules.lexicons["negative"]
+    _SARCASM_MARKERS = rules.lexicons["markers"]
+    _KNOWN_SARCASTIC = rules.known_phrases
+    _SARCASM_PATTERNS = rules.patterns
+    lower = text.lower().strip()
+    words = re.findall(r"\b\w+\b", lower)
+    found_positive = [w for w in words if w in _POSITIVE]
+    found_negative = [w for w in words if w in _NEGATIVE]
+    # Markers may span several words, so each one is searched for
+    found_markers = [
+        marker for _, marker in sorted(
+            (m.span(), marker)
+            for marker in _SARCASM_MARKERS
+            for m in re.finditer(_whole_words(marker), lower)
+        )
+    ]
+
+    cue_words: List[str] = []
+    score = 0.0
+    reasons: List[str] = []
+
+    # ── 1. Known sarcastic phrases (highest priority) ─────
+    for phrase in _KNOWN_SARCASTIC:
+        if re.search(_whole_words(phrase), lower):
+            score += 0.60
+            cue_words.extend(phrase.split()[:4])
+            reasons.append(
+                f"contains the known sarcastic phrase '{phrase}'"
+            )
+            break  # one match is enough
+
+    # ── 2. Regex pattern matching ─────────────────────────
+    pattern_reasons: List[str] = []
+    for pattern, weight, reason in _SARCASM_PATTERNS:
+        if re.search(pattern, lower):
+            score += weight
+            pattern_reasons.append(reason)
+            # Extract matched words as cues
+            match = re.search(pattern, lower)
+            if match:
+                matched_words = re.findall(r"\b\w+\b", match.group())
+                cue_words.extend(matched_words[:3])
+    if pattern_reasons:
+        # Take top 2 most specific reasons
+        reasons.extend(pattern_reasons[:2])
+
+    # ── 3. Sentiment clash (positive + negative together) ─
+    if found_positive and found_negative:
+        score += 0.30
+        cue_words.extend(found_positive[:3] + found_negative[:3])
+        reasons.append(
+            "positive sentiment words mixed with negative or sarcastic markers"
+        )
+
+    # ── 4. Sarcasm marker words present ───────────────────
+    if found_markers:
+        score += 0.10 * min(len(found_markers), 3)
+        cue_words.extend(found_markers[:3])
+        if not any("marker" in r for r in reasons):
+            reasons.append(
+                f"contains sarcasm marker words: {', '.join(found_markers[:3])}"
+            )
+
+    # ── 5. Structural cues ────────────────────────────────
+    if text.endswith("!") or text.endswith("!!") or text.endswith("!!!"):
+        score += 0.08
+        reasons.append("emphatic punctuation suggests exaggeration")
+    if text.endswith("..."):
+        score += 0.08
+        reasons.append("trailing ellipsis suggests ironic trailing-off")
+    if "?" in text and any(w in lower for w in ["could", "would", "can", "really"]):
+        score += 0.10
+        reasons.append("rhetorical question structure detected")
+    if '"' in text or "'" in text:
+        # Quotation marks around words can indicate air-quotes / sarcasm
+        quoted = re.findall(r'["\'](\w+)["\']', text)
+        if quoted:
+            score += 0.12
+            cue_words.extend(quoted[:2])
+            reasons.append(
+                f"uses quotation marks around '{', '.join(quoted[:2])}' suggesting air-quotes / irony"
+            )
+    # Mixed caps (words in ALL CAPS mid-sentence)
+    if any(c.isupper() for c in text) and not text.isupper():
+        caps_words = [w for w in text.split() if w.isupper() and len(w) > 1]
+        if caps_words:
+            score += 0.08
+            cue_words.extend([w.lower() for w in caps_words[:2]])
+            reasons.append("mixed capitalisation indicates emphasis or irony")
+
+    # ── 6. Contextual contradiction check ─────────────────
+    # Positive verbs describing negative situations
+    pos_verbs = rules.lexicons["positive_verbs"]
+    neg_situations = rules.lexicons["negative_situations"]
+    found_pos_verbs = [w for w in words if w in pos_verbs]
+    found_neg_sits = [w for w in words if w in neg_situations]
+    if found_pos_verbs and found_neg_sits:
+        score += 0.35
+        cue_words.extend(found_pos_verbs[:2] + found_neg_sits[:2])
+        reasons.append(
+            f"expresses positive sentiment ('{found_pos_verbs[0]}') about "
+            f"a typically negative situation ('{found_neg_sits[0]}') — situational irony"
+        )
+
+    # ── Normalise & deduplicate ───────────────────────────
+    score = min(score, 0.98)
+    cue_words = list(dict.fromkeys(cue_words))[:8]  # unique, max 8
+    return cue_words, score, reasons
+
+
+def make_texts(n: int, chars: int, seed: int = 0) -> List[str]:
+    """Random sentence mixes of roughly *chars* characters each."""
+    rng = random.Random(seed)
+    texts = []
+    for _ in range(n):
+        parts: List[str] = []
+        while sum(len(p) + 1 for p in parts) < chars:
+            parts.append(rng.choice(SAMPLE_SENTENCES))
+        texts.append(" ".join(parts)[:chars])
+    return texts
+
+
+def bench(fn, texts: List[str], repeat: int) -> float:
+    """Best-of-*repeat* seconds per text."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for t in texts:
+            fn(t)
+        best = min(best, time.perf_counter() - start)
+    return best / len(texts)
+
+
+def main(args):
+    texts = make_texts(args.texts, args.chars)
+    mismatches = [t for t in texts if naive_score_cues(t) != _score_cues(t)]
+    if mismatches:
+        print(f"  ✗ {len(mismatches)} texts score differently, e.g. {mismatches[0][:80]!r}")
+        sys.exit(1)
+
+    naive = bench(naive_score_cues, texts, args.repeat)
+    compiled = bench(_score_cues, texts, args.repeat)
+    print("\n" + "=" * 60)
+    print("  HEURISTIC SCORER BENCHMARK")
+    print("=" * 60)
+    print(f"\n  Texts:     {args.texts} × {args.chars} chars (outputs identical)")
+    print(f"  Naive:     {naive * 1e6:8.1f} µs/text")
+    print(f"  Compiled:  {compiled * 1e6:8.1f} µs/text")
+    print(f"  Speedup:   {naive / compiled:8.1f}×")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the heuristic sarcasm scorer")
+    parser.add_argument("--texts", type=int, default=200)
+    parser.add_argument("--chars", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=3)
+    main(parser.parse_args())
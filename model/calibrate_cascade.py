@@ -0,0 +1,121 @@
+"""
+Calibrate the heuristic cascade thresholds on the validation split.
+
+Usage:
+    python -m model.calibrate_cascade
+    python -m model.calibrate_cascade --min_precision 0.97
+
+Scores every validation text with the heuristic rules and picks the
+loosest CASCADE_HIGH / CASCADE_LOW whose short-circuited answers still
+reach --min_precision against the labels.  Prints the env settings to use
+and the share of traffic each threshold would answer without the model.
+"""
+
+import argparse
+import json
+import logging
+import sys
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from backend.services.model_service import detect_sarcasm_cues_batch
+from model.train import load_data
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s │ %(levelname)s │ %(message)s")
+logger = logging.getLogger(__name__)
+
+MODEL_DIR = Path(__file__).resolve().parent
+
+
+def calibrate_high(scores, labels, min_precision, min_support):
+    """Lowest threshold t where texts scoring >= t are sarcastic often enough."""
+    best = None
+    for t in sorted(set(scores.tolist()), reverse=True):
+        selected = scores >= t
+        if selected.sum() < min_support:
+            continue
+        precision = labels[selected].mean()
+        if precision < min_precision:
+            break
+        best = (t, float(precision), float(selected.mean()))
+    return best
+
+
+def calibrate_low(scores, labels, min_precision, min_support):
+    """Highest threshold t where texts scoring <= t are not sarcastic often enough."""
+    best = None
+    for t in sorted(set(scores.tolist())):
+        selected = scores <= t
+        if selected.sum() < min_support:
+            continue
+        precision = 1.0 - labels[selected].mean()
+        if precision < min_precision:
+            break
+        best = (t, float(precision), float(selected.mean()))
+    return best
+
+
+def main(args):
+    all_texts, all_labels = load_data()
+    split = int(0.8 * len(all_texts))
+    val_texts = all_texts[split:]
+    labels = np.array(all_labels[split:], dtype=np.float64)
+
+    cues = detect_sarcasm_cues_batch(val_texts, processes=args.processes)
+    scores = cues["raw_score"].to_numpy()
+    high = calibrate_high(scores, labels, args.min_precision, args.min_support)
+    low = calibrate_low(scores, labels, args.min_precision, args.min_support)
+
+    print("\n" + "=" * 60)
+    print("  CASCADE CALIBRATION")
+    print("=" * 60)
+    print(f"\n  Samples:        {len(val_texts)}")
+    print(f"  Min precision:  {args.min_precision:.2f}")
+    results = {"samples": len(val_texts), "min_precision": args.min_precision}
+    for name, found, disabled in (("HIGH", high, 1.0), ("LOW", low, -1.0)):
+        if found is None:
+            print(f"\n  CASCADE_{name}: no threshold reaches the target — disable with {disabled}")
+            results[name.lower()] = {"threshold": disabled, "precision": None, "coverage": 0.0}
+            continue
+        threshold, precision, coverage = found
+        print(f"\n  CASCADE_{name}={threshold:.4f}")
+        print(f"  CASCADE_{name}_PRECISION={precision:.4f}")
+        print(f"    Coverage:   {coverage:.4f}")
+        results[name.lower()] = {
+            "threshold": round(threshold, 4),
+            "precision": round(precision, 4),
+            "coverage": round(coverage, 4),
+        }
+    skipped = results["high"]["coverage"] + results["low"]["coverage"]
+    print(f"\n  Short-circuited: {skipped:.1%} of validation texts")
+    print("=" * 60)
+
+    out_path = MODEL_DIR / "cascade_thresholds.json"
+    with open(out_path, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"\n  Thresholds saved → {out_path}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Calibrate heuristic cascade thresholds")
+    parser.add_argument(
+        "--min_precision",
+        type=float,
+        default=0.95,
+        help="required precision of the short-circuited answers",
+    )
+    parser.add_argument(
+        "--min_support",
+        type=int,
+        default=20,
+        help="ignore thresholds that select fewer validation texts",
+    )
+    parser.add_argument(
+        "--processes",
+        type=int,
+        default=1,
+        help="score the validation texts on this many processes",
+    )
+    main(parser.parse_args())
@@ -0,0 +1,40 @@
+"""
+Convert a legacy ``sarcasm_model.pt`` checkpoint to safetensors.
+
+Usage:
+    python -m model.convert_checkpoint
+    python -m model.convert_checkpoint --src model/sarcasm_model.pt --dst model/sarcasm_model.safetensors
+
+The safetensors file embeds the BERT config, so the backend can build the
+classifier and memory-map its weights without touching the HF hub.
+"""
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from backend.config import LEGACY_MODEL_PATH, SAFETENSORS_MODEL_PATH
+from backend.services.model_service import BertSarcasmClassifier, save_checkpoint
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s │ %(levelname)s │ %(message)s")
+logger = logging.getLogger(__name__)
+
+
+def main(args):
+    src = Path(args.src)
+    if not src.exists():
+        logger.error("Checkpoint not found: %s", src)
+        sys.exit(1)
+
+    model = BertSarcasmClassifier.from_checkpoint(src, num_labels=2)
+    save_checkpoint(model, Path(args.dst))
+    logger.info("✓ Converted %s → %s", src, args.dst)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Convert a .pt checkpoint to safetensors")
+    parser.add_argument("--src", type=str, default=str(LEGACY_MODEL_PATH))
+    parser.add_argument("--dst", type=str, default=str(SAFETENSORS_MODEL_PATH))
+    main(parser.parse_args())
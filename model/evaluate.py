@@ -3,7 +3,8 @@ Standalone model evaluation script.
 
 Usage:
     python -m model.evaluate
-    python -m model.evaluate --model_path model/sarcasm_model.pt
+    python -m model.evaluate --model_path model/sarcasm_model.safetensors
+    python -m model.evaluate --int8       # also compare the int8 model
 """
 
 import argparse
@@ -22,12 +23,16 @@ from sklearn.metrics import (
     precision_score,
     recall_score,
 )
-from torch.utils.data import DataLoader
 from transformers import BertTokenizerFast
 
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
-from backend.services.model_service import BertSarcasmClassifier
-from model.train import SarcasmDataset, load_data
+from backend.config import MODEL_PATH, QUANTIZED_MODEL_PATH
+from backend.services.model_service import (
+    BertSarcasmClassifier,
+    quantize_model,
+    save_quantized,
+)
+from model.train import SarcasmDataset, load_data, make_loader
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s │ %(levelname)s │ %(message)s")
 logger = logging.getLogger(__name__)
@@ -35,6 +40,49 @@ logger = logging.getLogger(__name__)
 MODEL_DIR = Path(__file__).resolve().parent
 
 
+def predict_labels(model, loader, device):
+    """Return (predictions, true labels) for every batch in *loader*."""
+    all_preds, all_true = [], []
+    with torch.no_grad():
+        for batch in loader:
+            input_ids = batch["input_ids"].to(device)
+            attention_mask = batch["attention_mask"].to(device)
+            labels = batch["label"].to(device)
+            logits, _ = model(input_ids, attention_mask, output_attentions=False)
+            preds = torch.argmax(logits, dim=1)
+            all_preds.extend(preds.cpu().numpy())
+            all_true.extend(labels.cpu().numpy())
+    return all_preds, all_true
+
+
+def compare_int8(model, loader, fp32_preds, all_true, model_path):
+    """Evaluate the dynamic-int8 model on CPU and report the accuracy delta."""
+    qmodel = quantize_model(model)
+    int8_preds, _ = predict_labels(qmodel, loader, torch.device("cpu"))
+    # The server only loads the artifact for MODEL_PATH
+    saved = model_path.resolve() == Path(MODEL_PATH).resolve()
+    if saved:
+        save_quantized(qmodel, QUANTIZED_MODEL_PATH, model_path)
+
+    fp32_acc = accuracy_score(all_true, fp32_preds)
+    int8_acc = accuracy_score(all_true, int8_preds)
+    agreement = float(np.mean(np.array(fp32_preds) == np.array(int8_preds)))
+
+    print("\n  FP32 vs INT8")
+    print(f"    FP32 Accuracy:  {fp32_acc:.4f}")
+    print(f"    INT8 Accuracy:  {int8_acc:.4f}")
+    print(f"    Δ Accuracy:     {int8_acc - fp32_acc:+.4f}")
+    print(f"    INT8 F1 Score:  {f1_score(all_true, int8_preds, average='weighted'):.4f}")
+    print(f"    Agreement:      {agreement:.4f}")
+    if saved:
+        print(f"    Saved int8 model → {QUANTIZED_MODEL_PATH}")
+    return {
+        "int8_accuracy": round(int8_acc, 4),
+        "int8_accuracy_delta": round(int8_acc - fp32_acc, 4),
+        "int8_agreement": round(agreement, 4),
+    }
+
+
 def evaluate(args):
     device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
     model_path = Path(args.model_path)
@@ -46,10 +94,8 @@ def evaluate(args):
 
     tokenizer = BertTokenizerFast.from_pretrained("bert-base-uncased")
 
-    model = BertSarcasmClassifier(num_labels=2)
-    model.load_state_dict(torch.load(model_path, map_location=device))
+    model = BertSarcasmClassifier.from_checkpoint(model_path, num_labels=2)
     model.to(device)
-    model.eval()
 
     all_texts, all_labels = load_data()
     split = int(0.8 * len(all_texts))
@@ -57,18 +103,9 @@ def evaluate(args):
     val_labels = all_labels[split:]
 
     val_ds = SarcasmDataset(val_texts, val_labels, tokenizer, max_len=128)
-    val_loader = DataLoader(val_ds, batch_size=32)
+    val_loader = make_loader(val_ds, batch_size=32, bucket=True)
 
-    all_preds, all_true = [], []
-    with torch.no_grad():
-        for batch in val_loader:
-            input_ids = batch["input_ids"].to(device)
-            attention_mask = batch["attention_mask"].to(device)
-            labels = batch["label"].to(device)
-            logits, _ = model(input_ids, attention_mask)
-            preds = torch.argmax(logits, dim=1)
-            all_preds.extend(preds.cpu().numpy())
-            all_true.extend(labels.cpu().numpy())
+    all_preds, all_true = predict_labels(model, val_loader, device)
 
     print("\n" + "=" * 60)
     print("  MODEL EVALUATION RESULTS")
@@ -98,6 +135,8 @@ def evaluate(args):
         "recall": round(recall_score(all_true, all_preds, average="weighted"), 4),
         "total_samples": len(all_true),
     }
+    if args.int8:
+        metrics.update(compare_int8(model, val_loader, all_preds, all_true, model_path))
     metrics_path = MODEL_DIR / "metrics.json"
     with open(metrics_path, "w") as f:
         json.dump(metrics, f, indent=2)
@@ -109,7 +148,12 @@ if __name__ == "__main__":
     parser.add_argument(
         "--model_path",
         type=str,
-        default=str(MODEL_DIR / "sarcasm_model.pt"),
+        default=str(MODEL_PATH),
+    )
+    parser.add_argument(
+        "--int8",
+        action="store_true",
+        help="also evaluate the dynamic-int8 model and report the accuracy delta",
     )
     args = parser.parse_args()
     evaluate(args)
@@ -0,0 +1,96 @@
+"""
+Export the trained sarcasm classifier to ONNX for the ONNX Runtime engine.
+
+Usage:
+    python -m model.export_onnx
+    python -m model.export_onnx --no_attention      # logits only (smaller graph)
+
+The graph takes ``input_ids`` and ``attention_mask`` with dynamic batch and
+sequence axes and returns ``logits`` plus, unless disabled, the last layer's
+attention probabilities as ``last_attention`` (batch, heads, seq, seq).
+Serve it with ``INFERENCE_ENGINE=onnx``.
+"""
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+import torch
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from backend.config import MODEL_PATH, ONNX_MODEL_PATH
+from backend.services.model_service import BertSarcasmClassifier
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s │ %(levelname)s │ %(message)s")
+logger = logging.getLogger(__name__)
+
+
+class ExportWrapper(torch.nn.Module):
+    """Fixes the classifier's outputs to plain tensors for tracing."""
+
+    def __init__(self, model, with_attention=True):
+        super().__init__()
+        self.model = model
+        self.with_attention = with_attention
+
+    def forward(self, input_ids, attention_mask):
+        logits, attentions = self.model(
+            input_ids, attention_mask, output_attentions=self.with_attention
+        )
+        if self.with_attention:
+            return logits, attentions[-1]
+        return logits
+
+
+def export(model, output_path, with_attention=True, opset=17):
+    """Trace *model* and write the ONNX graph to *output_path*."""
+    wrapper = ExportWrapper(model.eval(), with_attention)
+    dummy_ids = torch.ones((2, 16), dtype=torch.long)
+    dummy_mask = torch.ones((2, 16), dtype=torch.long)
+
+    output_names = ["logits"]
+    dynamic_axes = {
+        "input_ids": {0: "batch", 1: "sequence"},
+        "attention_mask": {0: "batch", 1: "sequence"},
+        "logits": {0: "batch"},
+    }
+    if with_attention:
+        output_names.append("last_attention")
+        dynamic_axes["last_attention"] = {0: "batch", 2: "sequence", 3: "sequence"}
+
+    with torch.no_grad():
+        torch.onnx.export(
+            wrapper,
+            (dummy_ids, dummy_mask),
+            str(output_path),
+            input_names=["input_ids", "attention_mask"],
+            output_names=output_names,
+            dynamic_axes=dynamic_axes,
+            opset_version=opset,
+        )
+    logger.info("✓ ONNX model saved → %s", output_path)
+
+
+def main(args):
+    model_path = Path(args.model_path)
+    if not model_path.exists():
+        logger.error("Model file not found: %s", model_path)
+        logger.info("Run `python -m model.train` first to train a model.")
+        sys.exit(1)
+
+    model = BertSarcasmClassifier.from_checkpoint(model_path, num_labels=2)
+    export(model, Path(args.output), with_attention=not args.no_attention, opset=args.opset)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export sarcasm model to ONNX")
+    parser.add_argument("--model_path", type=str, default=str(MODEL_PATH))
+    parser.add_argument("--output", type=str, default=str(ONNX_MODEL_PATH))
+    parser.add_argument("--opset", type=int, default=17)
+    parser.add_argument(
+        "--no_attention",
+        action="store_true",
+        help="export logits only (attention-based highlighting is unavailable)",
+    )
+    main(parser.parse_args())
@@ -6,6 +6,7 @@ Fine-tunes bert-base-uncased on the Twitter Sarcasm Dataset.
 Usage:
     python -m model.train                   # uses defaults
     python -m model.train --epochs 5 --lr 2e-5 --batch_size 32
+    python -m model.train --bucket          # length-bucketed batches
 
 Requirements:
     pip install -r requirements.txt
@@ -15,6 +16,7 @@ Requirements:
 import argparse
 import json
 import logging
+import random
 import sys
 from pathlib import Path
 
@@ -28,18 +30,23 @@ from sklearn.metrics import (
     confusion_matrix,
     f1_score,
 )
-from torch.utils.data import DataLoader, Dataset
+from torch.utils.data import DataLoader, Dataset, Sampler
 from transformers import BertTokenizerFast
 
 # Add project root to path so we can import the model class
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
-from backend.services.model_service import BertSarcasmClassifier
+from backend.services.model_service import (
+    BertSarcasmClassifier,
+    length_buckets,
+    pad_batch,
+    save_checkpoint,
+)
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s │ %(levelname)s │ %(message)s")
 logger = logging.getLogger(__name__)
 
 MODEL_DIR = Path(__file__).resolve().parent
-SAVE_PATH = MODEL_DIR / "sarcasm_model.pt"
+SAVE_PATH = MODEL_DIR / "sarcasm_model.safetensors"
 
 
 # ── Dataset ───────────────────────────────────────────────
@@ -54,20 +61,64 @@ class SarcasmDataset(Dataset):
         return len(self.texts)
 
     def __getitem__(self, idx):
+        # No padding here — ``collate`` pads each batch to its longest item.
         encoding = self.tokenizer(
             str(self.texts[idx]),
             max_length=self.max_len,
-            padding="max_length",
             truncation=True,
-            return_tensors="pt",
         )
         return {
-            "input_ids": encoding["input_ids"].squeeze(),
-            "attention_mask": encoding["attention_mask"].squeeze(),
-            "label": torch.tensor(self.labels[idx], dtype=torch.long),
+            "input_ids": encoding["input_ids"],
+            "label": self.labels[idx],
+        }
+
+    def lengths(self):
+        """Token length of every example (one batched tokenizer call)."""
+        encoded = self.tokenizer(
+            [str(t) for t in self.texts],
+            max_length=self.max_len,
+            truncation=True,
+        )
+        return [len(ids) for ids in encoded["input_ids"]]
+
+    def collate(self, batch):
+        input_ids, attention_mask = pad_batch(
+            [item["input_ids"] for item in batch], self.tokenizer.pad_token_id
+        )
+        return {
+            "input_ids": input_ids,
+            "attention_mask": attention_mask,
+            "label": torch.tensor([item["label"] for item in batch], dtype=torch.long),
         }
 
 
+class BucketBatchSampler(Sampler):
+    """Yields batches of similar-length examples, in shuffled batch order."""
+
+    def __init__(self, lengths, batch_size, shuffle=True):
+        self.batches = length_buckets(lengths, batch_size)
+        self.shuffle = shuffle
+
+    def __iter__(self):
+        batches = list(self.batches)
+        if self.shuffle:
+            random.shuffle(batches)
+        return iter(batches)
+
+    def __len__(self):
+        return len(self.batches)
+
+
+def make_loader(dataset, batch_size, shuffle=False, bucket=False):
+    """DataLoader with dynamic padding and optional length bucketing."""
+    if bucket:
+        sampler = BucketBatchSampler(dataset.lengths(), batch_size, shuffle)
+        return DataLoader(dataset, batch_sampler=sampler, collate_fn=dataset.collate)
+    return DataLoader(
+        dataset, batch_size=batch_size, shuffle=shuffle, collate_fn=dataset.collate
+    )
+
+
 # ── Data Loading ──────────────────────────────────────────
 def load_data():
     """Load the Twitter sarcasm dataset from HuggingFace or a local JSON."""
@@ -128,8 +179,8 @@ def train(args):
     train_ds = SarcasmDataset(all_texts[:split], all_labels[:split], tokenizer, args.max_len)
     val_ds = SarcasmDataset(all_texts[split:], all_labels[split:], tokenizer, args.max_len)
 
-    train_loader = DataLoader(train_ds, batch_size=args.batch_size, shuffle=True)
-    val_loader = DataLoader(val_ds, batch_size=args.batch_size)
+    train_loader = make_loader(train_ds, args.batch_size, shuffle=True, bucket=args.bucket)
+    val_loader = make_loader(val_ds, args.batch_size, bucket=args.bucket)
 
     model = BertSarcasmClassifier(num_labels=2).to(device)
     optimizer = torch.optim.AdamW(model.parameters(), lr=args.lr, weight_decay=0.01)
@@ -148,7 +199,7 @@ def train(args):
             attention_mask = batch["attention_mask"].to(device)
             labels = batch["label"].to(device)
 
-            logits, _ = model(input_ids, attention_mask)
+            logits, _ = model(input_ids, attention_mask, output_attentions=False)
             loss = criterion(logits, labels)
             loss.backward()
             torch.nn.utils.clip_grad_norm_(model.parameters(), 1.0)
@@ -166,7 +217,7 @@ def train(args):
                 input_ids = batch["input_ids"].to(device)
                 attention_mask = batch["attention_mask"].to(device)
                 labels = batch["label"].to(device)
-                logits, _ = model(input_ids, attention_mask)
+                logits, _ = model(input_ids, attention_mask, output_attentions=False)
                 preds = torch.argmax(logits, dim=1)
                 all_preds.extend(preds.cpu().numpy())
                 all_true.extend(labels.cpu().numpy())
@@ -181,7 +232,7 @@ def train(args):
 
         if f1 > best_f1:
             best_f1 = f1
-            torch.save(model.state_dict(), SAVE_PATH)
+            save_checkpoint(model, SAVE_PATH)
             logger.info("✓ Best model saved → %s (F1=%.4f)", SAVE_PATH, f1)
 
     # Final evaluation
@@ -200,5 +251,10 @@ if __name__ == "__main__":
     parser.add_argument("--batch_size", type=int, default=16)
     parser.add_argument("--lr", type=float, default=2e-5)
     parser.add_argument("--max_len", type=int, default=128)
+    parser.add_argument(
+        "--bucket",
+        action="store_true",
+        help="group similar-length examples into the same batch",
+    )
     args = parser.parse_args()
     train(args)